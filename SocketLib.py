@@ -13,6 +13,7 @@ class SocketLib(BaseModule):
 
 		self.defined_opcodes = list(range(200, 210))
 		self.socket = __import__('socket')
+		self.asyncio = __import__('asyncio')
 		self.sockets = {}
 		self.connections = {}
 
@@ -71,6 +72,68 @@ class SocketLib(BaseModule):
 			self.sockets[socket_num].close()
 
 
+	"""Awaits a socket operation of the event loop. The socket is non-blocking while it is awaited, and blocking again afterwards,
+	   so handle_command can still use it (in an OPLExecutor, or for the OPCODES which aren't awaited)"""
+
+	async def await_socket(self, operation, sock, *args):
+
+		"""Awaits a socket operation of the event loop. The socket is non-blocking while it is awaited, and blocking again afterwards,
+	   so handle_command can still use it (in an OPLExecutor, or for the OPCODES which aren't awaited)"""
+
+		sock.setblocking(False)
+		try:
+			return await operation(sock, *args)
+		finally:
+			sock.setblocking(True)
+
+	"""Awaits the socket OPCODES which wait for the network in an AsyncOPLExecutor, the others are handled by handle_command"""
+
+	async def handle_command_async(self, runtime, cmd_name, line_args):
+
+		"""Awaits the socket OPCODES which wait for the network in an AsyncOPLExecutor, the others are handled by handle_command"""
+
+		loop = self.asyncio.get_running_loop()
+		if cmd_name == 201:
+			# Connect socket arg0 to address arg1 and port arg2
+			address = (str(runtime.memory[int.from_bytes(line_args[1], byteorder='big')], self.ENCODING), int.from_bytes(runtime.memory[int.from_bytes(line_args[2], byteorder='big')], byteorder='big'))
+			socket_num = int.from_bytes(runtime.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big')
+			await self.await_socket(loop.sock_connect, self.sockets[socket_num], address)
+		elif cmd_name == 203:
+			# Accept a connection from arg0 and save to connection arg1 and address to arg2 arg3
+			socket_num = int.from_bytes(runtime.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big')
+			connection, address = await self.await_socket(loop.sock_accept, self.sockets[socket_num])
+			conn_num = int.from_bytes(runtime.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big')
+			# The event loop makes the connection non-blocking, handle_command needs it blocking
+			connection.setblocking(True)
+			self.connections[conn_num] = connection
+			runtime.memory[int.from_bytes(line_args[2], byteorder='big')] = bytes(address[0], self.ENCODING)
+			runtime.memory[int.from_bytes(line_args[3], byteorder='big')] = int.to_bytes(address[1], 4, byteorder='big')
+		elif cmd_name == 204:
+			# Recieve arg1 bytes from connection arg0 and save to arg2
+			conn_num = int.from_bytes(runtime.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big')
+			num_bytes = int.from_bytes(runtime.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big')
+			data = await self.await_socket(loop.sock_recv, self.connections[conn_num], num_bytes)
+			runtime.memory[int.from_bytes(line_args[2], byteorder='big')] = data
+		elif cmd_name == 205:
+			# Send arg1 to connection arg0
+			conn_num = int.from_bytes(runtime.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big')
+			data = runtime.memory[int.from_bytes(line_args[1], byteorder='big')]
+			await self.await_socket(loop.sock_sendall, self.connections[conn_num], data)
+		elif cmd_name == 207:
+			# Send arg1 to socket arg0
+			socket_num = int.from_bytes(runtime.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big')
+			data = runtime.memory[int.from_bytes(line_args[1], byteorder='big')]
+			await self.await_socket(loop.sock_sendall, self.sockets[socket_num], data)
+		elif cmd_name == 208:
+			# Recieve arg1 bytes from socket arg0 and save to arg2
+			socket_num = int.from_bytes(runtime.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big')
+			num_bytes = int.from_bytes(runtime.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big')
+			data = await self.await_socket(loop.sock_recv, self.sockets[socket_num], num_bytes)
+			runtime.memory[int.from_bytes(line_args[2], byteorder='big')] = data
+		else:
+			self.handle_command(runtime, cmd_name, line_args)
+
+
 # Create the .lib file
 f = open('SocketLib.lib', 'wb')
 dill.dump(SocketLib, f)
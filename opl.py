@@ -1,4 +1,6 @@
 from main import *
+# Run programs with the package's executor for every flag, which has the superinstructions the optimizer writes (OPCODES 161-163)
+from opl.opl import OPLExecutor
 import sys
 
 if __name__ == '__main__':
@@ -18,6 +20,17 @@ if __name__ == '__main__':
 			f.close()
 			e = OPLExecutor()
 			print(e.execute(c, args[2 : ]))
+		elif args[1] == '-b':
+			# Execute binary once for each line of a file, with the words of the line as args
+			f = open(args[0], 'rb')
+			c = f.read()
+			f.close()
+			jobs = int(args[3]) if len(args) > 3 else None
+			e = OPLExecutor()
+			f = open(args[2], 'r')
+			for output in e.execute_many(c, (line.split() for line in f), jobs):
+				print(output)
+			f.close()
 		elif args[1] == '-c':
 			# Compile code
 			f = open(args[0], 'r')
@@ -25,6 +38,13 @@ if __name__ == '__main__':
 			f.close()
 			e = OPLCompiler()
 			c = e.compile(c)
+			if '-O' in args[2 : ]:
+				# Optimize the compiled code
+				from opl.opl import OPLOptimizer
+				o = OPLOptimizer()
+				c = o.optimize(c)
+				print('Removed ' + str(o.removed) + ' instructions.')
+				print('Used ' + str(o.fused) + ' superinstructions.')
 			f = open(args[0] + '.opc', 'wb')
 			f.write(c)
 			f.close()
@@ -41,7 +61,9 @@ if __name__ == '__main__':
 		elif args[1] == '-h':
 			print('OPL: arg1, optional arg2')
 			print('arg1 -> file')
-			print('arg2 -> flag (-e execute, -c compile, -h help, -d decompile)')
+			print('arg2 -> flag (-e execute, -b execute for each line of a file, -c compile, -h help, -d decompile)')
+			print('arg3 -> -O to optimize when compiling, or the file of args for -b')
+			print('arg4 -> number of processes for -b')
 	else:
 		print('OPL: arg1, optional arg2')
 		print('arg1 -> file')
@@ -12,16 +12,19 @@ documentation = \
 '''
 
 # Iterate over each line in the file
-command_num = 0
 split_filedata = filedata.split('\n')
 for line_num, line in enumerate(filedata.split('\n')):
 	# Check if the line is a command line
-	if ('elif cmd_name == ' in line) or ('if cmd_name == ' in line):
+	if line.startswith('\tdef _op_'):
 		# We got a line which starts a new command
-		# Gather the next line, which contains the command documentation
-		doc_line = split_filedata[line_num + 1][7 : ] + '.'
+		command_num = int(line[len('\tdef _op_') : line.index('(')])
+		# Gather the first line of the handler, which contains the command documentation
+		doc_line = split_filedata[line_num + 2][4 : ] + '.'
 		# Get all the args the command takes
-		if 'arg5' in doc_line:
+		if 'arg6' in doc_line:
+			# We have 7 args
+			num_args = 7
+		elif 'arg5' in doc_line:
 			# We have 6 args
 			num_args = 6
 		elif 'arg4' in doc_line:
@@ -50,8 +53,6 @@ for line_num, line in enumerate(filedata.split('\n')):
 		final_line += '\n' + doc_line + '\n\n'
 		# Add the line to the final documentation
 		documentation += final_line
-		# Add 1 to the current OPCODE number
-		command_num += 1
 
 f = open('OPCODEDOCUMENTATION.txt', 'w')
 f.write(documentation)
@@ -13,6 +13,12 @@ ENCODING = 'utf-8'
 # Printable bytes
 PRINTABLE = bytes(string.printable, ENCODING)
 
+# Header for compiled code with its labels resolved to line numbers (OEP 022)
+LABEL_HEADER = b'OPLL'
+
+# Header for snapshots of paused programs (see OPLExecutor.snapshot)
+SNAPSHOT_HEADER = b'OPLS'
+
 # Load all files
 from .executor import *
 from .compiler import *
@@ -21,7 +27,15 @@ from .decompiler import *
 from .functions import *
 from .module import *
 from .ope import *
+from .closures import *
+from .transpiler import *
+from .optimizer import *
+from .program import *
+from .asyncexecutor import *
+from .compactmemory import *
+from .diskmemory import *
+from .forkedmemory import *
 
 # All exports
-__all__ = ['OPLExecutor', 'OPLCompiler', 'ScreenBuffer', 'OPLDecompiler', 'BaseModule', 'OPECompiler', 'OPEExecutor', 'ENCODING', 'PRINTABLE', 'write', 'getchars', 'list_to_bytes', 'bytes_to_list', 'split_code', '__version__']
+__all__ = ['OPLExecutor', 'OPLCompiler', 'ScreenBuffer', 'OPLDecompiler', 'BaseModule', 'OPECompiler', 'OPEExecutor', 'OPLClosureCompiler', 'OPLTranspiler', 'OPLOptimizer', 'OPLProgram', 'AsyncOPLExecutor', 'CompactMemory', 'DiskMemory', 'ForkedMemory', 'BufferBuilder', 'ENCODING', 'PRINTABLE', 'LABEL_HEADER', 'SNAPSHOT_HEADER', 'write', 'getchars', 'list_to_bytes', 'bytes_to_list', 'memory_to_bytes', 'bytes_to_memory', 'index_memory', 'namespace_to_bytes', 'bytes_to_namespace', 'memory_usage', 'fork_memory', 'split_code', '__version__']
 
@@ -0,0 +1,287 @@
+"""Asyncio executor for the OPL language. Written by Kevin Chen."""
+
+
+# Imports
+from .functions import *
+from .executor import OPLExecutor, ThreadPool
+from . import ENCODING
+
+import asyncio
+import struct
+
+
+"""An executor for OPL whose execute is a coroutine, for I/O bound programs."""
+
+class AsyncOPLExecutor(OPLExecutor):
+
+	"""An executor for OPL whose execute is a coroutine, for I/O bound programs.
+	   OPCODES which wait for input or time (27, 56, 61) and the OPCODES of modules with handle_command_async (OEP 019) are awaited,
+	   so one event loop can run many programs at once, each with its own AsyncOPLExecutor. The threads of a program (OEP 001) wait with it.
+	   These OPCODES block, as with OPLExecutor, when they are run by a join (89, 144, 164) or by code run by another OPCODE (96, 109, 111).
+	   Args: print_handler -> a function for printing
+	         oplos -> the OS object to use, None is we use the standard OS
+	         error_mode -> the error mode during runtime (ds -> display, stop : d -> display : s -> stop : None -> None)
+	         opefiles -> the files to use if we are running in an ope
+	         engine -> the engine to run programs with (loop -> the reference interpreter loop : closures -> the closure engine : python -> transpile to Python)
+	         quantum -> the number of lines (or blocks, with the python engine) each thread runs before switching to the next thread (OEP 001)
+	         max_threads -> the most threads started by a program which run at once, the others wait for one of them to end (OEP 001)
+	         processes -> the number of worker processes for parallel_map, None for one for each CPU
+	         input_handler -> a coroutine function which gets input, given the number of chars (None for a line), None to read standard input
+	         memory -> the memory for the namespaces the executor creates (dict -> a dict of the data of each cell : compact -> a CompactMemory, which packs the data into one arena :
+	                   disk -> a DiskMemory, which keeps the cells used last in RAM and the others on disk)
+	         cache_size -> the most bytes of data each DiskMemory keeps in RAM"""
+
+	def __init__(self, print_handler=write, oplos=None, error_mode='ds', opefiles=None, engine='loop', quantum=1000, max_threads=64, processes=None, input_handler=None, memory='dict', cache_size=64 * 2 ** 20):
+
+		"""An executor for OPL whose execute is a coroutine, for I/O bound programs.
+		   OPCODES which wait for input or time (27, 56, 61) and the OPCODES of modules with handle_command_async (OEP 019) are awaited,
+		   so one event loop can run many programs at once, each with its own AsyncOPLExecutor. The threads of a program (OEP 001) wait with it.
+		   These OPCODES block, as with OPLExecutor, when they are run by a join (89, 144, 164) or by code run by another OPCODE (96, 109, 111).
+		   Args: print_handler -> a function for printing
+		         oplos -> the OS object to use, None is we use the standard OS
+		         error_mode -> the error mode during runtime (ds -> display, stop : d -> display : s -> stop : None -> None)
+		         opefiles -> the files to use if we are running in an ope
+		         engine -> the engine to run programs with (loop -> the reference interpreter loop : closures -> the closure engine : python -> transpile to Python)
+		         quantum -> the number of lines (or blocks, with the python engine) each thread runs before switching to the next thread (OEP 001)
+		         max_threads -> the most threads started by a program which run at once, the others wait for one of them to end (OEP 001)
+		         processes -> the number of worker processes for parallel_map, None for one for each CPU
+		         input_handler -> a coroutine function which gets input, given the number of chars (None for a line), None to read standard input
+		         memory -> the memory for the namespaces the executor creates (dict -> a dict of the data of each cell : compact -> a CompactMemory, which packs the data into one arena :
+		                   disk -> a DiskMemory, which keeps the cells used last in RAM and the others on disk)
+		         cache_size -> the most bytes of data each DiskMemory keeps in RAM"""
+
+		OPLExecutor.__init__(self, print_handler, oplos, error_mode, opefiles, engine, quantum, max_threads, processes, memory, cache_size)
+		self.input_handler = input_handler
+		# The thread pool of the program being awaited, and the number of joins running
+		self.async_threads = None
+		self.joins = 0
+		# The frame and the coroutine of the OPCODE to await
+		self.pending = None
+		# Use OPCODES which suspend the program instead of blocking
+		self.builtin_opcodes = {**self.builtin_opcodes, **{cmd_name : self.async_opcode(self.builtin_opcodes[cmd_name], getattr(self, '_aop_' + str(cmd_name))) for cmd_name in self.ASYNC_OPCODES}}
+
+	"""Runs a binary OPL program. This is a coroutine.
+	   Args: code -> bytearray containing OPL code, or an OPLProgram.
+	         runtime_args -> arguments given during runtime
+	         do_split -> whether we should load the code, or if it is already loaded
+	         set_namespace -> namespace to set to. False or None if we start normally
+	         active_namespace -> the current active namespace
+	         labels -> any extra labels to use
+	         sudo -> run as superuser
+	         line_num -> the line to start at
+	         max_steps -> the most lines (or blocks, with the python engine) to run before pausing the program, None for no limit
+	         time_limit -> the most seconds to run for before pausing the program, None for no limit
+	   Returns: output bytearray. If the program was paused, it can be continued with continue_execute."""
+
+	async def execute(self, code, runtime_args=[], do_split=True, set_namespace=None, active_namespace=0, labels={}, sudo=False, line_num=0, max_steps=None, time_limit=None):
+
+		"""Runs a binary OPL program. This is a coroutine.
+	   Args: code -> bytearray containing OPL code, or an OPLProgram.
+	         runtime_args -> arguments given during runtime
+	         do_split -> whether we should load the code, or if it is already loaded
+	         set_namespace -> namespace to set to. False or None if we start normally
+	         active_namespace -> the current active namespace
+	         labels -> any extra labels to use
+	         sudo -> run as superuser
+	         line_num -> the line to start at
+	         max_steps -> the most lines (or blocks, with the python engine) to run before pausing the program, None for no limit
+	         time_limit -> the most seconds to run for before pausing the program, None for no limit
+	   Returns: output bytearray. If the program was paused, it can be continued with continue_execute."""
+
+		frame = self.start_execute(code, runtime_args, do_split, set_namespace, active_namespace, labels, sudo, line_num)
+		# Run the program and its threads (OEP 001)
+		self.threads = ThreadPool(self.max_threads)
+		self.async_threads = self.threads
+		self.prepare_frame(frame)
+		self.threads.queue.append(frame)
+		self.limit_threads(max_steps, time_limit)
+		await self.run_async()
+		self.pause_threads()
+		self.async_threads = None
+		return self.finish_execute()
+
+	"""Continues the program paused by the last call of execute or continue_execute, with new limits. This is a coroutine.
+	   Args: max_steps -> the most lines (or blocks, with the python engine) to run before pausing the program again, None for no limit
+	         time_limit -> the most seconds to run for before pausing the program again, None for no limit
+	   Returns: output bytearray, including the output from before the program was paused."""
+
+	async def continue_execute(self, max_steps=None, time_limit=None):
+
+		"""Continues the program paused by the last call of execute or continue_execute, with new limits. This is a coroutine.
+	   Args: max_steps -> the most lines (or blocks, with the python engine) to run before pausing the program again, None for no limit
+	         time_limit -> the most seconds to run for before pausing the program again, None for no limit
+	   Returns: output bytearray, including the output from before the program was paused."""
+
+		self.start_continue()
+		self.async_threads = self.threads
+		self.limit_threads(max_steps, time_limit)
+		await self.run_async()
+		self.pause_threads()
+		self.async_threads = None
+		return self.finish_execute()
+
+	"""Continues the program saved in a binary snapshot made by snapshot, as continue_execute does. This is a coroutine.
+	   Args: snapshot -> the snapshot bytearray
+	         max_steps -> the most lines (or blocks, with the python engine) to run before pausing the program again, None for no limit
+	         time_limit -> the most seconds to run for before pausing the program again, None for no limit
+	   Returns: output bytearray, including the output from before the snapshot."""
+
+	async def resume(self, snapshot, max_steps=None, time_limit=None):
+
+		"""Continues the program saved in a binary snapshot made by snapshot, as continue_execute does. This is a coroutine.
+	   Args: snapshot -> the snapshot bytearray
+	         max_steps -> the most lines (or blocks, with the python engine) to run before pausing the program again, None for no limit
+	         time_limit -> the most seconds to run for before pausing the program again, None for no limit
+	   Returns: output bytearray, including the output from before the snapshot."""
+
+		self.load_snapshot(snapshot)
+		return await self.continue_execute(max_steps, time_limit)
+
+	"""Runs the threads of the program until they have ended or the program is paused, awaiting the OPCODES which suspend it."""
+
+	async def run_async(self):
+
+		"""Runs the threads of the program until they have ended or the program is paused, awaiting the OPCODES which suspend it."""
+
+		while self.threads.queue and self.running:
+			# Run each thread once, then let the event loop run other tasks
+			self.run_threads(turns=len(self.threads.queue))
+			if self.pending != None:
+				await self.await_pending()
+			else:
+				await asyncio.sleep(0)
+
+	"""Runs code from an OPCODE (96, 109, 111) with the namespaces of the program that runs it (OEP 003), without awaiting.
+	   Args: frame -> the execution frame of the OPCODE
+	         code -> bytearray containing OPL code, or an OPLProgram
+	   Returns: output bytearray."""
+
+	def execute_nested(self, frame, code):
+
+		"""Runs code from an OPCODE (96, 109, 111) with the namespaces of the program that runs it (OEP 003), without awaiting.
+	   Args: frame -> the execution frame of the OPCODE
+	         code -> bytearray containing OPL code, or an OPLProgram
+	   Returns: output bytearray."""
+
+		return OPLExecutor.execute(self, code, frame.runtime_args, True, self.namespace, self.active_namespace, sudo=frame.sudo)
+
+	"""Awaits the OPCODE which suspended the program, then lets its thread continue.
+	   The thread's line number was already moved past the OPCODE, so errors are handled for the line before it (OEP 015)."""
+
+	async def await_pending(self):
+
+		"""Awaits the OPCODE which suspended the program, then lets its thread continue.
+	   The thread's line number was already moved past the OPCODE, so errors are handled for the line before it (OEP 015)."""
+
+		frame, coroutine = self.pending
+		self.pending = None
+		self.running = True
+		try:
+			await coroutine
+			# Update the namespace, in case a module changed the memory (OEP 003)
+			self.namespace[self.active_namespace] = self.memory
+		except Exception as e:
+			frame.line_num -= 1
+			if self.handle_error(frame, frame.program[frame.line_num], e):
+				# Stop the thread
+				frame.done = True
+				if frame in self.threads.queue:
+					self.threads.queue.remove(frame)
+				self.threads.end(frame)
+
+	"""Creates a handler for an OPCODE which is awaited. The handler suspends the program so its coroutine can be awaited by execute.
+	   Args: handler -> the handler which blocks, used when the program can't be suspended
+	         coroutine -> the coroutine function for the OPCODE, which takes the frame and the arguments
+	   Returns: the handler."""
+
+	def async_opcode(self, handler, coroutine):
+
+		"""Creates a handler for an OPCODE which is awaited. The handler suspends the program so its coroutine can be awaited by execute.
+	   Args: handler -> the handler which blocks, used when the program can't be suspended
+	         coroutine -> the coroutine function for the OPCODE, which takes the frame and the arguments
+	   Returns: the handler."""
+
+		def suspend(frame, line_args):
+			if self.threads is not self.async_threads or self.joins:
+				# Run by a join or by another OPCODE
+				handler(frame, line_args)
+				return
+			# Stop the engine after this line, and await the OPCODE
+			self.pending = (frame, coroutine(frame, line_args))
+			self.running = False
+		return suspend
+
+	"""Creates a handler for an OPCODE defined by a module, which is awaited if the module has handle_command_async (OEP 019).
+	   Args: module -> the loaded module
+	         cmd_name -> the OPCODE
+	   Returns: the handler."""
+
+	def module_opcode(self, module, cmd_name):
+
+		"""Creates a handler for an OPCODE defined by a module, which is awaited if the module has handle_command_async (OEP 019).
+	   Args: module -> the loaded module
+	         cmd_name -> the OPCODE
+	   Returns: the handler."""
+
+		handler = OPLExecutor.module_opcode(self, module, cmd_name)
+		handle_command_async = self.module_hook(module, 'handle_command_async')
+		if handle_command_async == None:
+			return handler
+		async def coroutine(frame, line_args):
+			await handle_command_async(self, cmd_name, line_args)
+		return self.async_opcode(handler, coroutine)
+
+	"""Waits for a thread to end, running the other threads meanwhile (OEP 001). OPCODES block while a thread is joined.
+	   Args: frame -> the execution frame which waits
+	         thread -> the frame of the thread"""
+
+	def join_thread(self, frame, thread):
+
+		"""Waits for a thread to end, running the other threads meanwhile (OEP 001). OPCODES block while a thread is joined.
+	   Args: frame -> the execution frame which waits
+	         thread -> the frame of the thread"""
+
+		self.joins += 1
+		try:
+			OPLExecutor.join_thread(self, frame, thread)
+		finally:
+			self.joins -= 1
+
+	"""Gets input using the input handler, or from standard input in the default executor of the event loop.
+	   Args: num_chars -> the number of chars, None for a line
+	   Returns: the input string."""
+
+	async def get_input(self, num_chars):
+
+		"""Gets input using the input handler, or from standard input in the default executor of the event loop.
+	   Args: num_chars -> the number of chars, None for a line
+	   Returns: the input string."""
+
+		if self.input_handler != None:
+			return await self.input_handler(num_chars)
+		loop = asyncio.get_running_loop()
+		if num_chars == None:
+			return await loop.run_in_executor(None, input)
+		return await loop.run_in_executor(None, getchars, num_chars)
+
+	# OPCODE coroutines. Each coroutine takes the execution frame and the arguments for the line, like the OPCODE handlers.
+
+	async def _aop_27(self, frame, args):
+
+		# Gets input from standard input, saves to arg0
+		input_data = bytes(await self.get_input(None), ENCODING)
+		self.memory[args[0]] = input_data
+
+	async def _aop_56(self, frame, args):
+
+		# Get arg0 chars from standard input, save to arg1
+		self.memory[args[1]] = bytes(await self.get_input(int.from_bytes(self.memory[args[0]], byteorder='big')), ENCODING)
+
+	async def _aop_61(self, frame, args):
+
+		# Wait arg0 (float) seconds
+		await asyncio.sleep(struct.unpack('f', self.memory[args[0]])[0])
+
+
+# Table of the OPCODES which are awaited
+AsyncOPLExecutor.ASYNC_OPCODES = sorted(int(name[5 : ]) for name in vars(AsyncOPLExecutor) if name.startswith('_aop_'))
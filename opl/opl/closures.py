@@ -0,0 +1,351 @@
+"""Closure engine for the OPL language. Written by Kevin Chen."""
+
+
+# Imports
+from .functions import append_data
+import struct
+import operator
+
+
+# Float format used by the float OPCODES
+FLOAT = struct.Struct('f')
+
+
+"""Compiles decoded OPL programs to closures, so each line runs without looking up its handler or reading its arguments."""
+
+class OPLClosureCompiler:
+
+	"""Compiles decoded OPL programs to closures, so each line runs without looking up its handler or reading its arguments."""
+
+	# Float math OPCODES (arg0 op arg1 -> arg2)
+	FLOAT_MATH = {10 : operator.add, 11 : operator.sub, 12 : operator.mul, 13 : operator.truediv, 14 : operator.pow, 69 : operator.mod}
+	# Int math OPCODES (arg0 op arg1 -> arg2)
+	INT_MATH = {31 : operator.add, 32 : operator.sub, 33 : operator.mul, 35 : operator.pow, 36 : operator.and_, 37 : operator.or_, 38 : operator.xor, \
+		70 : operator.mod, 85 : operator.lshift, 86 : operator.rshift}
+	# Signed int math OPCODES (arg0 op arg1 -> arg2)
+	SIGNED_MATH = {145 : operator.add, 146 : operator.sub, 147 : operator.mul, 149 : operator.pow, 150 : operator.and_, 151 : operator.or_, 152 : operator.xor}
+	# Float comparisons for the goto OPCODES
+	FLOAT_COMPARE = {22 : operator.gt, 23 : operator.lt, 24 : operator.ge, 25 : operator.le, 72 : operator.eq}
+	FLOAT_COMPARE_ELSE = {65 : operator.gt, 66 : operator.lt, 67 : operator.ge, 68 : operator.le, 71 : operator.eq}
+	# Comparisons for the label OPCODES (OEP 022)
+	LABEL_COMPARE = {127 : operator.eq, 128 : operator.ne}
+	LABEL_FLOAT_COMPARE = {129 : operator.gt, 130 : operator.lt, 131 : operator.ge, 132 : operator.le}
+	LABEL_COMPARE_ELSE = {133 : operator.eq, 142 : operator.ne}
+	LABEL_FLOAT_COMPARE_ELSE = {134 : operator.gt, 135 : operator.lt, 136 : operator.ge, 137 : operator.le}
+	LABEL_INT_COMPARE_ELSE = {138 : operator.gt, 139 : operator.lt, 140 : operator.ge, 141 : operator.le}
+
+	def __init__(self):
+
+		"""Compiles decoded OPL programs to closures, so each line runs without looking up its handler or reading its arguments."""
+
+		pass
+
+	"""Adds a closure to each line of a decoded program (see OPLExecutor.load_code) that doesn't have one yet.
+	   Each closure takes the runtime and the execution frame.
+	   Args: program -> the decoded program
+	   Returns: the program"""
+
+	def compile(self, program):
+
+		"""Adds a closure to each line of a decoded program (see OPLExecutor.load_code) that doesn't have one yet.
+	   Each closure takes the runtime and the execution frame.
+	   Args: program -> the decoded program
+	   Returns: the program"""
+
+		for line_code in program:
+			if len(line_code) == 4:
+				line_code.append(self.compile_line(line_code[1], line_code[3]))
+		return program
+
+	"""Compiles a single line to a closure.
+	   Args: cmd_name -> the OPCODE
+	         args -> the decoded arguments
+	   Returns: the closure"""
+
+	def compile_line(self, cmd_name, args):
+
+		"""Compiles a single line to a closure.
+	   Args: cmd_name -> the OPCODE
+	         args -> the decoded arguments
+	   Returns: the closure"""
+
+		try:
+			if cmd_name in (0, 58, 125):
+				# Nothing to do
+				return self.nothing()
+			elif cmd_name == 2:
+				return self.set(args[0], args[1])
+			elif cmd_name == 3:
+				return self.copy(args[0], args[1])
+			elif cmd_name == 4:
+				return self.append(args[0], args[1], args[2])
+			elif cmd_name == 9:
+				return self.length(args[0], args[1])
+			elif cmd_name in self.FLOAT_MATH:
+				return self.float_math(self.FLOAT_MATH[cmd_name], args[0], args[1], args[2])
+			elif cmd_name in self.INT_MATH:
+				return self.int_math(self.INT_MATH[cmd_name], args[0], args[1], args[2])
+			elif cmd_name in self.SIGNED_MATH:
+				return self.signed_math(self.SIGNED_MATH[cmd_name], args[0], args[1], args[2])
+			elif cmd_name == 20:
+				return self.goto(args[0])
+			elif cmd_name == 21:
+				return self.goto_if(operator.eq, args[0], args[1], args[2])
+			elif cmd_name in self.FLOAT_COMPARE:
+				return self.goto_if_float(self.FLOAT_COMPARE[cmd_name], args[0], args[1], args[2])
+			elif cmd_name == 64:
+				return self.goto_if_else(operator.eq, args[0], args[1], args[2], args[3])
+			elif cmd_name in self.FLOAT_COMPARE_ELSE:
+				return self.goto_if_else_float(self.FLOAT_COMPARE_ELSE[cmd_name], args[0], args[1], args[2], args[3])
+			elif cmd_name == 126:
+				return self.goto_label(args[0])
+			elif cmd_name in self.LABEL_COMPARE:
+				return self.goto_label_if(self.LABEL_COMPARE[cmd_name], args[0], args[1], args[2], None)
+			elif cmd_name in self.LABEL_FLOAT_COMPARE:
+				return self.goto_label_if(self.LABEL_FLOAT_COMPARE[cmd_name], args[0], args[1], args[2], FLOAT.unpack)
+			elif cmd_name in self.LABEL_COMPARE_ELSE:
+				return self.goto_label_if_else(self.LABEL_COMPARE_ELSE[cmd_name], args[0], args[1], args[2], args[3], None)
+			elif cmd_name in self.LABEL_FLOAT_COMPARE_ELSE:
+				return self.goto_label_if_else(self.LABEL_FLOAT_COMPARE_ELSE[cmd_name], args[0], args[1], args[2], args[3], FLOAT.unpack)
+			elif cmd_name in self.LABEL_INT_COMPARE_ELSE:
+				return self.goto_label_if_else(self.LABEL_INT_COMPARE_ELSE[cmd_name], args[0], args[1], args[2], args[3], int.from_bytes)
+		except IndexError:
+			# Missing arguments, let the handler raise the error
+			pass
+		# Use the OPCODE table of the runtime
+		return self.handler(cmd_name, args)
+
+	"""Creates a closure which runs the handler for an OPCODE from the runtime's OPCODE table (including module OPCODES, OEP 019)."""
+
+	def handler(self, cmd_name, args):
+
+		"""Creates a closure which runs the handler for an OPCODE from the runtime's OPCODE table (including module OPCODES, OEP 019)."""
+
+		def run(runtime, frame):
+			handler = runtime.opcodes.get(cmd_name)
+			if handler == None:
+				# If we encounter an error due to the OPCODE not being a OPCODE
+				raise Exception('Not a command.')
+			handler(frame, args)
+		return run
+
+	"""Creates a closure which does nothing."""
+
+	def nothing(self):
+
+		"""Creates a closure which does nothing."""
+
+		def run(runtime, frame):
+			pass
+		return run
+
+	"""Creates a closure for OPCODE 2 (set arg0 to memory address arg1)."""
+
+	def set(self, value, address):
+
+		"""Creates a closure for OPCODE 2 (set arg0 to memory address arg1)."""
+
+		def run(runtime, frame):
+			runtime.memory[address] = value
+		return run
+
+	"""Creates a closure for OPCODE 3 (copy arg0 to arg1)."""
+
+	def copy(self, source, destination):
+
+		"""Creates a closure for OPCODE 3 (copy arg0 to arg1)."""
+
+		def run(runtime, frame):
+			memory = runtime.memory
+			memory[destination] = bytearray(memory[source]).copy()
+		return run
+
+	"""Creates a closure for OPCODE 4 (append data at arg0 to arg1 and save to arg2)."""
+
+	def append(self, source, target, destination):
+
+		"""Creates a closure for OPCODE 4 (append data at arg0 to arg1 and save to arg2)."""
+
+		if target == destination:
+			# Append in place if the cell owns its data (see BufferBuilder)
+			def run(runtime, frame):
+				memory = runtime.memory
+				append_data(memory, destination, memory[source])
+			return run
+		def run(runtime, frame):
+			memory = runtime.memory
+			memory[destination] = bytearray(memory[target]).copy() + memory[source]
+		return run
+
+	"""Creates a closure for OPCODE 9 (get length of data at arg0 and save to arg1)."""
+
+	def length(self, source, destination):
+
+		"""Creates a closure for OPCODE 9 (get length of data at arg0 and save to arg1)."""
+
+		def run(runtime, frame):
+			memory = runtime.memory
+			memory[destination] = int.to_bytes(len(memory[source]), 4, byteorder='big')
+		return run
+
+	"""Creates a closure for a float math OPCODE."""
+
+	def float_math(self, function, a, b, destination):
+
+		"""Creates a closure for a float math OPCODE."""
+
+		pack = FLOAT.pack
+		unpack = FLOAT.unpack
+		def run(runtime, frame):
+			memory = runtime.memory
+			memory[destination] = pack(function(unpack(memory[a])[0], unpack(memory[b])[0]))
+		return run
+
+	"""Creates a closure for an int math OPCODE."""
+
+	def int_math(self, function, a, b, destination):
+
+		"""Creates a closure for an int math OPCODE."""
+
+		from_bytes = int.from_bytes
+		def run(runtime, frame):
+			memory = runtime.memory
+			memory[destination] = int.to_bytes(function(from_bytes(memory[a], byteorder='big'), from_bytes(memory[b], byteorder='big')), 4, byteorder='big')
+		return run
+
+	"""Creates a closure for a signed int math OPCODE."""
+
+	def signed_math(self, function, a, b, destination):
+
+		"""Creates a closure for a signed int math OPCODE."""
+
+		from_bytes = int.from_bytes
+		def run(runtime, frame):
+			memory = runtime.memory
+			memory[destination] = int.to_bytes(function(from_bytes(memory[a], byteorder='big', signed=True), from_bytes(memory[b], byteorder='big', signed=True)), 4, byteorder='big', signed=True)
+		return run
+
+	"""Creates a closure for OPCODE 20 (go to line arg0)."""
+
+	def goto(self, line):
+
+		"""Creates a closure for OPCODE 20 (go to line arg0)."""
+
+		def run(runtime, frame):
+			frame.line_num = int.from_bytes(runtime.memory[line], byteorder='big') - 1
+		return run
+
+	"""Creates a closure for a goto OPCODE comparing bytes (go to line arg0 if arg1 op arg2)."""
+
+	def goto_if(self, function, line, a, b):
+
+		"""Creates a closure for a goto OPCODE comparing bytes (go to line arg0 if arg1 op arg2)."""
+
+		def run(runtime, frame):
+			memory = runtime.memory
+			if function(memory[a], memory[b]):
+				frame.line_num = int.from_bytes(memory[line], byteorder='big') - 1
+		return run
+
+	"""Creates a closure for a goto OPCODE comparing floats (go to line arg0 if arg1 op arg2)."""
+
+	def goto_if_float(self, function, line, a, b):
+
+		"""Creates a closure for a goto OPCODE comparing floats (go to line arg0 if arg1 op arg2)."""
+
+		unpack = FLOAT.unpack
+		def run(runtime, frame):
+			memory = runtime.memory
+			if function(unpack(memory[a]), unpack(memory[b])):
+				frame.line_num = int.from_bytes(memory[line], byteorder='big') - 1
+		return run
+
+	"""Creates a closure for a goto OPCODE comparing bytes (go to line arg0 if arg1 op arg2 else arg3)."""
+
+	def goto_if_else(self, function, line, a, b, else_line):
+
+		"""Creates a closure for a goto OPCODE comparing bytes (go to line arg0 if arg1 op arg2 else arg3)."""
+
+		def run(runtime, frame):
+			memory = runtime.memory
+			if function(memory[a], memory[b]):
+				frame.line_num = int.from_bytes(memory[line], byteorder='big') - 1
+			else:
+				frame.line_num = int.from_bytes(memory[else_line], byteorder='big') - 1
+		return run
+
+	"""Creates a closure for a goto OPCODE comparing floats (go to line arg0 if arg1 op arg2 else arg3)."""
+
+	def goto_if_else_float(self, function, line, a, b, else_line):
+
+		"""Creates a closure for a goto OPCODE comparing floats (go to line arg0 if arg1 op arg2 else arg3)."""
+
+		unpack = FLOAT.unpack
+		def run(runtime, frame):
+			memory = runtime.memory
+			if function(unpack(memory[a]), unpack(memory[b])):
+				frame.line_num = int.from_bytes(memory[line], byteorder='big') - 1
+			else:
+				frame.line_num = int.from_bytes(memory[else_line], byteorder='big') - 1
+		return run
+
+	"""Creates a closure for OPCODE 126 (go to label arg0) (OEP 022)."""
+
+	def goto_label(self, label):
+
+		"""Creates a closure for OPCODE 126 (go to label arg0) (OEP 022)."""
+
+		def run(runtime, frame):
+			frame.line_num = label - 1
+		return run
+
+	"""Creates a closure for a label OPCODE (go to label arg0 if arg1 op arg2) (OEP 022).
+	   The values are converted using convert first, if it is given."""
+
+	def goto_label_if(self, function, label, a, b, convert):
+
+		"""Creates a closure for a label OPCODE (go to label arg0 if arg1 op arg2) (OEP 022).
+	   The values are converted using convert first, if it is given."""
+
+		if convert == None:
+			def run(runtime, frame):
+				memory = runtime.memory
+				if function(memory[a], memory[b]):
+					frame.line_num = label - 1
+		else:
+			def run(runtime, frame):
+				memory = runtime.memory
+				if function(convert(memory[a]), convert(memory[b])):
+					frame.line_num = label - 1
+		return run
+
+	"""Creates a closure for a label OPCODE (go to label arg0 if arg1 op arg2 else arg3) (OEP 022).
+	   The values are converted using convert first, if it is given."""
+
+	def goto_label_if_else(self, function, label, a, b, else_label, convert):
+
+		"""Creates a closure for a label OPCODE (go to label arg0 if arg1 op arg2 else arg3) (OEP 022).
+	   The values are converted using convert first, if it is given."""
+
+		if convert == None:
+			def run(runtime, frame):
+				memory = runtime.memory
+				if function(memory[a], memory[b]):
+					frame.line_num = label - 1
+				else:
+					frame.line_num = else_label - 1
+		elif convert == int.from_bytes:
+			def run(runtime, frame):
+				memory = runtime.memory
+				if function(int.from_bytes(memory[a], byteorder='big'), int.from_bytes(memory[b], byteorder='big')):
+					frame.line_num = label - 1
+				else:
+					frame.line_num = else_label - 1
+		else:
+			def run(runtime, frame):
+				memory = runtime.memory
+				if function(convert(memory[a]), convert(memory[b])):
+					frame.line_num = label - 1
+				else:
+					frame.line_num = else_label - 1
+		return run
@@ -0,0 +1,245 @@
+"""Compact memory for the OPL language. Written by Kevin Chen."""
+
+
+# Imports
+import sys
+from array import array
+from itertools import compress
+from collections.abc import MutableMapping
+from .functions import BufferBuilder
+
+
+"""Memory which packs the data of its cells into one arena, for programs which fill many memory addresses."""
+
+class CompactMemory(MutableMapping):
+
+	"""Memory which packs the data of its cells into one arena, for programs which fill many memory addresses.
+	   A dict of bytes objects costs about 100 bytes for each cell on top of its data. CompactMemory keeps the data of each cell in one bytearray
+	   (the arena), with the offset and length of each cell in an array('Q') indexed by the address, so a cell costs 17 bytes on top of its data.
+	   Cells hold copies of their data, so reads and writes are slower than with a dict, and a cell set to the output buffer (OPCODE 51)
+	   doesn't change with it. Cells are kept in the order of their addresses.
+	   Addresses which are far past the other addresses, keys which aren't addresses (such as loaded_module) and data which isn't bytes are kept in a dict.
+	   Args: memory -> a mapping of memory to start with, None to start with empty memory"""
+
+	# Addresses below this are always kept in the arena, higher addresses are if the index is at least a quarter full
+	DENSE_SIZE = 65536
+	# The arena is compacted when the data which was freed is larger than the data of the cells and at least this long
+	COMPACT_SIZE = 65536
+	# The kinds of data in the arena, 0 is an unused address
+	KINDS = {bytes : 1, bytearray : 2, BufferBuilder : 2, memoryview : 1}
+
+	def __init__(self, memory=None):
+
+		"""Memory which packs the data of its cells into one arena, for programs which fill many memory addresses.
+	   A dict of bytes objects costs about 100 bytes for each cell on top of its data. CompactMemory keeps the data of each cell in one bytearray
+	   (the arena), with the offset and length of each cell in an array('Q') indexed by the address, so a cell costs 17 bytes on top of its data.
+	   Cells hold copies of their data, so reads and writes are slower than with a dict, and a cell set to the output buffer (OPCODE 51)
+	   doesn't change with it. Cells are kept in the order of their addresses.
+	   Addresses which are far past the other addresses, keys which aren't addresses (such as loaded_module) and data which isn't bytes are kept in a dict.
+	   Args: memory -> a mapping of memory to start with, None to start with empty memory"""
+
+		self.arena = bytearray()
+		# The offset and length of the data of each address in the arena, and the kind of its data
+		self.offsets = array('Q')
+		self.lengths = array('Q')
+		self.kinds = bytearray()
+		# The number of cells in the arena and the length of their data
+		self.count = 0
+		self.used = 0
+		# The other cells
+		self.objects = {}
+		if memory != None:
+			self.update(memory)
+
+	"""Grows the index so it has an address, if the address isn't far past the other addresses.
+	   Args: address -> the memory address
+	   Returns: if the address is in the index."""
+
+	def grow(self, address):
+
+		"""Grows the index so it has an address, if the address isn't far past the other addresses.
+	   Args: address -> the memory address
+	   Returns: if the address is in the index."""
+
+		if address >= self.DENSE_SIZE and address >= 4 * (self.count + 1):
+			return False
+		# Double the index, so growing it one address at a time isn't quadratic
+		size = max(address + 1, min(2 * len(self.kinds), max(self.DENSE_SIZE, 4 * (self.count + 1))))
+		extra = size - len(self.kinds)
+		self.offsets.frombytes(bytes(8 * extra))
+		self.lengths.frombytes(bytes(8 * extra))
+		self.kinds += bytes(extra)
+		return True
+
+	def __getitem__(self, address):
+
+		if type(address) is int and 0 <= address < len(self.kinds):
+			kind = self.kinds[address]
+			if kind:
+				offset = self.offsets[address]
+				data = self.arena[offset : offset + self.lengths[address]]
+				return data if kind == 2 else bytes(data)
+		return self.objects[address]
+
+	def __setitem__(self, address, data):
+
+		kind = self.KINDS.get(type(data))
+		kinds = self.kinds
+		if kind and type(address) is int and address >= 0 and (address < len(kinds) or self.grow(address)):
+			arena = self.arena
+			if kinds[address]:
+				offset = self.offsets[address]
+				old_length = self.lengths[address]
+				self.used -= old_length
+				if offset + old_length == len(arena):
+					# The cell is at the end of the arena, so it can grow in place
+					arena[offset : ] = data
+				elif len(data) <= old_length:
+					# Write over the old data, the rest of it is freed
+					arena[offset : offset + len(data)] = data
+				else:
+					self.offsets[address] = len(arena)
+					arena += data
+			else:
+				if self.objects and address in self.objects:
+					del self.objects[address]
+				self.count += 1
+				self.offsets[address] = len(arena)
+				arena += data
+			self.lengths[address] = len(data)
+			kinds[address] = kind
+			self.used += len(data)
+			if len(arena) - self.used > self.COMPACT_SIZE:
+				self.check_compact()
+		else:
+			if type(address) is int and 0 <= address < len(kinds) and kinds[address]:
+				self.free(address)
+			self.objects[address] = data
+
+	def __delitem__(self, address):
+
+		if type(address) is int and 0 <= address < len(self.kinds) and self.kinds[address]:
+			self.free(address)
+			self.check_compact()
+		else:
+			del self.objects[address]
+
+	def __contains__(self, address):
+
+		if type(address) is int and 0 <= address < len(self.kinds) and self.kinds[address]:
+			return True
+		return address in self.objects
+
+	def __iter__(self):
+
+		# Find each used address without a loop in Python
+		yield from compress(range(len(self.kinds)), self.kinds)
+		yield from list(self.objects)
+
+	def __len__(self):
+
+		return self.count + len(self.objects)
+
+	def __repr__(self):
+
+		return 'CompactMemory(' + repr(dict(self.items())) + ')'
+
+	"""Removes a cell from the arena.
+	   Args: address -> the memory address"""
+
+	def free(self, address):
+
+		"""Removes a cell from the arena.
+	   Args: address -> the memory address"""
+
+		self.kinds[address] = 0
+		self.count -= 1
+		self.used -= self.lengths[address]
+		if self.offsets[address] + self.lengths[address] == len(self.arena):
+			# The cell is at the end of the arena, so its data can be removed now
+			del self.arena[self.offsets[address] : ]
+
+	"""Deletes all cells."""
+
+	def clear(self):
+
+		"""Deletes all cells."""
+
+		self.__init__()
+
+	"""Compacts the arena if the data which was freed is larger than the data of the cells (see COMPACT_SIZE)."""
+
+	def check_compact(self):
+
+		"""Compacts the arena if the data which was freed is larger than the data of the cells (see COMPACT_SIZE)."""
+
+		if len(self.arena) - self.used > max(self.used, self.COMPACT_SIZE):
+			self.compact()
+
+	"""Compacts the arena, moving the data of the cells together so the data which was freed is released."""
+
+	def compact(self):
+
+		"""Compacts the arena, moving the data of the cells together so the data which was freed is released."""
+
+		arena = bytearray()
+		with memoryview(self.arena) as view:
+			for address in compress(range(len(self.kinds)), self.kinds):
+				offset = self.offsets[address]
+				self.offsets[address] = len(arena)
+				arena += view[offset : offset + self.lengths[address]]
+		self.arena = arena
+
+	"""Appends data to a cell (see append_data). A cell at the end of the arena grows in place, so building a buffer in a loop isn't quadratic.
+	   Args: address -> the memory address
+	         data -> the data to append"""
+
+	def append_data(self, address, data):
+
+		"""Appends data to a cell (see append_data). A cell at the end of the arena grows in place, so building a buffer in a loop isn't quadratic.
+	   Args: address -> the memory address
+	         data -> the data to append"""
+
+		if type(address) is int and 0 <= address < len(self.kinds) and self.kinds[address] and self.offsets[address] + self.lengths[address] == len(self.arena):
+			self.arena += data
+			self.lengths[address] += len(data)
+			self.kinds[address] = 2
+			self.used += len(data)
+		else:
+			self[address] = bytearray(self[address]) + data
+
+	"""Gets the number of bytes used by the data of the cells and the number of bytes reserved for the memory.
+	   Returns: the bytes used and the bytes reserved."""
+
+	def usage(self):
+
+		"""Gets the number of bytes used by the data of the cells and the number of bytes reserved for the memory.
+	   Returns: the bytes used and the bytes reserved."""
+
+		used, reserved = memory_usage(self.objects)
+		reserved += sys.getsizeof(self.arena) + sys.getsizeof(self.offsets) + sys.getsizeof(self.lengths) + sys.getsizeof(self.kinds)
+		return self.used + used, reserved
+
+
+"""Gets the number of bytes used by the data of a memory and the number of bytes reserved for it."""
+
+def memory_usage(memory):
+
+	"""Gets the number of bytes used by the data of a memory and the number of bytes reserved for it.
+	   For a dict, the bytes reserved count the dict and the objects holding the data of each cell. Memory which isn't a dict counts its own usage
+	   (see CompactMemory.usage and DiskMemory.usage).
+	   Args: memory -> the memory
+	   Returns: the bytes used and the bytes reserved."""
+
+	if not isinstance(memory, dict):
+		return memory.usage()
+	used = 0
+	reserved = sys.getsizeof(memory)
+	for address, data in memory.items():
+		if isinstance(data, (bytes, bytearray, memoryview)):
+			used += len(data)
+			reserved += sys.getsizeof(data)
+		if type(address) is int and address >= 256:
+			# Small ints are shared, larger addresses are their own objects
+			reserved += sys.getsizeof(address)
+	return used, reserved
@@ -1,7 +1,7 @@
 """Compiler for the OPL language. Written by Kevin Chen."""
 
 # Imports
-from . import ENCODING
+from . import ENCODING, LABEL_HEADER
 from .functions import split_code, write, remove_leading_spaces
 
 import struct
@@ -21,18 +21,25 @@ class OPLCompiler:
 
 	"""Compiles OPL code to binary.
 	   Args: code -> code to compile
+	         resolve_labels -> resolve labels to line numbers, and add the label table as a header (OEP 022)
 	   Returns: compiled code"""
 
-	def compile(self, code):
+	def compile(self, code, resolve_labels=False):
 
 		"""Compiles OPL code to binary.
 	   Args: code -> code to compile
+	         resolve_labels -> resolve labels to line numbers, and add the label table as a header (OEP 022)
 	   Returns: compiled code"""
 
 		compiled_code = bytearray()
 		code_split = split_code(code)
 		# Remove any leading spaces/tabs
 		code_split = remove_leading_spaces(code_split)
+		# Find the labels (OEP 022)
+		from .executor import OPLExecutor
+		labels = {}
+		if resolve_labels:
+			labels = self.find_labels(code_split)
 		# Iterate over all lines
 		line_num = 0
 		for line_code in code_split:
@@ -45,37 +52,100 @@ class OPLCompiler:
 			try:
 				# Add line number, command type, and number of args to code
 				compiled_code += int.to_bytes(line_num, 4, byteorder='big') + int.to_bytes(int(line_code[0]), 4, byteorder='big') + int.to_bytes(len(line_code) - 1, 4, byteorder='big')
+				arg_types = OPLExecutor.ARG_TYPES.get(int(line_code[0]), '')
 				# Add each argument
-				for arg in line_code[1 : ]:
-					# Get data type
-					dtype = arg[0]
-					arg = arg[1 : ]
-					if dtype == 'i':
-						# Int
-						arg = int.to_bytes(int(arg), 4, byteorder='big')
-					elif dtype == 'f':
-						# Float
-						arg = struct.pack('f', float(arg))
-					elif dtype == 's':
-						# String
-						arg = bytes(arg, ENCODING)
-					elif dtype == 'b':
-						# Byte numbers (a,b,c,d,etc.)
-						if arg.split(',') == ['']:
-							# No bytes
-							arg = bytes(0)
-						else:
-							arg = bytes([int(i) for i in arg.split(',')])
-					elif dtype == 'g':
-						# Signed int
-						arg = int.to_bytes(int(arg), 4, byteorder='big', signed=True)
-					elif dtype == 'h':
-						# Hex int
-						arg = int.to_bytes(int(arg, 16), 4, byteorder='big')
+				for arg_num, arg in enumerate(line_code[1 : ]):
+					arg = self.compile_arg(arg)
+					if resolve_labels and arg_num < len(arg_types) and arg_types[arg_num] == 'l':
+						# Resolve the label to its line number (OEP 022)
+						if bytes(arg) not in labels:
+							raise Exception('Unknown label ' + str(bytes(arg)) + '.')
+						arg = int.to_bytes(labels[bytes(arg)], 4, byteorder='big')
 					compiled_code += int.to_bytes(len(arg), 4, byteorder='big') + arg
 				line_num += 1
 			except Exception as e:
 				write('ERROR: ' + str(e) + ' LINE: ' + str(line_num) + ' CODE: ' + str(line_code) + '\n')
 				break
+		if resolve_labels:
+			# Add the label table
+			compiled_code = self.label_header(labels) + compiled_code
 		return compiled_code
 
+	"""Compiles a single argument to binary.
+	   Args: arg -> the argument, starting with its data type
+	   Returns: the compiled argument"""
+
+	def compile_arg(self, arg):
+
+		"""Compiles a single argument to binary.
+	   Args: arg -> the argument, starting with its data type
+	   Returns: the compiled argument"""
+
+		# Get data type
+		dtype = arg[0]
+		arg = arg[1 : ]
+		if dtype == 'i':
+			# Int
+			arg = int.to_bytes(int(arg), 4, byteorder='big')
+		elif dtype == 'f':
+			# Float
+			arg = struct.pack('f', float(arg))
+		elif dtype == 's':
+			# String
+			arg = bytes(arg, ENCODING)
+		elif dtype == 'b':
+			# Byte numbers (a,b,c,d,etc.)
+			if arg.split(',') == ['']:
+				# No bytes
+				arg = bytes(0)
+			else:
+				arg = bytes([int(i) for i in arg.split(',')])
+		elif dtype == 'g':
+			# Signed int
+			arg = int.to_bytes(int(arg), 4, byteorder='big', signed=True)
+		elif dtype == 'h':
+			# Hex int
+			arg = int.to_bytes(int(arg, 16), 4, byteorder='big')
+		return arg
+
+	"""Finds the line number of each label (OEP 022).
+	   Args: code_split -> the split code
+	   Returns: dictionary of labels to line numbers"""
+
+	def find_labels(self, code_split):
+
+		"""Finds the line number of each label (OEP 022).
+	   Args: code_split -> the split code
+	   Returns: dictionary of labels to line numbers"""
+
+		labels = {}
+		line_num = 0
+		for line_code in code_split:
+			if line_code == [] or (len(line_code[0]) >= 2 and line_code[0][0 : 2] == '//'):
+				# Newline or comment line
+				continue
+			try:
+				if int(line_code[0]) == 125:
+					# This is a label
+					labels[bytes(self.compile_arg(line_code[1]))] = line_num
+			except Exception:
+				# The error is shown when the line is compiled
+				break
+			line_num += 1
+		return labels
+
+	"""Creates the label table header (OEP 022).
+	   Args: labels -> dictionary of labels to line numbers
+	   Returns: the header"""
+
+	def label_header(self, labels):
+
+		"""Creates the label table header (OEP 022).
+	   Args: labels -> dictionary of labels to line numbers
+	   Returns: the header"""
+
+		header = bytearray(LABEL_HEADER) + int.to_bytes(len(labels), 4, byteorder='big')
+		for label, line_num in labels.items():
+			# Add the label and its line number
+			header += int.to_bytes(len(label), 4, byteorder='big') + label + int.to_bytes(line_num, 4, byteorder='big')
+		return header
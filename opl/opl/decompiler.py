@@ -2,7 +2,7 @@
 
 
 # Imports
-from . import PRINTABLE, ENCODING
+from . import PRINTABLE, ENCODING, LABEL_HEADER
 
 import struct
 
@@ -32,10 +32,27 @@ class OPLDecompiler:
 		"""Decompiles compiled OPL code.
 	   Args: compiled -> a bytearray containing compiled OPL code"""
 
+		from .executor import OPLExecutor
 		decompiled = ''
 
 		# Iterate over each byte in the compiled bytecode
 		i = 0
+		line_labels = {}
+		# Check for a label table (OEP 022)
+		resolved = compiled[0 : 4] == LABEL_HEADER
+		if resolved:
+			# Get number of labels (4 bytes)
+			num_labels = int.from_bytes(compiled[4 : 8], byteorder='big')
+			i = 8
+			for label_num in range(num_labels):
+				# Get length of the label (4 bytes)
+				label_len = int.from_bytes(compiled[i : i + 4], byteorder='big')
+				i += 4
+				# Get the label and its line number (4 bytes)
+				label = compiled[i : i + label_len]
+				i += label_len
+				line_labels[int.from_bytes(compiled[i : i + 4], byteorder='big')] = label
+				i += 4
 		while i < len(compiled):
 			# Get line number (4 bytes)
 			line_num = compiled[i : i + 4]
@@ -55,6 +72,10 @@ class OPLDecompiler:
 				# Get the arg data (len_arg bytes)
 				arg_data = compiled[i : i + len_arg]
 				i += len_arg
+				arg_types = OPLExecutor.ARG_TYPES.get(cmd_name, '')
+				if resolved and arg < len(arg_types) and arg_types[arg] == 'l':
+					# Use the label instead of its line number (OEP 022)
+					arg_data = line_labels[int.from_bytes(arg_data, byteorder='big')]
 				# Find data type
 				# Check if it is a string
 				if self.trystring and all([(char in PRINTABLE) for char in arg_data]):
@@ -0,0 +1,271 @@
+"""Disk backed memory for the OPL language. Written by Kevin Chen."""
+
+
+# Imports
+import os
+import sqlite3
+import tempfile
+import collections
+from collections.abc import MutableMapping
+from .functions import BufferBuilder, owns_data
+from .compactmemory import memory_usage
+
+
+"""Memory which keeps the cells it used last in RAM and the other cells on disk, for programs whose memory doesn't fit in RAM."""
+
+class DiskMemory(MutableMapping):
+
+	"""Memory which keeps the cells it used last in RAM and the other cells on disk, for programs whose memory doesn't fit in RAM.
+	   The cells in RAM are a cache kept in the order they were used, and when their data is larger than cache_size the cells used longest ago
+	   are written to an sqlite database in a temporary directory, which is deleted with the memory. Cells are only written when they are evicted,
+	   so a cell which is changed many times while it is cached is only written once. Keys which aren't addresses (such as loaded_module)
+	   and data which isn't bytes are kept in RAM. Like CompactMemory, cells are kept in the order of their addresses, not the order
+	   they were set in, so printing or saving the memory (OPCODES 29, 53, 83 and 168) lists them in a different order than a dict does.
+	   Args: memory -> a mapping of memory to start with, None to start with empty memory
+	         cache_size -> the most bytes of data to keep in RAM, counting CELL_SIZE bytes for each cell
+	         directory -> the directory to create the temporary directory in, None for the default temporary directory"""
+
+	# The bytes counted for each cached cell on top of its data, about what a dict entry and a bytes object cost
+	CELL_SIZE = 100
+	# The most addresses the database can hold
+	MAX_ADDRESS = 2 ** 63 - 1
+	# The kinds of data in the database
+	KINDS = {bytes : 1, bytearray : 2, BufferBuilder : 2, memoryview : 1}
+
+	def __init__(self, memory=None, cache_size=64 * 2 ** 20, directory=None):
+
+		"""Memory which keeps the cells it used last in RAM and the other cells on disk, for programs whose memory doesn't fit in RAM.
+	   The cells in RAM are a cache kept in the order they were used, and when their data is larger than cache_size the cells used longest ago
+	   are written to an sqlite database in a temporary directory, which is deleted with the memory. Cells are only written when they are evicted,
+	   so a cell which is changed many times while it is cached is only written once. Keys which aren't addresses (such as loaded_module)
+	   and data which isn't bytes are kept in RAM. Like CompactMemory, cells are kept in the order of their addresses, not the order
+	   they were set in, so printing or saving the memory (OPCODES 29, 53, 83 and 168) lists them in a different order than a dict does.
+	   Args: memory -> a mapping of memory to start with, None to start with empty memory
+	         cache_size -> the most bytes of data to keep in RAM, counting CELL_SIZE bytes for each cell
+	         directory -> the directory to create the temporary directory in, None for the default temporary directory"""
+
+		self.cache_size = cache_size
+		# The directory is deleted when the memory is garbage collected
+		self.directory = tempfile.TemporaryDirectory(prefix='opl-', dir=directory)
+		self.database = sqlite3.connect(os.path.join(self.directory.name, 'memory.db'), check_same_thread=False, isolation_level=None)
+		# The database is temporary, so it doesn't need to survive a crash
+		self.database.execute('PRAGMA journal_mode = OFF')
+		self.database.execute('PRAGMA synchronous = OFF')
+		self.database.execute('CREATE TABLE cells (address INTEGER PRIMARY KEY, kind INTEGER, data BLOB)')
+		# The cached cells, the cells which changed since they were written and the bytes counted for the cache
+		self.cache = collections.OrderedDict()
+		self.dirty = set()
+		self.cached = 0
+		# The other cells
+		self.objects = {}
+		if memory != None:
+			self.update(memory)
+
+	"""Checks if a key is an address which can be kept on disk.
+	   Args: address -> the key
+	   Returns: if the key is an address."""
+
+	def is_address(self, address):
+
+		"""Checks if a key is an address which can be kept on disk.
+	   Args: address -> the key
+	   Returns: if the key is an address."""
+
+		return type(address) is int and 0 <= address <= self.MAX_ADDRESS
+
+	"""Loads a cell from the database into the cache.
+	   Args: address -> the memory address
+	   Returns: the data, or None if the cell isn't in the database."""
+
+	def load(self, address):
+
+		"""Loads a cell from the database into the cache.
+	   Args: address -> the memory address
+	   Returns: the data, or None if the cell isn't in the database."""
+
+		row = self.database.execute('SELECT kind, data FROM cells WHERE address = ?', (address, )).fetchone()
+		if row == None:
+			return None
+		data = bytearray(row[1]) if row[0] == 2 else bytes(row[1])
+		self.cache[address] = data
+		self.cached += len(data) + self.CELL_SIZE
+		self.evict()
+		return data
+
+	"""Writes the cells used longest ago to the database until the cache is at most three quarters of cache_size, if it is larger than cache_size."""
+
+	def evict(self):
+
+		"""Writes the cells used longest ago to the database until the cache is at most three quarters of cache_size, if it is larger than cache_size."""
+
+		if self.cached <= self.cache_size:
+			return
+		rows = []
+		# Keep the cell used last, even if it is larger than the cache
+		while self.cached > self.cache_size * 3 // 4 and len(self.cache) > 1:
+			address, data = self.cache.popitem(last=False)
+			self.cached -= len(data) + self.CELL_SIZE
+			if address in self.dirty:
+				self.dirty.discard(address)
+				rows.append((address, self.KINDS[type(data)], bytes(data)))
+		self.database.executemany('INSERT OR REPLACE INTO cells VALUES (?, ?, ?)', rows)
+
+	"""Writes all cells which changed since they were written to the database, keeping them in the cache."""
+
+	def flush(self):
+
+		"""Writes all cells which changed since they were written to the database, keeping them in the cache."""
+
+		self.database.executemany('INSERT OR REPLACE INTO cells VALUES (?, ?, ?)', [(address, self.KINDS[type(self.cache[address])], bytes(self.cache[address])) for address in self.dirty])
+		self.dirty.clear()
+
+	def __getitem__(self, address):
+
+		if address in self.cache:
+			self.cache.move_to_end(address)
+			return self.cache[address]
+		if self.is_address(address):
+			data = self.load(address)
+			if data != None:
+				return data
+		return self.objects[address]
+
+	def __setitem__(self, address, data):
+
+		if self.is_address(address) and type(data) in self.KINDS:
+			if type(data) is memoryview:
+				# Copy a view, so the data it shows can't change (see OPLExecutor.slice_data)
+				data = data.tobytes()
+			if address in self.cache:
+				self.cached -= len(self.cache[address])
+				self.cache.move_to_end(address)
+			else:
+				if self.objects and address in self.objects:
+					del self.objects[address]
+				self.cached += self.CELL_SIZE
+			self.cache[address] = data
+			self.cached += len(data)
+			self.dirty.add(address)
+			self.evict()
+		else:
+			if self.is_address(address):
+				self.discard(address)
+			self.objects[address] = data
+
+	def __delitem__(self, address):
+
+		if not self.discard(address):
+			del self.objects[address]
+
+	def __contains__(self, address):
+
+		if address in self.cache or address in self.objects:
+			return True
+		return self.is_address(address) and self.database.execute('SELECT 1 FROM cells WHERE address = ?', (address, )).fetchone() != None
+
+	def __iter__(self):
+
+		# Go through the addresses in the database in order, a page at a time so the addresses don't have to fit in RAM
+		self.flush()
+		address = -1
+		while True:
+			addresses = [row[0] for row in self.database.execute('SELECT address FROM cells WHERE address > ? ORDER BY address LIMIT 4096', (address, ))]
+			if not addresses:
+				break
+			yield from addresses
+			address = addresses[-1]
+		yield from list(self.objects)
+
+	def __len__(self):
+
+		self.flush()
+		return self.database.execute('SELECT COUNT(*) FROM cells').fetchone()[0] + len(self.objects)
+
+	def __repr__(self):
+
+		return 'DiskMemory(' + repr(dict(self.items())) + ')'
+
+	"""Removes a cell from the cache and the database.
+	   Args: address -> the memory address
+	   Returns: if the cell was in the cache or the database."""
+
+	def discard(self, address):
+
+		"""Removes a cell from the cache and the database.
+	   Args: address -> the memory address
+	   Returns: if the cell was in the cache or the database."""
+
+		found = False
+		if address in self.cache:
+			self.cached -= len(self.cache.pop(address)) + self.CELL_SIZE
+			self.dirty.discard(address)
+			found = True
+		if self.is_address(address):
+			found = self.database.execute('DELETE FROM cells WHERE address = ?', (address, )).rowcount > 0 or found
+		return found
+
+	"""Deletes all cells."""
+
+	def clear(self):
+
+		"""Deletes all cells."""
+
+		self.database.execute('DELETE FROM cells')
+		self.cache.clear()
+		self.dirty.clear()
+		self.cached = 0
+		self.objects.clear()
+
+	"""Appends data to a cell (see append_data). A cached cell which owns its data grows in place (see BufferBuilder).
+	   Args: address -> the memory address
+	         data -> the data to append"""
+
+	def append_data(self, address, data):
+
+		"""Appends data to a cell (see append_data). A cached cell which owns its data grows in place (see BufferBuilder).
+	   Args: address -> the memory address
+	         data -> the data to append"""
+
+		if address in self.cache and owns_data(self.cache, address):
+			self.cache[address] += bytes(data) if data is self.cache[address] else data
+			self.cache.move_to_end(address)
+			self.cached += len(data)
+			self.dirty.add(address)
+			self.evict()
+		else:
+			builder = BufferBuilder(self[address])
+			builder += data
+			self[address] = builder
+
+	"""Gets the number of bytes used by the data of the cells and the number of bytes of RAM reserved for the memory.
+	   Returns: the bytes used and the bytes reserved."""
+
+	def usage(self):
+
+		"""Gets the number of bytes used by the data of the cells and the number of bytes of RAM reserved for the memory.
+	   Returns: the bytes used and the bytes reserved."""
+
+		self.flush()
+		used = self.database.execute('SELECT TOTAL(LENGTH(data)) FROM cells').fetchone()[0]
+		cache_used, reserved = memory_usage(self.cache)
+		objects_used, objects_reserved = memory_usage(self.objects)
+		return int(used) + objects_used, reserved + objects_reserved
+
+	"""Closes the database and deletes its directory. The memory can't be used after it is closed."""
+
+	def close(self):
+
+		"""Closes the database and deletes its directory. The memory can't be used after it is closed."""
+
+		self.database.close()
+		self.directory.cleanup()
+
+	"""Closes the memory when it is deleted, so the database is closed before its directory is deleted, which Windows requires."""
+
+	def __del__(self):
+
+		"""Closes the memory when it is deleted, so the database is closed before its directory is deleted, which Windows requires."""
+
+		# The memory may not have been created
+		if 'database' in vars(self):
+			self.close()
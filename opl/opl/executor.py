@@ -4,8 +4,14 @@
 # Imports
 from .functions import *
 from .screenbuffer import ScreenBuffer
-from . import ENCODING
+from . import ENCODING, LABEL_HEADER, SNAPSHOT_HEADER
 from .module import BaseModule
+from .closures import OPLClosureCompiler
+from .transpiler import OPLTranspiler
+from .program import OPLProgram
+from .compactmemory import CompactMemory, memory_usage
+from .diskmemory import DiskMemory
+from .forkedmemory import ForkedMemory, fork_memory
 
 import sys, os
 import time
@@ -13,6 +19,8 @@ import struct
 import hashlib
 import numpy as np
 import threading
+import collections
+import multiprocessing
 import socket
 import dill
 import math
@@ -26,55 +34,363 @@ class OPLExecutor:
 	   Args: print_handler -> a function for printing
 	         oplos -> the OS object to use, None is we use the standard OS
 	         error_mode -> the error mode during runtime (ds -> display, stop : d -> display : s -> stop : None -> None)
-	         opefiles -> the files to use if we are running in an ope"""
+	         opefiles -> the files to use if we are running in an ope
+	         engine -> the engine to run programs with (loop -> the reference interpreter loop : closures -> the closure engine : python -> transpile to Python)
+	         quantum -> the number of lines (or blocks, with the python engine) each thread runs before switching to the next thread (OEP 001)
+	         max_threads -> the most threads started by a program which run at once, the others wait for one of them to end (OEP 001)
+	         processes -> the number of worker processes for parallel_map, None for one for each CPU
+	         memory -> the memory for the namespaces the executor creates (dict -> a dict of the data of each cell : compact -> a CompactMemory, which packs the data into one arena :
+	                   disk -> a DiskMemory, which keeps the cells used last in RAM and the others on disk)
+	         cache_size -> the most bytes of data each DiskMemory keeps in RAM"""
 
-	def __init__(self, print_handler=write, oplos=None, error_mode='ds', opefiles=None):
+	def __init__(self, print_handler=write, oplos=None, error_mode='ds', opefiles=None, engine='loop', quantum=1000, max_threads=64, processes=None, memory='dict', cache_size=64 * 2 ** 20):
 
 		"""The executor for OPL.
 		   Args: print_handler -> a function for printing
 		         oplos -> the OS object to use, None is we use the standard OS
 		         error_mode -> the error mode during runtime (ds -> display, stop : d -> display : s -> stop : None -> None)
-		         opefiles -> the files to use if we are running in an ope"""
+		         opefiles -> the files to use if we are running in an ope
+		         engine -> the engine to run programs with (loop -> the reference interpreter loop : closures -> the closure engine : python -> transpile to Python)
+		         quantum -> the number of lines (or blocks, with the python engine) each thread runs before switching to the next thread (OEP 001)
+		         max_threads -> the most threads started by a program which run at once, the others wait for one of them to end (OEP 001)
+		         processes -> the number of worker processes for parallel_map, None for one for each CPU
+		         memory -> the memory for the namespaces the executor creates (dict -> a dict of the data of each cell : compact -> a CompactMemory, which packs the data into one arena :
+		                   disk -> a DiskMemory, which keeps the cells used last in RAM and the others on disk)
+		         cache_size -> the most bytes of data each DiskMemory keeps in RAM"""
 
 		self.print_handler = print_handler
 		self.oplos = oplos
 		self.error_mode = error_mode
 		self.opefiles = opefiles
+		self.engine = engine
+		if engine not in ('loop', 'closures', 'python'):
+			raise Exception('Unknown engine ' + str(engine) + '.')
+		self.closure_compiler = OPLClosureCompiler()
+		self.transpiler = OPLTranspiler()
+		# The threads of the current call (OEP 001)
+		self.quantum = quantum
+		self.max_threads = max_threads
+		self.threads = ThreadPool(max_threads)
+		# The threads of the paused program, if any (see continue_execute)
+		self.paused = None
+		self.processes = processes
+		self.memory_type = memory
+		if memory not in ('dict', 'compact', 'disk'):
+			raise Exception('Unknown memory ' + str(memory) + '.')
+		self.cache_size = cache_size
+		# Create the OPCODE table
+		self.builtin_opcodes = {cmd_name : getattr(self, '_op_' + str(cmd_name)) for cmd_name in self.OPCODES}
 
 	"""Runs a binary OPL program. 
-	   Args: code -> bytearray containing OPL code.
+	   Args: code -> bytearray containing OPL code, or an OPLProgram.
 	         runtime_args -> arguments given during runtime
-	         do_split -> whether we should split the code, or if it is already split
+	         do_split -> whether we should load the code, or if it is already loaded
 	         set_namespace -> namespace to set to. False or None if we start normally
 	         active_namespace -> the current active namespace
 	         labels -> any extra labels to use
 	         sudo -> run as superuser
-	   Returns: output bytearray."""
+	         line_num -> the line to start at
+	         max_steps -> the most lines (or blocks, with the python engine) to run before pausing the program, None for no limit
+	         time_limit -> the most seconds to run for before pausing the program, None for no limit
+	   Returns: output bytearray. If the program was paused, it can be continued with continue_execute."""
 
-	def execute(self, code, runtime_args=[], do_split=True, set_namespace=None, active_namespace=0, labels={}, sudo=False):
+	def execute(self, code, runtime_args=[], do_split=True, set_namespace=None, active_namespace=0, labels={}, sudo=False, line_num=0, max_steps=None, time_limit=None):
 
 		"""Runs a binary OPL program. 
-	   Args: code -> bytearray containing OPL code.
+	   Args: code -> bytearray containing OPL code, or an OPLProgram.
 	         runtime_args -> arguments given during runtime
-	         do_split -> whether we should split the code, or if it is already split
+	         do_split -> whether we should load the code, or if it is already loaded
 	         set_namespace -> namespace to set to. False or None if we start normally
 	         active_namespace -> the current active namespace
 	         labels -> any extra labels to use
 	         sudo -> run as superuser
-	   Returns: output bytearray."""
+	         line_num -> the line to start at
+	         max_steps -> the most lines (or blocks, with the python engine) to run before pausing the program, None for no limit
+	         time_limit -> the most seconds to run for before pausing the program, None for no limit
+	   Returns: output bytearray. If the program was paused, it can be continued with continue_execute."""
+
+		frame = self.start_execute(code, runtime_args, do_split, set_namespace, active_namespace, labels, sudo, line_num)
+		# Run the program and its threads, keeping the threads of the outer call if this is one (OEP 001)
+		outer_threads = self.threads
+		self.threads = ThreadPool(self.max_threads)
+		self.prepare_frame(frame)
+		self.threads.queue.append(frame)
+		self.limit_threads(max_steps, time_limit)
+		self.run_threads()
+		self.pause_threads()
+		self.threads = outer_threads
+		return self.finish_execute()
+
+	"""Continues the program paused by the last call of execute or continue_execute, with new limits.
+	   Each thread continues at its line and in its namespace (OEP 001, OEP 003), so a host can run many programs in turns.
+	   Args: max_steps -> the most lines (or blocks, with the python engine) to run before pausing the program again, None for no limit
+	         time_limit -> the most seconds to run for before pausing the program again, None for no limit
+	   Returns: output bytearray, including the output from before the program was paused."""
+
+	def continue_execute(self, max_steps=None, time_limit=None):
+
+		"""Continues the program paused by the last call of execute or continue_execute, with new limits.
+	   Each thread continues at its line and in its namespace (OEP 001, OEP 003), so a host can run many programs in turns.
+	   Args: max_steps -> the most lines (or blocks, with the python engine) to run before pausing the program again, None for no limit
+	         time_limit -> the most seconds to run for before pausing the program again, None for no limit
+	   Returns: output bytearray, including the output from before the program was paused."""
+
+		outer_threads = self.start_continue()
+		self.limit_threads(max_steps, time_limit)
+		self.run_threads()
+		self.pause_threads()
+		self.threads = outer_threads
+		return self.finish_execute()
+
+	"""Starts a call of continue_execute, switching to the threads of the paused program.
+	   Returns: the threads to switch back to."""
+
+	def start_continue(self):
+
+		"""Starts a call of continue_execute, switching to the threads of the paused program.
+	   Returns: the threads to switch back to."""
+
+		if self.paused == None:
+			raise Exception('No paused program to continue.')
+		self.update_in_process(1)
+		self.running = True
+		outer_threads = self.threads
+		self.threads = self.paused
+		self.threads.paused = False
+		self.paused = None
+		return outer_threads
+
+	"""Sets the limits of the running program.
+	   Args: max_steps -> the most lines (or blocks, with the python engine) to run, None for no limit
+	         time_limit -> the most seconds to run for, None for no limit"""
+
+	def limit_threads(self, max_steps, time_limit):
+
+		"""Sets the limits of the running program.
+	   Args: max_steps -> the most lines (or blocks, with the python engine) to run, None for no limit
+	         time_limit -> the most seconds to run for, None for no limit"""
+
+		self.threads.steps_left = max_steps
+		self.threads.deadline = None if time_limit == None else time.time() + time_limit
+
+	"""Keeps the threads of the program if it was paused, so it can be continued with continue_execute."""
+
+	def pause_threads(self):
+
+		"""Keeps the threads of the program if it was paused, so it can be continued with continue_execute."""
+
+		if self.threads.paused:
+			self.paused = self.threads
+
+	"""Saves the program paused by execute or continue_execute to a binary snapshot, which resume can continue in any executor.
+	   The snapshot has all namespaces (OEP 003) and the class of each loaded module (OEP 019), the threads (OEP 001) with their lines,
+	   labels (OEP 022) and line numbers, the active namespace, the output and the error mode (OEP 015).
+	   Modules are loaded again when the snapshot is resumed, so they lose their state, and the files of an OPE aren't saved.
+	   Returns: the snapshot bytearray."""
+
+	def snapshot(self):
+
+		"""Saves the program paused by execute or continue_execute to a binary snapshot, which resume can continue in any executor.
+	   The snapshot has all namespaces (OEP 003) and the class of each loaded module (OEP 019), the threads (OEP 001) with their lines,
+	   labels (OEP 022) and line numbers, the active namespace, the output and the error mode (OEP 015).
+	   Modules are loaded again when the snapshot is resumed, so they lose their state, and the files of an OPE aren't saved.
+	   Returns: the snapshot bytearray."""
+
+		if self.paused == None:
+			raise Exception('No paused program to snapshot.')
+		# The state of the executor: the active namespace, the error flag, if OPE files are used and the error mode
+		state = int.to_bytes(self.active_namespace, 4, byteorder='big') + bytes([self.error, self.useopefiles])
+		if self.error_mode != None:
+			state += b'\x01' + bytes(self.error_mode, ENCODING)
+		# The namespaces, with the active memory. Each cell's data is tagged with its type (see value_to_bytes)
+		namespace = {**self.namespace, self.active_namespace : self.memory}
+		namespaces = []
+		for namespace_id, memory in namespace.items():
+			module = dill.dumps(type(memory['loaded_module'])) if 'loaded_module' in memory else b''
+			namespaces.append(int.to_bytes(namespace_id, 4, byteorder='big') + list_to_bytes([memory_to_bytes({key : self.value_to_bytes(data) for key, data in memory.items() if key != 'loaded_module'}), module]))
+		# The threads, in the order they run in, then the threads waiting for a slot and the threads which ended
+		threads = self.paused
+		frames = list(threads.queue) + list(threads.pending)
+		frames += [frame for thread_id, frame in sorted(threads.ids.items()) if frame not in frames]
+		frames = [self.frame_to_bytes(frame, 0 if frame in threads.queue else 1 if frame in threads.pending else 2, frame in threads.slots) for frame in frames]
+		return bytearray(SNAPSHOT_HEADER) + list_to_bytes([state, self.value_to_bytes(self.output), list_to_bytes(namespaces), int.to_bytes(threads.max_threads, 4, byteorder='big') + list_to_bytes(frames)])
+
+	"""Loads a binary snapshot made by snapshot, so continue_execute continues its program.
+	   Args: snapshot -> the snapshot bytearray"""
+
+	def load_snapshot(self, snapshot):
+
+		"""Loads a binary snapshot made by snapshot, so continue_execute continues its program.
+	   Args: snapshot -> the snapshot bytearray"""
+
+		if snapshot[0 : 4] != SNAPSHOT_HEADER:
+			raise Exception('Not an OPL snapshot.')
+		state, output, namespaces, threads = bytes_to_list(snapshot[4 : ])
+		# Load the state of the executor
+		self.active_namespace = int.from_bytes(state[0 : 4], byteorder='big')
+		self.error = bool(state[4])
+		self.useopefiles = bool(state[5])
+		self.error_mode = str(state[7 : ], ENCODING) if len(state) > 6 else None
+		self.output = self.bytes_to_value(output)
+		# Load the namespaces, loading their modules again (OEP 019)
+		self.namespace = {}
+		for namespace in bytes_to_list(namespaces):
+			memory, module = bytes_to_list(namespace[4 : ])
+			memory = self.new_memory({key : self.bytes_to_value(data) for key, data in bytes_to_memory(memory).items()})
+			if module:
+				memory['loaded_module'] = dill.loads(module)()
+				memory['loaded_module'].init_functions()
+			self.namespace[int.from_bytes(namespace[0 : 4], byteorder='big')] = memory
+		self.memory = self.namespace[self.active_namespace]
+		self.update_opcodes()
+		# Load the threads (OEP 001)
+		self.paused = ThreadPool(int.from_bytes(threads[0 : 4], byteorder='big'))
+		self.paused.paused = True
+		frames = [self.bytes_to_frame(frame) for frame in bytes_to_list(threads[4 : ])]
+		for frame, place, slot, waiting in frames:
+			if frame.thread_id != None:
+				self.paused.ids[frame.thread_id] = frame
+		for frame, place, slot, waiting in frames:
+			if waiting != None:
+				frame.waiting = self.paused.ids[waiting]
+			if place == 0:
+				self.paused.queue.append(frame)
+			elif place == 1:
+				self.paused.pending.append(frame)
+			if slot:
+				self.paused.slots.add(frame)
+			if not frame.ended():
+				self.prepare_frame(frame)
+
+	"""Continues the program saved in a binary snapshot made by snapshot, as continue_execute does.
+	   Args: snapshot -> the snapshot bytearray
+	         max_steps -> the most lines (or blocks, with the python engine) to run before pausing the program again, None for no limit
+	         time_limit -> the most seconds to run for before pausing the program again, None for no limit
+	   Returns: output bytearray, including the output from before the snapshot."""
+
+	def resume(self, snapshot, max_steps=None, time_limit=None):
+
+		"""Continues the program saved in a binary snapshot made by snapshot, as continue_execute does.
+	   Args: snapshot -> the snapshot bytearray
+	         max_steps -> the most lines (or blocks, with the python engine) to run before pausing the program again, None for no limit
+	         time_limit -> the most seconds to run for before pausing the program again, None for no limit
+	   Returns: output bytearray, including the output from before the snapshot."""
+
+		self.load_snapshot(snapshot)
+		return self.continue_execute(max_steps, time_limit)
+
+	"""Encodes a frame for a snapshot.
+	   Args: frame -> the execution frame
+	         place -> where the frame is in the thread pool (0 -> running : 1 -> waiting for a slot : 2 -> ended)
+	         slot -> if the frame has a slot in the thread pool
+	   Returns: the encoded frame."""
+
+	def frame_to_bytes(self, frame, place, slot):
+
+		"""Encodes a frame for a snapshot.
+	   Args: frame -> the execution frame
+	         place -> where the frame is in the thread pool (0 -> running : 1 -> waiting for a slot : 2 -> ended)
+	         slot -> if the frame has a slot in the thread pool
+	   Returns: the encoded frame."""
+
+		# Threads use their lines as their code
+		code_is_program = frame.code is frame.program
+		flags = frame.done | frame.cancelled << 1 | bool(frame.sudo) << 2 | slot << 3 | code_is_program << 4
+		header = bytearray()
+		for value in (frame.thread_id or 0, frame.line_num, frame.active_namespace, frame.waiting.thread_id if frame.waiting != None else 0, frame.turn_left):
+			header += int.to_bytes(value, 4, byteorder='big')
+		header += bytes([place, flags])
+		program = [list_to_bytes([int.to_bytes(line_code[0], 4, byteorder='big') + int.to_bytes(line_code[1], 4, byteorder='big'), list_to_bytes([self.value_to_bytes(arg) for arg in line_code[2]]), \
+			list_to_bytes([self.value_to_bytes(arg) for arg in line_code[3]])]) for line_code in frame.program]
+		labels = []
+		for name, line in frame.labels.items():
+			labels += [name, int.to_bytes(line, 4, byteorder='big')]
+		runtime_args = [bytes(arg, ENCODING) if isinstance(arg, str) else arg for arg in frame.runtime_args]
+		return list_to_bytes([header, b'' if code_is_program else self.value_to_bytes(frame.code), list_to_bytes(program), list_to_bytes(labels), list_to_bytes(runtime_args)])
+
+	"""Decodes a frame encoded by frame_to_bytes.
+	   Args: binary_frame -> the encoded frame
+	   Returns: the frame, where it is in the thread pool, if it has a slot and the ID of the thread it waits for (or None)."""
+
+	def bytes_to_frame(self, binary_frame):
+
+		"""Decodes a frame encoded by frame_to_bytes.
+	   Args: binary_frame -> the encoded frame
+	   Returns: the frame, where it is in the thread pool, if it has a slot and the ID of the thread it waits for (or None)."""
+
+		header, code, program, labels, runtime_args = bytes_to_list(binary_frame)
+		thread_id, line_num, active_namespace, waiting, turn_left = [int.from_bytes(header[i : i + 4], byteorder='big') for i in range(0, 20, 4)]
+		place, flags = header[20], header[21]
+		lines = []
+		for line_code in bytes_to_list(program):
+			numbers, raw_args, args = bytes_to_list(line_code)
+			lines.append([int.from_bytes(numbers[0 : 4], byteorder='big'), int.from_bytes(numbers[4 : 8], byteorder='big'), [self.bytes_to_value(arg) for arg in bytes_to_list(raw_args)], \
+				[self.bytes_to_value(arg) for arg in bytes_to_list(args)]])
+		labels = bytes_to_list(labels)
+		labels = {bytes(labels[i]) : int.from_bytes(labels[i + 1], byteorder='big') for i in range(0, len(labels), 2)}
+		frame = ExecutionFrame(lines if flags & 16 else self.bytes_to_value(code), lines, labels, [str(arg, ENCODING) for arg in bytes_to_list(runtime_args)], bool(flags & 4), active_namespace)
+		frame.line_num = line_num
+		frame.done = bool(flags & 1)
+		frame.cancelled = bool(flags & 2)
+		frame.thread_id = thread_id or None
+		frame.turn_left = turn_left
+		return frame, place, bool(flags & 8), waiting or None
+
+	"""Encodes data or a decoded argument for a snapshot, with a byte for its type (i -> int : b -> bytes : a -> bytearray : l -> missing label).
+	   Args: value -> the data or decoded argument
+	   Returns: the encoded value."""
+
+	def value_to_bytes(self, value):
+
+		"""Encodes data or a decoded argument for a snapshot, with a byte for its type (i -> int : b -> bytes : a -> bytearray : l -> missing label).
+	   Args: value -> the data or decoded argument
+	   Returns: the encoded value."""
+
+		if isinstance(value, int):
+			return b'i' + int.to_bytes(value, (value.bit_length() + 8) // 8, byteorder='big', signed=True)
+		elif isinstance(value, MissingLabel):
+			return b'l' + value.name
+		elif isinstance(value, bytearray):
+			return b'a' + value
+		return b'b' + value
+
+	"""Decodes a value encoded by value_to_bytes.
+	   Args: binary_value -> the encoded value
+	   Returns: the data or decoded argument."""
+
+	def bytes_to_value(self, binary_value):
+
+		"""Decodes a value encoded by value_to_bytes.
+	   Args: binary_value -> the encoded value
+	   Returns: the data or decoded argument."""
+
+		if binary_value[0 : 1] == b'i':
+			return int.from_bytes(binary_value[1 : ], byteorder='big', signed=True)
+		elif binary_value[0 : 1] == b'l':
+			return MissingLabel(bytes(binary_value[1 : ]))
+		elif binary_value[0 : 1] == b'a':
+			return bytearray(binary_value[1 : ])
+		return bytes(binary_value[1 : ])
+
+	"""Starts a call of execute, creating the memory and the output and loading the code.
+	   Args: the same as execute
+	   Returns: the execution frame for the call."""
+
+	def start_execute(self, code, runtime_args, do_split, set_namespace, active_namespace, labels, sudo, line_num):
+
+		"""Starts a call of execute, creating the memory and the output and loading the code.
+	   Args: the same as execute
+	   Returns: the execution frame for the call."""
 
 		# Increment the IN_PROCESS OPL OS flag if OPLOS exists.
-		if self.oplos:
-			self.oplos.data['shared_buffer'] = bytearray(self.oplos.data['shared_buffer'])
-			self.oplos.data['shared_buffer'][1] += 1
-			self.oplos.data_to_binary(self.oplos.data)
-	
+		self.update_in_process(1)
 		self.running = True
+		self.paused = None
 		self.error = False
 		self.useopefiles = False
-		# Create memory
+		# Create memory (see new_memory)
 		if not set_namespace:
-			self.namespace = {0 : {}}
+			self.namespace = {0 : self.new_memory()}
 			self.memory = self.namespace[active_namespace]
 		else:
 			self.namespace = set_namespace
@@ -82,791 +398,531 @@ class OPLExecutor:
 		self.active_namespace = active_namespace
 		# Create output bytearray
 		self.output = bytearray()
-		# Split the code into commands
-		if do_split:
-			split_code, labels = self.split_code(code)
+		# Load the code into a decoded program
+		if isinstance(code, OPLProgram):
+			# The program is already decoded
+			program, labels = code.decoded()
+			code = code.code
+		elif do_split:
+			program, labels = self.load_code(code)
 		else:
-			split_code = code
+			program = code
 			labels = labels
-		line_num = 0
-		while line_num < len(split_code) and self.running:
+		# Create the frame for this call
+		frame = ExecutionFrame(code, program, labels, runtime_args, sudo, active_namespace)
+		frame.line_num = line_num
+		# Get the OPCODE table for the active namespace
+		self.update_opcodes()
+		return frame
+
+	"""Finishes a call of execute.
+	   Returns: output bytearray."""
+
+	def finish_execute(self):
+
+		"""Finishes a call of execute.
+	   Returns: output bytearray."""
+
+		# Decrement the IN_PROCESS OPL OS flag if OPLOS exists.
+		self.update_in_process(-1)
+		# Return output
+		return self.output
+
+	"""Changes the IN_PROCESS OPL OS flag if OPLOS exists.
+	   Args: change -> the change to the flag"""
+
+	def update_in_process(self, change):
+
+		"""Changes the IN_PROCESS OPL OS flag if OPLOS exists.
+	   Args: change -> the change to the flag"""
+
+		if self.oplos:
+			self.oplos.data['shared_buffer'] = bytearray(self.oplos.data['shared_buffer'])
+			self.oplos.data['shared_buffer'][1] += change
+			self.oplos.data_to_binary(self.oplos.data)
+
+	"""Runs a program once for each list of runtime arguments, decoding it only once. Yields the outputs in the order of the inputs.
+	   With more than one job, the runs are split across worker processes, which don't print (print_handler is only used with one job).
+	   Args: code -> bytearray containing OPL code, or an OPLProgram
+	         inputs -> iterable of the runtime arguments for each run, read as the runs are started
+	         jobs -> the number of worker processes, None or 1 to run in this process
+	         chunk_size -> the number of runs sent to a worker process at once"""
+
+	def execute_many(self, code, inputs, jobs=None, chunk_size=64):
+
+		"""Runs a program once for each list of runtime arguments, decoding it only once. Yields the outputs in the order of the inputs.
+	   With more than one job, the runs are split across worker processes, which don't print (print_handler is only used with one job).
+	   Args: code -> bytearray containing OPL code, or an OPLProgram
+	         inputs -> iterable of the runtime arguments for each run, read as the runs are started
+	         jobs -> the number of worker processes, None or 1 to run in this process
+	         chunk_size -> the number of runs sent to a worker process at once"""
+
+		if jobs == None or jobs == 1:
+			if not isinstance(code, OPLProgram):
+				code = OPLProgram(code, executor=self)
+			for runtime_args in inputs:
+				yield self.execute(code, runtime_args)
+			return
+		if self.oplos != None:
+			raise Exception('Worker processes are not permitted in OPL OS.')
+		if isinstance(code, OPLProgram):
+			code = code.code
+		with multiprocessing.Pool(jobs, initializer=start_batch_worker, initargs=(code, self.error_mode, self.engine)) as pool:
+			for output in pool.imap(run_batch_item, inputs, chunk_size):
+				yield output
+
+	"""Runs part of a program once for each item in a pool of worker processes, and gets the results (OEP 001).
+	   The memory is sent to each worker once, and each run starts with a copy on write fork of it (see ForkedMemory), with its item set at input_cell.
+	   Modules aren't copied to the workers (OEP 019).
+	   Args: code -> bytearray containing OPL code, or a decoded program
+	         items -> list of bytes, the items
+	         input_cell -> the memory address each run gets its item at
+	         result_cell -> the memory address of the result of each run
+	         runtime_args -> arguments given during runtime
+	         memory -> the memory each run starts with
+	         start -> the line each run starts at
+	         end -> the line each run stops at, None to run until the program ends
+	         labels -> the labels for a decoded program (OEP 022)
+	         sudo -> run as superuser
+	   Returns: list of the results, in the order of the items."""
+
+	def parallel_map(self, code, items, input_cell, result_cell, runtime_args=[], memory={}, start=0, end=None, labels={}, sudo=False):
+
+		"""Runs part of a program once for each item in a pool of worker processes, and gets the results (OEP 001).
+	   The memory is sent to each worker once, and each run starts with a copy on write fork of it (see ForkedMemory), with its item set at input_cell.
+	   Modules aren't copied to the workers (OEP 019).
+	   Args: code -> bytearray containing OPL code, or a decoded program
+	         items -> list of bytes, the items
+	         input_cell -> the memory address each run gets its item at
+	         result_cell -> the memory address of the result of each run
+	         runtime_args -> arguments given during runtime
+	         memory -> the memory each run starts with
+	         start -> the line each run starts at
+	         end -> the line each run stops at, None to run until the program ends
+	         labels -> the labels for a decoded program (OEP 022)
+	         sudo -> run as superuser
+	   Returns: list of the results, in the order of the items."""
+
+		if not isinstance(code, list):
+			code, labels = self.load_code(code)
+		if end == None:
+			end = len(code)
+		# Send the decoded lines without their closures, which can't be pickled
+		program = [line_code[ : 4] for line_code in code[ : end]]
+		memory = {address : data.tobytes() if isinstance(data, memoryview) else data for address, data in memory.items() if address != 'loaded_module'}
+		with multiprocessing.Pool(self.processes, initializer=start_map_worker, initargs=(program, labels, start, memory, input_cell, result_cell, runtime_args, sudo, self.engine)) as pool:
+			results = pool.map(run_map_item, items)
+		for item_num, result in enumerate(results):
+			if result == None:
+				raise Exception('Error while mapping item ' + str(item_num) + '.')
+		return results
+
+	"""Runs code from an OPCODE (96, 109, 111) with the namespaces of the program that runs it (OEP 003).
+	   Args: frame -> the execution frame of the OPCODE
+	         code -> bytearray containing OPL code, or an OPLProgram
+	   Returns: output bytearray."""
+
+	def execute_nested(self, frame, code):
+
+		"""Runs code from an OPCODE (96, 109, 111) with the namespaces of the program that runs it (OEP 003).
+	   Args: frame -> the execution frame of the OPCODE
+	         code -> bytearray containing OPL code, or an OPLProgram
+	   Returns: output bytearray."""
+
+		return self.execute(code, frame.runtime_args, True, self.namespace, self.active_namespace, sudo=frame.sudo)
+
+	"""Prepares a frame for the selected engine.
+	   Args: frame -> the execution frame"""
+
+	def prepare_frame(self, frame):
+
+		"""Prepares a frame for the selected engine.
+	   Args: frame -> the execution frame"""
+
+		if self.engine != 'loop':
+			# Add the closures to the program
+			self.closure_compiler.compile(frame.program)
+		if self.engine == 'python':
+			# Transpile the program
+			frame.blocks = self.transpiler.transpile(frame.program, self)
+
+	"""Moves lines of a frame's program to a new thread in the thread pool, which starts in the active namespace (OEP 001).
+	   Args: frame -> the execution frame
+	         start -> the first line to move
+	         end -> the line after the last line to move
+	         namespace_id -> the namespace to fork the active namespace into and start the thread in (see fork_namespace), None to start it in the active namespace
+	   Returns: the frame of the new thread."""
+
+	def push_thread(self, frame, start, end, namespace_id=None):
+
+		"""Moves lines of a frame's program to a new thread in the thread pool, which starts in the active namespace (OEP 001).
+	   Args: frame -> the execution frame
+	         start -> the first line to move
+	         end -> the line after the last line to move
+	         namespace_id -> the namespace to fork the active namespace into and start the thread in (see fork_namespace), None to start it in the active namespace
+	   Returns: the frame of the new thread."""
+
+		new_code = frame.program[start : end]
+		del frame.program[start : end]
+		if namespace_id == None:
+			namespace_id = self.active_namespace
+		else:
+			self.fork_namespace(self.active_namespace, namespace_id)
+		thread = ExecutionFrame(new_code, new_code, frame.labels, frame.runtime_args, frame.sudo, namespace_id)
+		self.prepare_frame(thread)
+		self.threads.add(thread)
+		return thread
+
+	"""Waits for a thread to end, running the other threads meanwhile (OEP 001).
+	   Args: frame -> the execution frame which waits
+	         thread -> the frame of the thread"""
+
+	def join_thread(self, frame, thread):
+
+		"""Waits for a thread to end, running the other threads meanwhile (OEP 001).
+	   Args: frame -> the execution frame which waits
+	         thread -> the frame of the thread"""
+
+		frame.active_namespace = self.active_namespace
+		self.run_threads(thread)
+		self.switch_namespace(frame.active_namespace)
+		if self.threads.paused and not thread.ended():
+			# The program reached a limit, keep waiting for the thread when it is continued
+			frame.waiting = thread
+			return
+		if not thread.ended() and self.running:
+			# The thread is waiting for a free slot in the pool, which the waiting threads will never free
+			raise Exception('Deadlock while waiting for thread ' + str(thread.thread_id) + '.')
+
+	"""Runs the waiting threads in turn, each for self.quantum lines, until they have all ended (OEP 001).
+	   Each thread keeps its own line number and active namespace, so switching between them is deterministic.
+	   Args: thread -> stop as soon as this thread has ended, None to run until all threads have ended
+	         turns -> the most turns to run before returning, None to run until the threads have ended"""
+
+	def run_threads(self, thread=None, turns=None):
+
+		"""Runs the waiting threads in turn, each for self.quantum lines, until they have all ended (OEP 001).
+	   Each thread keeps its own line number and active namespace, so switching between them is deterministic.
+	   Args: thread -> stop as soon as this thread has ended, None to run until all threads have ended
+	         turns -> the most turns to run before returning, None to run until the threads have ended"""
+
+		while self.threads.queue and self.running:
+			if thread != None and thread.ended():
+				# The thread we are waiting for ended
+				break
+			if turns != None:
+				if turns == 0:
+					break
+				turns -= 1
+			if self.threads.steps_left == 0 or (self.threads.deadline != None and time.time() >= self.threads.deadline):
+				# The program reached a limit, pause it
+				self.threads.paused = True
+				self.running = False
+				break
+			frame = self.threads.queue.popleft()
+			if frame.waiting != None:
+				if not frame.waiting.ended():
+					if all(waiting.waiting != None and not waiting.waiting.ended() for waiting in self.threads.queue):
+						# Every thread waits for a thread which is waiting for a free slot, so the join fails
+						frame.line_num -= 1
+						error = Exception('Deadlock while waiting for thread ' + str(frame.waiting.thread_id) + '.')
+						frame.waiting = None
+						if self.handle_error(frame, frame.program[frame.line_num], error):
+							frame.done = True
+							self.threads.end(frame)
+						else:
+							self.threads.queue.append(frame)
+						continue
+					# Keep waiting for the thread, which the program was joining when it was paused
+					self.threads.queue.append(frame)
+					continue
+				frame.waiting = None
+			try:
+				# Switch to the thread's namespace (OEP 003)
+				self.switch_namespace(frame.active_namespace)
+			except Exception as e:
+				# The namespace was deleted by another thread
+				self.handle_error(frame, frame.program[frame.line_num], e)
+				frame.done = True
+				self.threads.end(frame)
+				continue
+			# Run the thread using the selected engine
+			turn = frame.turn_left or self.quantum
+			frame.turn_left = 0
+			steps = turn if self.threads.steps_left == None else min(turn, self.threads.steps_left)
+			if self.engine == 'closures':
+				ran = self.run_closures(frame, steps)
+			elif self.engine == 'python':
+				ran = self.run_python(frame, steps)
+			else:
+				ran = self.run_loop(frame, steps)
+			if self.threads.steps_left != None:
+				self.threads.steps_left -= ran
+			# Save the thread's namespace
+			frame.active_namespace = self.active_namespace
+			if frame.ended():
+				# Free the thread's slot in the pool
+				self.threads.end(frame)
+			elif ran == steps and steps < turn:
+				# The program reached its limit during the turn, finish the turn first when it is continued
+				frame.turn_left = turn - ran
+				self.threads.queue.appendleft(frame)
+			else:
+				# Run the rest of the thread after the others
+				self.threads.queue.append(frame)
+
+	"""Switches to a namespace, if it isn't the active namespace (OEP 003).
+	   Args: namespace_id -> the namespace"""
+
+	def switch_namespace(self, namespace_id):
+
+		"""Switches to a namespace, if it isn't the active namespace (OEP 003).
+	   Args: namespace_id -> the namespace"""
+
+		if namespace_id != self.active_namespace:
+			self.memory = self.namespace[namespace_id]
+			self.active_namespace = namespace_id
+			self.update_opcodes()
+
+	"""Forks a namespace into another namespace, copy on write, so the fork starts with the data of the namespace without copying it (see ForkedMemory) (OEP 003).
+	   Changes to either namespace don't change the other. The loaded module isn't forked (OEP 019).
+	   Args: namespace_id -> the namespace to fork
+	         fork_id -> the namespace to create as the fork, replacing it if it exists"""
+
+	def fork_namespace(self, namespace_id, fork_id):
+
+		"""Forks a namespace into another namespace, copy on write, so the fork starts with the data of the namespace without copying it (see ForkedMemory) (OEP 003).
+	   Changes to either namespace don't change the other. The loaded module isn't forked (OEP 019).
+	   Args: namespace_id -> the namespace to fork
+	         fork_id -> the namespace to create as the fork, replacing it if it exists"""
+
+		self.namespace[self.active_namespace] = self.memory
+		replaced = self.namespace.get(fork_id)
+		self.namespace[namespace_id], self.namespace[fork_id] = fork_memory(self.namespace[namespace_id])
+		self.memory = self.namespace[self.active_namespace]
+		self.close_memory(replaced)
+		self.update_opcodes()
+
+	"""Closes a memory on disk which a namespace no longer uses, so its database is closed before its directory is deleted (see DiskMemory) (OEP 003).
+	   A fork of a memory on disk closes its base once no namespace is forked from it.
+	   Args: memory -> the memory which was replaced or deleted, None if there wasn't one"""
+
+	def close_memory(self, memory):
+
+		"""Closes a memory on disk which a namespace no longer uses, so its database is closed before its directory is deleted (see DiskMemory) (OEP 003).
+	   A fork of a memory on disk closes its base once no namespace is forked from it.
+	   Args: memory -> the memory which was replaced or deleted, None if there wasn't one"""
+
+		if isinstance(memory, ForkedMemory):
+			memory = memory.base
+		if not isinstance(memory, DiskMemory):
+			return
+		for used in list(self.namespace.values()) + [self.memory]:
+			if used is memory or isinstance(used, ForkedMemory) and used.base is memory:
+				return
+		memory.close()
+
+	"""Runs a frame using the reference interpreter loop, looking up the handler for each line.
+	   Args: frame -> the execution frame
+	         steps -> the most lines to run
+	   Returns: the number of steps run."""
+
+	def run_loop(self, frame, steps):
+
+		"""Runs a frame using the reference interpreter loop, looking up the handler for each line.
+	   Args: frame -> the execution frame
+	         steps -> the most lines to run
+	   Returns: the number of steps run."""
+
+		for step in range(steps):
+			if frame.line_num >= len(frame.program) or not self.running:
+				return step
 			# Get code for this line
-			line_code = split_code[line_num]
-			cmd_name = int.from_bytes(line_code[1], byteorder='big')
+			line_code = frame.program[frame.line_num]
+			cmd_name = line_code[1]
 			line_args = line_code[2]
 			try:
-				# Check for a module (OEP 019)
-				if 'loaded_module' in self.memory.keys():
+				# Check for a module hook (OEP 019)
+				if self.begin_hook != None:
 					# Execute the begin call
-					self.memory['loaded_module'].on_begin_opcode(self, cmd_name, line_args)
+					self.begin_hook(self, cmd_name, line_args)
 					# Update the namespace (OEP 003)
 					self.namespace[self.active_namespace] = self.memory
-				if cmd_name == 0:
-					# Start the program
-					pass
-				elif cmd_name == 1:
-					# End the program, returning arg0
-					self.output += line_args[0]
-					break
-				elif cmd_name == 2:
-					# Set arg0 to memory address arg1
-					self.memory[int.from_bytes(line_args[1], byteorder='big')] = line_args[0]
-				elif cmd_name == 3:
-					# Copy arg0 to arg1
-					self.memory[int.from_bytes(line_args[1], byteorder='big')] = bytearray(self.memory[int.from_bytes(line_args[0], byteorder='big')]).copy()
-				elif cmd_name == 4:
-					# Append data at arg0 to arg1 and save to arg2
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = bytearray(self.memory[int.from_bytes(line_args[1], byteorder='big')]).copy() + self.memory[int.from_bytes(line_args[0], byteorder='big')]
-				elif cmd_name == 5:
-					# Append data at arg0 to arg1 at position arg2
-					data = self.memory[int.from_bytes(line_args[1], byteorder='big')]
-					self.memory[int.from_bytes(line_args[1], byteorder='big')] = data[ : int.from_bytes(self.memory[int.from_bytes(line_args[2], byteorder='big')], byteorder='big')] + self.memory[int.from_bytes(line_args[0], byteorder='big')] + data[int.from_bytes(self.memory[int.from_bytes(line_args[2], byteorder='big')], byteorder='big') : ]
-				elif cmd_name == 6:
-					# Truncate arg1 bytes from end of arg0
-					self.memory[int.from_bytes(line_args[0], byteorder='big')] = self.memory[int.from_bytes(line_args[0], byteorder='big')][ : int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big')]
-				elif cmd_name == 7:
-					# Truncate arg1 bytes from start of arg0
-					self.memory[int.from_bytes(line_args[0], byteorder='big')] = self.memory[int.from_bytes(line_args[0], byteorder='big')][int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big') : ]
-				elif cmd_name == 8:
-					# Truncate arg1 bytes from arg0 at arg2
-					data = self.memory[int.from_bytes(line_args[0], byteorder='big')]
-					arg1 = int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big')
-					arg2 = int.from_bytes(self.memory[int.from_bytes(line_args[2], byteorder='big')], byteorder='big')
-					self.memory[int.from_bytes(line_args[0], byteorder='big')] = data[ : arg2] + data[arg2 + arg1 : ]
-				elif cmd_name == 9:
-					# Get length of data at arg0 and save to arg1
-					self.memory[int.from_bytes(line_args[1], byteorder='big')] = int.to_bytes(len(self.memory[int.from_bytes(line_args[0], byteorder='big')]), 4, byteorder='big')
-				elif cmd_name == 10:
-					# Add the values at arg0 and arg1 and save to arg2
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = struct.pack('f', struct.unpack('f', self.memory[int.from_bytes(line_args[0], byteorder='big')])[0] + struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')])[0])
-				elif cmd_name == 11:
-					# Subtract the values at arg0 and arg1 and save to arg2
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = struct.pack('f', struct.unpack('f', self.memory[int.from_bytes(line_args[0], byteorder='big')])[0] - struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')])[0])
-				elif cmd_name == 12:
-					# Multiply the values at arg0 and arg1 and save to arg2
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = struct.pack('f', struct.unpack('f', self.memory[int.from_bytes(line_args[0], byteorder='big')])[0] * struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')])[0])
-				elif cmd_name == 13:
-					# Divide the values at arg0 and arg1 and save to arg2
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = struct.pack('f', struct.unpack('f', self.memory[int.from_bytes(line_args[0], byteorder='big')])[0] / struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')])[0])
-				elif cmd_name == 14:
-					# Raise arg0 to the power of arg1 and save to arg2
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = struct.pack('f', struct.unpack('f', self.memory[int.from_bytes(line_args[0], byteorder='big')])[0] ** struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')])[0])
-				elif cmd_name == 15:
-					# Preform an and gate on arg0 and arg1, save to arg2
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = struct.pack('f', struct.unpack('f', self.memory[int.from_bytes(line_args[0], byteorder='big')])[0] & struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')])[0])
-				elif cmd_name == 16:
-					# Preform an or gate on arg0 and arg1, save to arg2
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = struct.pack('f', struct.unpack('f', self.memory[int.from_bytes(line_args[0], byteorder='big')])[0] | struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')])[0])
-				elif cmd_name == 17:
-					# Preform an xor gate on arg0 and arg1, save to arg2
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = struct.pack('f', struct.unpack('f', self.memory[int.from_bytes(line_args[0], byteorder='big')])[0] ^ struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')])[0])
-				elif cmd_name == 18:
-					# Preform a not gate on arg0, save to arg1
-					output = not int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big')
-					if output == False:
-						output = b'\x00\x00\x00\x00'
-					else:
-						output = b'\x00\x00\x00\x01'
-					self.memory[int.from_bytes(line_args[1], byteorder='big')] = output
-				elif cmd_name == 19:
-					# Remove data at arg0
-					del self.memory[int.from_bytes(line_args[0], byteorder='big')]
-				elif cmd_name == 20:
-					# Go to line arg0
-					line_num = int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') - 1
-				elif cmd_name == 21:
-					# Go to line arg0 if arg1 == arg2
-					if self.memory[int.from_bytes(line_args[1], byteorder='big')] == self.memory[int.from_bytes(line_args[2], byteorder='big')]:
-						line_num = int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') - 1
-				elif cmd_name == 22:
-					# Go to line arg0 if arg1 > arg2 (float)
-					if struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')]) > struct.unpack('f', self.memory[int.from_bytes(line_args[2], byteorder='big')]):
-						line_num = int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') - 1
-				elif cmd_name == 23:
-					# Go to line arg0 if arg1 < arg2 (float)
-					if struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')]) < struct.unpack('f', self.memory[int.from_bytes(line_args[2], byteorder='big')]):
-						line_num = int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') - 1
-				elif cmd_name == 24:
-					# Go to line arg0 if arg1 >= arg2 (float)
-					if struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')]) >= struct.unpack('f', self.memory[int.from_bytes(line_args[2], byteorder='big')]):
-						line_num = int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') - 1
-				elif cmd_name == 25:
-					# Go to line arg0 if arg1 <= arg2 (float)
-					if struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')]) <= struct.unpack('f', self.memory[int.from_bytes(line_args[2], byteorder='big')]):
-						line_num = int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') - 1
-				elif cmd_name == 26:
-					# Takes arg0 to arg1 from arg2, saves to arg3
-					self.memory[int.from_bytes(line_args[3], byteorder='big')] = self.memory[int.from_bytes(line_args[2], byteorder='big')][int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') : int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big')]
-				elif cmd_name == 27:
-					# Gets input from standard input, saves to arg0
-					input_data = bytes(input(), ENCODING)
-					self.memory[int.from_bytes(line_args[0], byteorder='big')] = input_data
-				elif cmd_name == 28:
-					# Gets arg0 of inputted cmd args and sets to arg1 (string)
-					self.memory[int.from_bytes(line_args[1], byteorder='big')] = bytes(runtime_args[int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big')], ENCODING)
-				elif cmd_name == 29:
-					# Print the memory
-					self.print_handler(str(self.memory))
-				elif cmd_name == 30:
-					# Add data at arg0 to self.output
-					print_data = self.memory[int.from_bytes(line_args[0], byteorder='big')]
-					if len(line_args) == 3:
-						if line_args[2] == b'\x01':
-							# Don't write to output
-							pass
-						elif line_args[2] == b'\x00':
-							# Write to output
-							self.output += print_data
-					else:
-						# Write to output
-						self.output += print_data
-					write_type = int.from_bytes(line_args[1], byteorder='big')
-					# If we should print to shell
-					if self.print_handler:
-						# If we print directly
-						if write_type == 0:
-							self.print_handler(str(bytes(print_data)))
-						elif write_type == 1:
-							# If we print as a string
-							self.print_handler(str(print_data, encoding=ENCODING))
-						elif write_type == 2:
-							# If we print as an int
-							self.print_handler(str(int.from_bytes(print_data, byteorder='big')))
-						elif write_type == 3:
-							# If we print as a float
-							self.print_handler(str(struct.unpack('f', print_data)[0]))
-						elif write_type == 4:
-							# If we print as a signed int
-							self.print_handler(str(int.from_bytes(print_data, byteorder='big', signed=True)))
-				elif cmd_name == 31:
-					# Add the values at arg0 and arg1 and save to arg2 (int)
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = int.to_bytes(int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') + int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big'), 4, byteorder='big')
-				elif cmd_name == 32:
-					# Subtract the values at arg0 and arg1 and save to arg2 (int)
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = int.to_bytes(int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') - int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big'), 4, byteorder='big')
-				elif cmd_name == 33:
-					# Multiply the values at arg0 and arg1 and save to arg2 (int)
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = int.to_bytes(int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') * int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big'), 4, byteorder='big')
-				elif cmd_name == 34:
-					# Divide the values at arg0 and arg1 and save to arg2 (int)
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = int.to_bytes(int(int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') / int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big')), 4, byteorder='big')
-				elif cmd_name == 35:
-					# Raise arg0 to the power of arg1 and save to arg2 (int)
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = int.to_bytes(int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') ** int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big'), 4, byteorder='big')
-				elif cmd_name == 36:
-					# Preform an and gate on arg0 and arg1, save to arg2 (int)
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = int.to_bytes(int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') & int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big'), 4, byteorder='big')
-				elif cmd_name == 37:
-					# Preform an or gate on arg0 and arg1, save to arg2 (int)
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = int.to_bytes(int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') | int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big'), 4, byteorder='big')
-				elif cmd_name == 38:
-					# Preform an xor gate on arg0 and arg1, save to arg2 (int)
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = int.to_bytes(int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') ^ int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big'), 4, byteorder='big')
-				elif cmd_name == 39:
-					# arg0 (int) to string and save to arg1
-					self.memory[int.from_bytes(line_args[1], byteorder='big')] = bytes(str(int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big')), ENCODING)
-				elif cmd_name == 40:
-					# arg0 (float) to string and save to arg1
-					self.memory[int.from_bytes(line_args[1], byteorder='big')] = bytes(str(struct.unpack('f', self.memory[int.from_bytes(line_args[0], byteorder='big')])[0]), ENCODING)
-				elif cmd_name == 41:
-					# arg0 (string) to int and save to arg1
-					self.memory[int.from_bytes(line_args[1], byteorder='big')] = int.to_bytes(int(str(self.memory[int.from_bytes(line_args[0], byteorder='big')], ENCODING)), 4, byteorder='big')
-				elif cmd_name == 42:
-					# arg0 (string) to float and save to arg1
-					self.memory[int.from_bytes(line_args[1], byteorder='big')] = struct.pack('f', float(str(self.memory[int.from_bytes(line_args[0], byteorder='big')], ENCODING)))
-				elif cmd_name == 43:
-					# arg0 (int) to float and save to arg1
-					self.memory[int.from_bytes(line_args[1], byteorder='big')] = struct.pack('f', float(int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big')))
-				elif cmd_name == 44:
-					# arg0 (float) to int and save to arg1
-					self.memory[int.from_bytes(line_args[1], byteorder='big')] = int.to_bytes(int(struct.unpack('f', self.memory[int.from_bytes(line_args[0], byteorder='big')])[0]), 4, byteorder='big')
-				elif cmd_name == 45:
-					# Duplicate arg0 arg1 times
-					self.memory[int.from_bytes(line_args[0], byteorder='big')] = self.memory[int.from_bytes(line_args[0], byteorder='big')] * int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big')
-				elif cmd_name == 46:
-					# Load file arg0 and read bytes to arg1
-					if not self.useopefiles:
-						if self.oplos == None:
-							file_buffer = open(str(self.memory[int.from_bytes(line_args[0], byteorder='big')], ENCODING), 'rb')
-							self.memory[int.from_bytes(line_args[1], byteorder='big')] = file_buffer.read()
-							file_buffer.close()
-						else:
-							self.memory[int.from_bytes(line_args[1], byteorder='big')] = self.oplos.get_file(str(self.memory[int.from_bytes(line_args[0], byteorder='big')], ENCODING))
-					else:
-						self.memory[int.from_bytes(line_args[1], byteorder='big')] = self.opefiles[str(self.memory[int.from_bytes(line_args[0], byteorder='big')], ENCODING)]
-				elif cmd_name == 47:
-					# Write data at arg1 to file arg0
-					if self.oplos == None:
-						file_buffer = open(str(self.memory[int.from_bytes(line_args[0], byteorder='big')], ENCODING), 'wb')
-						file_buffer.write(self.memory[int.from_bytes(line_args[1], byteorder='big')])
-						file_buffer.close()
-					else:
-						if self.oplos.data['shared_buffer'][0] == 0 or sudo == True:
-							self.oplos.create_file(str(self.memory[int.from_bytes(line_args[0], byteorder='big')], ENCODING), self.memory[int.from_bytes(line_args[1], byteorder='big')])
-				elif cmd_name == 48:
-					# Delete file at arg0
-					if self.oplos == None:
-						os.remove(str(self.memory[int.from_bytes(line_args[0], byteorder='big')], ENCODING))
-					else:
-						if self.oplos.data['shared_buffer'][0] == 0 or sudo == True:
-							self.oplos.delete_file(str(self.memory[int.from_bytes(line_args[0], byteorder='big')], ENCODING))
-				elif cmd_name == 49:
-					# Get the code buffer and save to arg0
-					self.memory[int.from_bytes(line_args[0], byteorder='big')] = code
-				elif cmd_name == 50:
-					# Change the code buffer to arg0 and set the line number to arg1
-					code = self.memory[int.from_bytes(line_args[0], byteorder='big')]
-					split_code = self.split_code(code)
-					line_num = int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big') - 1
-				elif cmd_name == 51:
-					# Get the output buffer and set it to arg0
-					self.memory[int.from_bytes(line_args[0], byteorder='big')] = self.output
-				elif cmd_name == 52:
-					# Set the output buffer to arg0
-					self.output = self.memory[int.from_bytes(line_args[0], byteorder='big')]
-				elif cmd_name == 53:
-					# Get binary representation of memory and set to arg0
-					self.memory[int.from_bytes(line_args[0], byteorder='big')] = self.get_binary_memory()
-				elif cmd_name == 54:
-					# Set memory using binary representation of memory at arg0
-					self.set_binary_memory(self.memory[int.from_bytes(line_args[0], byteorder='big')])
-				elif cmd_name == 55:
-					# Run system command arg0, save output to arg1
-					if self.oplos == None:
-						self.memory[int.from_bytes(line_args[1], byteorder='big')] = bytes([os.system(str(self.memory[int.from_bytes(line_args[0], byteorder='big')], ENCODING))])
-					else:
-						if self.oplos.data['shared_buffer'][0] == 0 or sudo == True:
-							self.memory[int.from_bytes(line_args[1], byteorder='big')] = bytes([self.oplos.run_command(str(self.memory[int.from_bytes(line_args[0], byteorder='big')], ENCODING))])
-				elif cmd_name == 56:
-					# Get arg0 chars from standard input, save to arg1
-					self.memory[int.from_bytes(line_args[1], byteorder='big')] = bytes(getchars(int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big')), ENCODING)
-				elif cmd_name == 57:
-					# Get listdir and save to arg0
-					self.memory[int.from_bytes(line_args[0], byteorder='big')] = list_to_bytes([bytes(i, ENCODING) for i in os.listdir()])
-				elif cmd_name == 58:
-					# Pass
-					pass
-				elif cmd_name == 59:
-					# Get time.time and save to arg0
-					self.memory[int.from_bytes(line_args[0], byteorder='big')] = struct.pack('f', time.time())
-				elif cmd_name == 60:
-					# Get time.asctime and save to arg0
-					self.memory[int.from_bytes(line_args[0], byteorder='big')] = bytes(time.asctime(), ENCODING)
-				elif cmd_name == 61:
-					# Wait arg0 (float) seconds
-					time.sleep(struct.unpack('f', self.memory[int.from_bytes(line_args[0], byteorder='big')])[0])
-				elif cmd_name == 62:
-					# Copy data at pointer of arg0 to arg1
-					self.memory[int.from_bytes(line_args[1], byteorder='big')] = bytearray(self.memory[int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big')]).copy()
-				elif cmd_name == 63:
-					# Set data at pointer at arg0 to arg1
-					self.memory[int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big')] = self.memory[int.from_bytes(line_args[1], byteorder='big')]
-				elif cmd_name == 64:
-					# Go to line arg0 if arg1 == arg2 else arg3
-					if self.memory[int.from_bytes(line_args[1], byteorder='big')] == self.memory[int.from_bytes(line_args[2], byteorder='big')]:
-						line_num = int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') - 1
-					else:
-						line_num = int.from_bytes(self.memory[int.from_bytes(line_args[3], byteorder='big')], byteorder='big') - 1
-				elif cmd_name == 65:
-					# Go to line arg0 if arg1 > arg2 (float) else arg3
-					if struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')]) > struct.unpack('f', self.memory[int.from_bytes(line_args[2], byteorder='big')]):
-						line_num = int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') - 1
-					else:
-						line_num = int.from_bytes(self.memory[int.from_bytes(line_args[3], byteorder='big')], byteorder='big') - 1
-				elif cmd_name == 66:
-					# Go to line arg0 if arg1 < arg2 (float) else arg3
-					if struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')]) < struct.unpack('f', self.memory[int.from_bytes(line_args[2], byteorder='big')]):
-						line_num = int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') - 1
-					else:
-						line_num = int.from_bytes(self.memory[int.from_bytes(line_args[3], byteorder='big')], byteorder='big') - 1
-				elif cmd_name == 67:
-					# Go to line arg0 if arg1 >= arg2 (float) else arg3
-					if struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')]) >= struct.unpack('f', self.memory[int.from_bytes(line_args[2], byteorder='big')]):
-						line_num = int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') - 1
-					else:
-						line_num = int.from_bytes(self.memory[int.from_bytes(line_args[3], byteorder='big')], byteorder='big') - 1
-				elif cmd_name == 68:
-					# Go to line arg0 if arg1 <= arg2 (float) else arg3
-					if struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')]) <= struct.unpack('f', self.memory[int.from_bytes(line_args[2], byteorder='big')]):
-						line_num = int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') - 1
-					else:
-						line_num = int.from_bytes(self.memory[int.from_bytes(line_args[3], byteorder='big')], byteorder='big') - 1
-				elif cmd_name == 69:
-					# Modulo arg0 and arg1 and save to arg2 (float)
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = struct.pack('f', struct.unpack('f', self.memory[int.from_bytes(line_args[0], byteorder='big')])[0] % struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')])[0])
-				elif cmd_name == 70:
-					# Modulo arg0 and arg1 and save to arg2 (int)
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = int.to_bytes(int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') % int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big'), 4, byteorder='big')
-				elif cmd_name == 71:
-					# Go to line arg0 if arg1 == arg2 else arg3 (float)
-					if struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')]) == struct.unpack('f', self.memory[int.from_bytes(line_args[2], byteorder='big')]):
-						line_num = int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') - 1
-					else:
-						line_num = int.from_bytes(self.memory[int.from_bytes(line_args[3], byteorder='big')], byteorder='big') - 1
-				elif cmd_name == 72:
-					# Go to line arg0 if arg1 == arg2 (float)
-					if struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')]) == struct.unpack('f', self.memory[int.from_bytes(line_args[2], byteorder='big')]):
-						line_num = int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') - 1
-				elif cmd_name == 73:
-					# Hash arg0 and save to arg1 (sha256)
-					self.memory[int.from_bytes(line_args[1], byteorder='big')] = hashlib.sha256(self.memory[int.from_bytes(line_args[0], byteorder='big')]).digest()
-				elif cmd_name == 74:
-					# Create a screen with size arg0 by arg1
-					self.screen = ScreenBuffer((struct.unpack('f', self.memory[int.from_bytes(line_args[0], byteorder='big')])[0], struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')])[0]), self)
-				elif cmd_name == 75:
-					# Start the screen
-					self.screen.start()
-				elif cmd_name == 76:
-					# End the screen
-					self.screen.stop()
-				elif cmd_name == 77:
-					# Set pixel arg0 arg1 to color (arg2 arg3 arg4)
-					self.screen.set_pixel((struct.unpack('f', self.memory[int.from_bytes(line_args[0], byteorder='big')])[0], struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')])[0]), (struct.unpack('f', self.memory[int.from_bytes(line_args[2], byteorder='big')])[0] * 255, struct.unpack('f', self.memory[int.from_bytes(line_args[3], byteorder='big')])[0] * 255, struct.unpack('f', self.memory[int.from_bytes(line_args[4], byteorder='big')])[0] * 255))
-				elif cmd_name == 78:
-					# Set screen name to arg0
-					self.screen.set_name(str(self.memory[int.from_bytes(line_args[0], byteorder='big')], ENCODING))
-				elif cmd_name == 79:
-					# Get the current screen buffer data and save to arg0
-					buf = bytearray()
-					# Iterate over all rows
-					for i in self.screen.buffer:
-						# Iterate over all columns
-						for j in i:
-							# Add the pixel
-							buf += bytes([int(j[0]), int(j[1]), int(j[2])])
-					# Save to memory
-					self.memory[int.from_bytes(line_args[0], byteorder='big')] = buf
-				elif cmd_name == 80:
-					# Set the current screen buffer using data at arg0
-					# Get the buffer
-					buf = self.memory[int.from_bytes(line_args[0], byteorder='big')]
-					# Iterate over rows
-					p = 0
-					for i in range(self.screen.buffer.shape[0]):
-						for j in range(self.screen.buffer.shape[1]):
-							# Set the pixel
-							self.screen.set_pixel((i, j), (buf[p], buf[p + 1], buf[p + 2]))
-							p += 3
-				elif cmd_name == 81:
-					# Get the shared OPL OS buffer and save to arg0
-					self.memory[int.from_bytes(line_args[0], byteorder='big')] = self.oplos.data['shared_buffer']
-				elif cmd_name == 82:
-					# Set the shared OPL OS buffer to arg0
-					# Ensure bit 0 didn't change
-					if self.oplos.data['shared_buffer'][0] == 0 or sudo == True:
-						self.oplos.data['shared_buffer'] = self.memory[int.from_bytes(line_args[0], byteorder='big')]
-						assert len(self.oplos.data['shared_buffer']) == 512
-						self.oplos.data_to_binary(self.oplos.data)
-				elif cmd_name == 83:
-					# Get all memory keys and save to arg0
-					self.memory[int.from_bytes(line_args[0], byteorder='big')] = b''.join([int.to_bytes(i, 4, byteorder='big') for i in list(self.memory.keys())])
-				elif cmd_name == 84:
-					# Delete all memory
-					self.memory = {}
-				elif cmd_name == 85:
-					# Preform a bit shift left << on arg0 with arg1 bits, and save to arg2
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = int.to_bytes(int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') << int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big'), 4, byteorder='big')
-				elif cmd_name == 86:
-					# Preform a bit shift right >> on arg0 with arg1 bits, and save to arg2
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = int.to_bytes(int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') >> int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big'), 4, byteorder='big')
-				elif cmd_name == 87:
-					# Reverse the data at arg0, save to arg1
-					self.memory[int.from_bytes(line_args[1], byteorder='big')] = bytearray(reversed(self.memory[int.from_bytes(line_args[0], byteorder='big')]))
-				elif cmd_name == 88:
-					# Push code from arg0 to arg1 to a new thread. (asynchronous command) (OEP 001)
-					new_code = split_code[int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') : int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big')]
-					del split_code[int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') : int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big')]
-					thread = threading.Thread(target=self.execute, args=(new_code, runtime_args, False, self.namespace, self.active_namespace, labels, sudo))
-					thread.start()
-				elif cmd_name == 89:
-					# Push code from arg0 to arg1 to a new thread. (non-async command) (OEP 001)
-					new_code = split_code[int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') : int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big')]
-					del split_code[int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') : int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big')]
-					thread = threading.Thread(target=self.execute, args=(new_code, runtime_args, False, self.namespace, self.active_namespace, labels, sudo))
-					thread.start()
-					thread.join()
-				elif cmd_name == 90:
-					# Switch to namespace arg0 (OEP 003)
-					self.active_namespace = int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big')
-					self.memory = self.namespace[self.active_namespace]
-				elif cmd_name == 91:
-					# Create namespace arg0 (OEP 003)
-					self.namespace[int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big')] = {}
-				elif cmd_name == 92:
-					# Delete namespace arg0 (OEP 003)
-					if int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') == self.active_namespace:
-						raise Exception('Cannot delete current namespace.')
-					del self.namespace[int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big')]
-				elif cmd_name == 93:
-					# Get all namespace IDs and save to arg0 (OEP 003)
-					self.memory[int.from_bytes(line_args[0], byteorder='big')] = b''.join([int.to_bytes(i, 4, byteorder='big') for i in list(self.namespace.keys())])
-				elif cmd_name == 94:
-					# Delete all but the current namespace (OEP 003)
-					for key in list(self.namespace.keys()):
-						if key == self.active_namespace:
-							# Disregard this namespace
-							pass
-						else:
-							# Delete this namespace
-							del self.namespace[key]
-				elif cmd_name == 95:
-					# Copy data from arg0 in the current namespace to arg1 in namespace arg2 (OEP 007)
-					self.namespace[int.from_bytes(self.memory[int.from_bytes(line_args[2], byteorder='big')], byteorder='big')][int.from_bytes(line_args[1], byteorder='big')] = self.memory[int.from_bytes(line_args[0], byteorder='big')]
-				elif cmd_name == 96:
-					# Import file at arg0 and load it into namespace arg1 (OEP 006, OEP 003)
-					if self.oplos.data['shared_buffer'][0] != 0:
-						raise Exception('Loading modules in safe mode is not permitted.')
-					# Get file name
-					filename = self.memory[int.from_bytes(line_args[0], byteorder='big')]
-					# Move to namespace arg1
-					current_namespace = self.active_namespace
-					self.active_namespace = int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big')
-					self.memory = self.namespace[self.active_namespace]
-					# Load the file
-					if not self.useopefiles:
-						if self.oplos == None:
-							file_buffer = open(str(filename, ENCODING), 'rb')
-							filedata = file_buffer.read()
-							file_buffer.close()
-						else:
-							filedata = self.oplos.get_file(str(filename, ENCODING))
-					else:
-						filedata = self.opefiles[str(filename, ENCODING)]
-					# Execute the loaded file
-					self.execute(filedata, runtime_args, True, self.namespace, self.active_namespace, sudo=sudo)
-					# Move back to the original namespace
-					self.active_namespace = current_namespace
-					self.memory = self.namespace[self.active_namespace]
-				elif cmd_name == 97:
-					# Execute the code at arg0 in Python (OEP 011)
-					exec(str(self.memory[int.from_bytes(line_args[0], byteorder='big')], ENCODING))
-				elif cmd_name == 98:
-					# Goto line arg0 if arg1 is in arg2 else arg3
-					if self.memory[int.from_bytes(line_args[1], byteorder='big')] in self.memory[int.from_bytes(line_args[2], byteorder='big')]:
-						line_num = int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') - 1
-					else:
-						line_num = int.from_bytes(self.memory[int.from_bytes(line_args[3], byteorder='big')], byteorder='big') - 1
-				elif cmd_name == 99:
-					# Allow closing the screen buffer (QUICK FIX)
-					self.screen.allow_close = True
-				elif cmd_name == 100:
-					# Disallow closing the screen buffer (QUICK FIX)
-					self.screen.allow_close = False
-				elif cmd_name == 101:
-					# Get the OPL OS system data buffer and save to arg0 (OEP 012)
-					self.memory[int.from_bytes(line_args[0], byteorder='big')] = self.oplos.file.data
-				elif cmd_name == 102:
-					# Set the OPL OS system data buffer to arg0 (Dangerous function, raises a warning) (OEP 012)
-					if self.print_handler:
-						# Give a warning
-						self.print_handler('WARNING: OPL WILL ATTEMPT TO MODIFY THE OPL OS FILE BUFFER. THIS COULD CAUSE CORRUPTION. CONTINUE? ')
-						c = getchars(1).lower()
-						self.print_handler('\n')
-						if c == 'y':
-							# Continue
-							pass
-						else:
-							# Don't continue
-							raise Exception('Program ended due to user blocking use of OPCODE 102')
-					if self.oplos.data['shared_buffer'][0] == 0 or sudo == True:
-						self.oplos.file.data = self.memory[int.from_bytes(line_args[0], byteorder='big')]
-				elif cmd_name == 103:
-					# Get the name of the OPL OS user and save to arg0 (OEP 012)
-					self.memory[int.from_bytes(line_args[0], byteorder='big')] = bytes(self.oplos.data['name'], ENCODING)
-				elif cmd_name == 104:
-					# Set the name of the OPL OS user to arg0 (OEP 012)
-					if self.oplos.data['shared_buffer'][0] == 0 or sudo == True:
-						self.oplos.data['name'] = str(self.memory[int.from_bytes(line_args[0], byteorder='big')], ENCODING)
-						self.oplos.data_to_binary(self.oplos.data)
-				elif cmd_name == 105:
-					# Get the password hash of the OPL OS and save to arg0 (OEP 012)
-					self.memory[int.from_bytes(line_args[0], byteorder='big')] = self.oplos.data['password_hash']
-				elif cmd_name == 106:
-					# Set the password hash of the OPL OS to arg0 (OEP 012)
-					if self.oplos.data['shared_buffer'][0] == 0 or sudo == True:
-						self.oplos.data['password_hash'] = self.memory[int.from_bytes(line_args[0], byteorder='big')]
-						self.oplos.data_to_binary(self.oplos.data)
-				elif cmd_name == 107:
-					# Get the current mouse x and y and set to arg0 and arg1 (OEP 017)
-					pos = self.screen.pygame.mouse.get_pos()
-					self.memory[int.from_bytes(line_args[0], byteorder='big')] = int.to_bytes(pos[0], 4, byteorder='big')
-					self.memory[int.from_bytes(line_args[1], byteorder='big')] = int.to_bytes(pos[1], 4, byteorder='big')
-				elif cmd_name == 108:
-					# Set the memory address arg0 to be the address to use for handling mouse ups and downs (OEP 017)
-					self.screen.mouse_state_mem_add = int.from_bytes(line_args[0], byteorder='big')
-				elif cmd_name == 109:
-					# Compile and run code at arg0 (OEP 016)
-					from . import OPLCompiler
-					c = OPLCompiler()
-					code = c.compile(str(self.memory[int.from_bytes(line_args[0], byteorder='big')]))
-					self.execute(code, runtime_args, True, self.namespace, self.active_namespace, sudo=sudo)
-				elif cmd_name == 110:
-					# Compile the code at arg0 and save to arg1 (OEP 016)
-					from . import OPLCompiler
-					c = OPLCompiler()
-					code = c.compile(str(self.memory[int.from_bytes(line_args[0], byteorder='big')]))
-					self.memory[int.from_bytes(line_args[1], byteorder='big')] = code
-				elif cmd_name == 111:
-					# Run the code at arg0 (OEP 016)
-					self.execute(self.memory[int.from_bytes(line_args[0], byteorder='big')], runtime_args, True, self.namespace, self.active_namespace, sudo=sudo)
-				elif cmd_name == 112:
-					# Set the error mode to DISPLAY STOP (OEP 015)
-					self.error_mode = 'ds'
-				elif cmd_name == 113:
-					# Set the error mode to DISPLAY (OEP 015)
-					self.error_mode = 'd'
-				elif cmd_name == 114:
-					# Set the error mode to STOP (OEP 015)
-					self.error_mode = 's'
-				elif cmd_name == 115:
-					# Set the error mode to NONE (OEP 015)
-					self.error_mode = ''
-				elif cmd_name == 116:
-					# Compare values arg0 and arg1 and set to arg2 (arg0 == arg1, arg2 = 0 : arg0 < arg1, arg2 = 1 : arg0 > arg1, arg2 = 2)
-					arg0 = self.memory[int.from_bytes(line_args[0], byteorder='big')]
-					arg1 = self.memory[int.from_bytes(line_args[1], byteorder='big')]
-					if arg0 == arg1:
-						self.memory[int.from_bytes(line_args[2], byteorder='big')] = bytes([0])
-					elif arg0 < arg1:
-						self.memory[int.from_bytes(line_args[2], byteorder='big')] = bytes([1])
-					elif arg0 > arg1:
-						self.memory[int.from_bytes(line_args[2], byteorder='big')] = bytes([2])
-				elif cmd_name == 117:
-					# Get the IP address, and save to arg0 (OEP 002)
-					self.memory[int.from_bytes(line_args[0], byteorder='big')] = bytes(socket.gethostbyname(socket.gethostname()), ENCODING)
-				elif cmd_name == 118:
-					# Load a binary module at arg0 to the current active namespace (Overwrites the current loaded module) (OEP 019)
-					filename = self.memory[int.from_bytes(line_args[0], byteorder='big')]
-					# Get the file data
-					if not self.useopefiles:
-						if self.oplos == None:
-							file_buffer = open(str(filename, ENCODING), 'rb')
-							filedata = file_buffer.read()
-							file_buffer.close()
-						else:
-							filedata = self.oplos.get_file(str(filename, ENCODING))
-					else:
-						filedata = self.opefiles[str(filename, ENCODING)]
-					# Load the module              \/ Load the class   \/ Create an instance
-					self.memory['loaded_module'] = dill.loads(filedata)()
-					# Initialize the functions for the module, so it can use write, etc.
-					self.memory['loaded_module'].init_functions()
-				elif cmd_name == 119:
-					# Remove the current loaded module for the active namespace (OEP 019)
-					del self.memory['loaded_module']
-				elif cmd_name == 120:
-					# Set the use OPE files mode to true (OEP 013)
-					self.useopefiles = True
-				elif cmd_name == 121:
-					# Set the use OPE files mode to false (OEP 013)
-					self.useopefiles = False
-				elif cmd_name == 122:
-					# Get the number of runtime args and save it to arg0
-					self.memory[int.from_bytes(line_args[0], byteorder='big')] = bytes([len(runtime_args)])
-				elif cmd_name == 123:
-					# Add arg0 and arg1 and save it to arg2 without 4 byte length restriction
-					number = int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') + int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big')
-					number_len = int(math.log(n, 256)) + 1
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = int.to_bytes(number, number_len, byteorder='big')
-				elif cmd_name == 124:
-					# Subtract arg0 from arg1 and save it to arg2 without 4 byte length restriction
-					number = int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big') - int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big')
-					number_len = int(math.log(n, 256)) + 1
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = int.to_bytes(number, number_len, byteorder='big')
-				elif cmd_name == 125:
-					# Create a label at the current line named arg0 (OEP 022)
-					pass
-				elif cmd_name == 126:
-					# Go to label arg0 (OEP 022)
-					line_num = labels[bytes(line_args[0])] - 1
-				elif cmd_name == 127:
-					# Go to label arg0 if arg1 == arg2 (OEP 022)
-					if self.memory[int.from_bytes(line_args[1], byteorder='big')] == self.memory[int.from_bytes(line_args[2], byteorder='big')]:
-						line_num = labels[bytes(line_args[0])] - 1
-				elif cmd_name == 128:
-					# Go to label arg0 if arg1 != arg2 (OEP 022)
-					if self.memory[int.from_bytes(line_args[1], byteorder='big')] != self.memory[int.from_bytes(line_args[2], byteorder='big')]:
-						line_num = labels[bytes(line_args[0])] - 1
-				elif cmd_name == 129:
-					# Go to label arg0 if arg1 > arg2 (float) (OEP 022)
-					if struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')]) > struct.unpack('f', self.memory[int.from_bytes(line_args[2], byteorder='big')]):
-						line_num = labels[bytes(line_args[0])] - 1
-				elif cmd_name == 130:
-					# Go to label arg0 if arg1 < arg2 (float) (OEP 022)
-					if struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')]) < struct.unpack('f', self.memory[int.from_bytes(line_args[2], byteorder='big')]):
-						line_num = labels[bytes(line_args[0])] - 1
-				elif cmd_name == 131:
-					# Go to label arg0 if arg1 >= arg2 (float) (OEP 022)
-					if struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')]) >= struct.unpack('f', self.memory[int.from_bytes(line_args[2], byteorder='big')]):
-						line_num = labels[bytes(line_args[0])] - 1
-				elif cmd_name == 132:
-					# Go to label arg0 if arg1 <= arg2 (float) (OEP 022)
-					if struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')]) <= struct.unpack('f', self.memory[int.from_bytes(line_args[2], byteorder='big')]):
-						line_num = labels[bytes(line_args[0])] - 1
-				elif cmd_name == 133:
-					# Go to label arg0 if arg1 == arg2 else arg3 (OEP 022)
-					if self.memory[int.from_bytes(line_args[1], byteorder='big')] == self.memory[int.from_bytes(line_args[2], byteorder='big')]:
-						line_num = labels[bytes(line_args[0])] - 1
-					else:
-						line_num = labels[bytes(line_args[3])] - 1
-				elif cmd_name == 134:
-					# Go to label arg0 if arg1 > arg2 (float) else arg3 (OEP 022)
-					if struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')]) > struct.unpack('f', self.memory[int.from_bytes(line_args[2], byteorder='big')]):
-						line_num = labels[bytes(line_args[0])] - 1
-					else:
-						line_num = labels[bytes(line_args[3])] - 1
-				elif cmd_name == 135:
-					# Go to label arg0 if arg1 < arg2 (float) else arg3 (OEP 022)
-					if struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')]) < struct.unpack('f', self.memory[int.from_bytes(line_args[2], byteorder='big')]):
-						line_num = labels[bytes(line_args[0])] - 1
-					else:
-						line_num = labels[bytes(line_args[3])] - 1
-				elif cmd_name == 136:
-					# Go to label arg0 if arg1 >= arg2 (float) else arg3 (OEP 022)
-					if struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')]) >= struct.unpack('f', self.memory[int.from_bytes(line_args[2], byteorder='big')]):
-						line_num = labels[bytes(line_args[0])] - 1
-					else:
-						line_num = labels[bytes(line_args[3])] - 1
-				elif cmd_name == 137:
-					# Go to label arg0 if arg1 <= arg2 (float) else arg3 (OEP 022)
-					if struct.unpack('f', self.memory[int.from_bytes(line_args[1], byteorder='big')]) <= struct.unpack('f', self.memory[int.from_bytes(line_args[2], byteorder='big')]):
-						line_num = labels[bytes(line_args[0])] - 1
-					else:
-						line_num = labels[bytes(line_args[3])] - 1
-				elif cmd_name == 138:
-					# Go to label arg0 if arg1 > arg2 (int) else arg3 (OEP 022)
-					if int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big') > int.from_bytes(self.memory[int.from_bytes(line_args[2], byteorder='big')], byteorder='big'):
-						line_num = labels[bytes(line_args[0])] - 1
-					else:
-						line_num = labels[bytes(line_args[3])] - 1
-				elif cmd_name == 139:
-					# Go to label arg0 if arg1 < arg2 (int) else arg3 (OEP 022)
-					if int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big') < int.from_bytes(self.memory[int.from_bytes(line_args[2], byteorder='big')], byteorder='big'):
-						line_num = labels[bytes(line_args[0])] - 1
-					else:
-						line_num = labels[bytes(line_args[3])] - 1
-				elif cmd_name == 140:
-					# Go to label arg0 if arg1 >= arg2 (int) else arg3 (OEP 022)
-					if int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big') >= int.from_bytes(self.memory[int.from_bytes(line_args[2], byteorder='big')], byteorder='big'):
-						line_num = labels[bytes(line_args[0])] - 1
-					else:
-						line_num = labels[bytes(line_args[3])] - 1
-				elif cmd_name == 141:
-					# Go to label arg0 if arg1 <= arg2 (int) else arg3 (OEP 022)
-					if int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big') <= int.from_bytes(self.memory[int.from_bytes(line_args[2], byteorder='big')], byteorder='big'):
-						line_num = labels[bytes(line_args[0])] - 1
-					else:
-						line_num = labels[bytes(line_args[3])] - 1
-				elif cmd_name == 142:
-					# Go to label arg0 if arg1 != arg2 else arg3 (OEP 022)
-					if self.memory[int.from_bytes(line_args[1], byteorder='big')] != self.memory[int.from_bytes(line_args[2], byteorder='big')]:
-						line_num = labels[bytes(line_args[0])] - 1
-					else:
-						line_num = labels[bytes(line_args[3])] - 1
-				elif cmd_name == 143:
-					# Push code from labels arg0 to arg1 to a new thread. (asynchronous command) (OEP 001) (OEP 022)
-					new_code = split_code[labels[bytes(line_args[0])] : labels[bytes(line_args[1])]]
-					del split_code[labels[bytes(line_args[0])] : labels[bytes(line_args[1])]]
-					thread = threading.Thread(target=self.execute, args=(new_code, runtime_args, False, self.namespace, self.active_namespace, labels, sudo))
-					thread.start()
-				elif cmd_name == 144:
-					# Push code from labels arg0 to arg1 to a new thread. (non-async command) (OEP 001) (OEP 022)
-					new_code = split_code[labels[bytes(line_args[0])] : labels[bytes(line_args[1])]]
-					del split_code[labels[bytes(line_args[0])] : labels[bytes(line_args[1])]]
-					thread = threading.Thread(target=self.execute, args=(new_code, runtime_args, False, self.namespace, self.active_namespace, labels, sudo))
-					thread.start()
-					thread.join()
-				elif cmd_name == 145:
-					# Add the values at arg0 and arg1 and save to arg2 (signed int)
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = int.to_bytes(int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big', signed=True) + int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big', signed=True), 4, byteorder='big', signed=True)
-				elif cmd_name == 146:
-					# Subtract the values at arg0 and arg1 and save to arg2 (signed int)
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = int.to_bytes(int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big', signed=True) - int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big', signed=True), 4, byteorder='big', signed=True)
-				elif cmd_name == 147:
-					# Multiply the values at arg0 and arg1 and save to arg2 (signed int)
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = int.to_bytes(int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big', signed=True) * int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big', signed=True), 4, byteorder='big', signed=True)
-				elif cmd_name == 148:
-					# Divide the values at arg0 and arg1 and save to arg2 (signed int)
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = int.to_bytes(int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big', signed=True) / int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big', signed=True), 4, byteorder='big', signed=True)
-				elif cmd_name == 149:
-					# Raise arg0 to the power of arg1 and save to arg2 (signed int)
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = int.to_bytes(int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big', signed=True) ** int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big', signed=True), 4, byteorder='big', signed=True)
-				elif cmd_name == 150:
-					# Preform an and gate on arg0 and arg1, save to arg2 (signed int)
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = int.to_bytes(int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big', signed=True) & int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big', signed=True), 4, byteorder='big', signed=True)
-				elif cmd_name == 151:
-					# Preform an or gate on arg0 and arg1, save to arg2 (signed int)
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = int.to_bytes(int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big', signed=True) | int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big', signed=True), 4, byteorder='big', signed=True)
-				elif cmd_name == 152:
-					# Preform an xor gate on arg0 and arg1, save to arg2 (signed int)
-					self.memory[int.from_bytes(line_args[2], byteorder='big')] = int.to_bytes(int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big', signed=True) ^ int.from_bytes(self.memory[int.from_bytes(line_args[1], byteorder='big')], byteorder='big', signed=True), 4, byteorder='big', signed=True)
-				elif cmd_name == 153:
-					# arg0 (signed int) to string and save to arg1
-					self.memory[int.from_bytes(line_args[1], byteorder='big')] = bytes(str(int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big', signed=True)), ENCODING)
-				elif cmd_name == 154:
-					# arg0 (signed int) to float and save to arg1
-					self.memory[int.from_bytes(line_args[1], byteorder='big')] = struct.pack('f', int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big', signed=True))
-				elif cmd_name == 155:
-					# arg0 (signed int) to int and save to arg1
-					self.memory[int.from_bytes(line_args[1], byteorder='big')] = int.to_bytes(int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big', signed=True), 4, byteorder='big')
-				elif cmd_name == 156:
-					# arg0 (string) to signed int and save to arg1
-					self.memory[int.from_bytes(line_args[1], byteorder='big')] = int.to_bytes(int(str(self.memory[int.from_bytes(line_args[0], byteorder='big')], ENCODING)), 4, byteorder='big', signed=True)
-				elif cmd_name == 157:
-					# arg0 (float) to signed int and save to arg1
-					self.memory[int.from_bytes(line_args[1], byteorder='big')] = int.to_bytes(int(struct.unpack('f', self.memory[int.from_bytes(line_args[0], byteorder='big')])[0]), 4, byteorder='big', signed=True)
-				elif cmd_name == 158:
-					# arg0 (int) to signed int and save to arg1
-					self.memory[int.from_bytes(line_args[1], byteorder='big')] = int.to_bytes(int.from_bytes(self.memory[int.from_bytes(line_args[0], byteorder='big')], byteorder='big'), 4, byteorder='big', signed=True)
-				elif cmd_name == 159:
-					# Stop the program suddenly, including all subprocesses
-					self.running = False
-				elif cmd_name == 160:
-					# Get shared buffer byte 1 (IN_PROCESS) and save to arg0
-					self.memory[int.from_bytes(line_args[0], byteorder='big')] = bytes([self.oplos.data['shared_buffer'][1]])
-				else:
-					# Check if the OPCODE is defined in a module (OEP 019)
-					if 'loaded_module' in self.memory.keys() and cmd_name in self.memory['loaded_module'].defined_opcodes:
-						# Attempt to execute the the command
-						self.memory['loaded_module'].handle_command(self, cmd_name, line_args)
-					else:
-						# If we encounter an error due to the OPCODE not being a OPCODE
-						raise Exception('Not a command.')
-				# Check for a module (OEP 019)
-				if 'loaded_module' in self.memory.keys():
+				# Look up the OPCODE
+				handler = self.opcodes.get(cmd_name)
+				if handler == None:
+					# If we encounter an error due to the OPCODE not being a OPCODE
+					raise Exception('Not a command.')
+				# Execute the OPCODE with its decoded arguments
+				handler(frame, line_code[3])
+				if frame.done:
+					# The program ended
+					return step + 1
+				# Check for a module hook (OEP 019)
+				if self.end_hook != None:
 					# Execute the end call
-					self.memory['loaded_module'].on_end_opcode(self, cmd_name, line_args)
+					self.end_hook(self, cmd_name, line_args)
 					# Update the namespace (OEP 003)
 					self.namespace[self.active_namespace] = self.memory
 				# Increment the line number
-				line_num += 1
+				frame.line_num += 1
+			except Exception as e:
+				if self.handle_error(frame, line_code, e):
+					frame.done = True
+					return step + 1
+		return steps
+
+	"""Runs a frame using Python transpiled from the program, one function per basic block (see OPLTranspiler).
+	   Lines which don't start a block, programs which change their code and namespaces with a module which has hooks are run with the closure engine.
+	   Args: frame -> the execution frame
+	         steps -> the most blocks or lines to run
+	   Returns: the number of steps run."""
+
+	def run_python(self, frame, steps):
+
+		"""Runs a frame using Python transpiled from the program, one function per basic block (see OPLTranspiler).
+	   Lines which don't start a block, programs which change their code and namespaces with a module which has hooks are run with the closure engine.
+	   Args: frame -> the execution frame
+	         steps -> the most blocks or lines to run
+	   Returns: the number of steps run."""
+
+		blocks = frame.blocks
+		if blocks == None:
+			# The program changes its code
+			return self.run_closures(frame, steps)
+		for step in range(steps):
+			if frame.line_num >= len(frame.program) or not self.running:
+				return step
+			# Get the block for this line
+			block = blocks.get(frame.line_num)
+			if block == None or self.begin_hook != None or self.end_hook != None:
+				# Run a single line
+				self.run_line(frame)
+				if frame.done:
+					return step + 1
+				continue
+			try:
+				# Execute the block
+				block(self, frame)
+				if frame.done:
+					# The program ended
+					return step + 1
+			except Exception as e:
+				if self.handle_error(frame, frame.program[frame.line_num], e):
+					frame.done = True
+					return step + 1
+		return steps
+
+	"""Runs a single line of a frame with the closure engine.
+	   Args: frame -> the execution frame"""
+
+	def run_line(self, frame):
+
+		"""Runs a single line of a frame with the closure engine.
+	   Args: frame -> the execution frame"""
+
+		# Get code for this line
+		line_code = frame.program[frame.line_num]
+		try:
+			# Check for a module hook (OEP 019)
+			if self.begin_hook != None:
+				# Execute the begin call
+				self.begin_hook(self, line_code[1], line_code[2])
 				# Update the namespace (OEP 003)
 				self.namespace[self.active_namespace] = self.memory
+			# Execute the closure
+			line_code[4](self, frame)
+			if frame.done:
+				# The program ended
+				return
+			# Check for a module hook (OEP 019)
+			if self.end_hook != None:
+				# Execute the end call
+				self.end_hook(self, line_code[1], line_code[2])
+				# Update the namespace (OEP 003)
+				self.namespace[self.active_namespace] = self.memory
+			# Increment the line number
+			frame.line_num += 1
+		except Exception as e:
+			if self.handle_error(frame, line_code, e):
+				frame.done = True
+
+	"""Runs a frame using the closure engine. Each line is compiled to a closure with its arguments already bound (see OPLClosureCompiler).
+	   Args: frame -> the execution frame
+	         steps -> the most lines to run
+	   Returns: the number of steps run."""
+
+	def run_closures(self, frame, steps):
+
+		"""Runs a frame using the closure engine. Each line is compiled to a closure with its arguments already bound (see OPLClosureCompiler).
+	   Args: frame -> the execution frame
+	         steps -> the most lines to run
+	   Returns: the number of steps run."""
+
+		for step in range(steps):
+			if frame.line_num >= len(frame.program) or not self.running:
+				return step
+			# Get code for this line
+			line_code = frame.program[frame.line_num]
+			try:
+				# Check for a module hook (OEP 019)
+				if self.begin_hook != None:
+					# Execute the begin call
+					self.begin_hook(self, line_code[1], line_code[2])
+					# Update the namespace (OEP 003)
+					self.namespace[self.active_namespace] = self.memory
+				# Execute the closure
+				line_code[4](self, frame)
+				if frame.done:
+					# The program ended
+					return step + 1
+				# Check for a module hook (OEP 019)
+				if self.end_hook != None:
+					# Execute the end call
+					self.end_hook(self, line_code[1], line_code[2])
+					# Update the namespace (OEP 003)
+					self.namespace[self.active_namespace] = self.memory
+				# Increment the line number
+				frame.line_num += 1
 			except Exception as e:
-				if self.error_mode == 'ds':
-					self.output += b'\x00\x00\x00\x01'
-					if self.print_handler:
-						self.print_handler('ERROR: ' + str(e) + ' LINE: ' + str(line_num) + ' CODE: ' + str(line_code) + '\n')
-					self.error = True
-					break
-				elif self.error_mode == 'd':
-					self.output += b'\x00\x00\x00\x01'
-					if self.print_handler:
-						self.print_handler('ERROR: ' + str(e) + ' LINE: ' + str(line_num) + ' CODE: ' + str(line_code) + '\n')
-					line_num += 1
-					self.error = True
-				elif self.error_mode == 's':
-					break
-				elif self.error_mode == '':
-					line_num += 1
+				if self.handle_error(frame, line_code, e):
+					frame.done = True
+					return step + 1
+		return steps
 
-		# Decrement the IN_PROCESS OPL OS flag if OPLOS exists.
-		if self.oplos:
-			self.oplos.data['shared_buffer'] = bytearray(self.oplos.data['shared_buffer'])
-			self.oplos.data['shared_buffer'][1] -= 1
-			self.oplos.data_to_binary(self.oplos.data)
-		# Return output
-		return self.output
+	"""Handles an error raised while running a line, using the error mode (OEP 015).
+	   Args: frame -> the execution frame
+	         line_code -> the line that raised the error
+	         e -> the error
+	   Returns: if the program should stop."""
+
+	def handle_error(self, frame, line_code, e):
+
+		"""Handles an error raised while running a line, using the error mode (OEP 015).
+	   Args: frame -> the execution frame
+	         line_code -> the line that raised the error
+	         e -> the error
+	   Returns: if the program should stop."""
+
+		# Print the line as it was split, with its OPCODE as bytes (see split_code)
+		code = str([line_code[0], bytearray(int.to_bytes(line_code[1], 4, byteorder='big')), line_code[2]])
+		if self.error_mode == 'ds':
+			self.output += b'\x00\x00\x00\x01'
+			if self.print_handler:
+				self.print_handler('ERROR: ' + str(e) + ' LINE: ' + str(frame.line_num) + ' CODE: ' + code + '\n')
+			self.error = True
+			return True
+		elif self.error_mode == 'd':
+			self.output += b'\x00\x00\x00\x01'
+			if self.print_handler:
+				self.print_handler('ERROR: ' + str(e) + ' LINE: ' + str(frame.line_num) + ' CODE: ' + code + '\n')
+			frame.line_num += 1
+			self.error = True
+		elif self.error_mode == 's':
+			return True
+		elif self.error_mode == '':
+			frame.line_num += 1
+		return False
 
 	"""Splits code into commands.
 	   Args: code -> bytearray containing OPL code to be split.
@@ -880,8 +936,22 @@ class OPLExecutor:
 
 		split_code = []
 		labels = {}
-		# Iterate over code
 		i = 0
+		# Check for a label table (OEP 022)
+		if code[0 : 4] == LABEL_HEADER:
+			# Get number of labels (4 bytes)
+			num_labels = int.from_bytes(code[4 : 8], byteorder='big')
+			i = 8
+			for label_num in range(num_labels):
+				# Get length of the label (4 bytes)
+				label_len = int.from_bytes(code[i : i + 4], byteorder='big')
+				i += 4
+				# Get the label and its line number (4 bytes)
+				label = bytes(code[i : i + label_len])
+				i += label_len
+				labels[label] = int.from_bytes(code[i : i + 4], byteorder='big')
+				i += 4
+		# Iterate over code
 		while i < len(code):
 			temp_cmd = []
 			# Get line number (4 bytes)
@@ -912,48 +982,1698 @@ class OPLExecutor:
 		# Return split_code
 		return split_code, labels
 
-	"""Iterates through memory and returns a binary representation of memory."""
+	"""Loads code into a decoded program, so each line is only decoded once.
+	   Each line of the program is a list containing the line number, the OPCODE (int), the raw arguments and the decoded arguments.
+	   Arguments of built in OPCODES are decoded using ARG_TYPES, arguments of module OPCODES are left as they are (OEP 019).
+	   Labels in code compiled with resolve_labels are already line numbers (OEP 022).
+	   Args: code -> bytearray containing OPL code to be loaded.
+	   Returns: the decoded program and the labels (OEP 022)."""
+
+	def load_code(self, code):
+
+		"""Loads code into a decoded program, so each line is only decoded once.
+	   Each line of the program is a list containing the line number, the OPCODE (int), the raw arguments and the decoded arguments.
+	   Arguments of built in OPCODES are decoded using ARG_TYPES, arguments of module OPCODES are left as they are (OEP 019).
+	   Labels in code compiled with resolve_labels are already line numbers (OEP 022).
+	   Args: code -> bytearray containing OPL code to be loaded.
+	   Returns: the decoded program and the labels (OEP 022)."""
+
+		if isinstance(code, memoryview):
+			# Copy a view, so the arguments aren't views too (see slice_data)
+			code = code.tobytes()
+		split_code, labels = self.split_code(code)
+		# Check if the compiler resolved the labels (OEP 022)
+		resolved = code[0 : 4] == LABEL_HEADER
+		program = []
+		# Iterate over each line
+		for line_num, cmd_name, line_args in split_code:
+			cmd_name = int.from_bytes(cmd_name, byteorder='big')
+			if cmd_name in self.builtin_opcodes:
+				# Decode each argument (ints by default)
+				arg_types = self.ARG_TYPES.get(cmd_name, '')
+				args = []
+				for arg_num, arg in enumerate(line_args):
+					arg_type = arg_types[arg_num] if arg_num < len(arg_types) else 'i'
+					if arg_type == 'i':
+						# Int or memory address
+						args.append(int.from_bytes(arg, byteorder='big'))
+					elif arg_type == 'l':
+						# Label, resolved to its line number (OEP 022)
+						if resolved:
+							args.append(int.from_bytes(arg, byteorder='big'))
+						elif bytes(arg) in labels:
+							args.append(labels[bytes(arg)])
+						else:
+							args.append(MissingLabel(bytes(arg)))
+					else:
+						# Bytes
+						args.append(arg)
+			else:
+				# Module OPCODES get their arguments as they are (OEP 019)
+				args = line_args
+			program.append([line_num, cmd_name, line_args, args])
+		# Return the program
+		return program, labels
+
+	"""Slices the data in a memory cell. Slices of read only data (bytes, like the data read from a file, or a view of it) which are
+	   at least VIEW_SIZE long are memoryviews of the data, so walking through a large buffer doesn't copy the rest of it each time.
+	   A view is read only, so changing the cell replaces it with a copy.
+	   Args: data -> the data
+	         start -> the start of the slice
+	         end -> the end of the slice, None for the end of the data
+	   Returns: the slice."""
+
+	def slice_data(self, data, start, end=None):
+
+		"""Slices the data in a memory cell. Slices of read only data (bytes, like the data read from a file, or a view of it) which are
+	   at least VIEW_SIZE long are memoryviews of the data, so walking through a large buffer doesn't copy the rest of it each time.
+	   A view is read only, so changing the cell replaces it with a copy.
+	   Args: data -> the data
+	         start -> the start of the slice
+	         end -> the end of the slice, None for the end of the data
+	   Returns: the slice."""
+
+		if isinstance(data, memoryview) or isinstance(data, bytes) and len(data) >= self.VIEW_SIZE:
+			view = memoryview(data)[start : end]
+			if len(view) >= self.VIEW_SIZE:
+				return view
+			# Small slices are copied, so they don't keep the data alive
+			return view.tobytes()
+		return data[start : end]
+
+	"""Returns a binary representation of memory (see memory_to_bytes)."""
 
 	def get_binary_memory(self):
 
-		"""Iterates through memory and returns a binary representation of memory."""
-
-		self.binary_memory = bytearray()
-		# Iterate over memory
-		for key in self.memory:
-			# Add key number (4 bytes)
-			self.binary_memory += int.to_bytes(key, 4, byteorder='big').rjust(4, b'\x00')
-			# Add length of memory data (4 bytes)
-			self.binary_memory += int.to_bytes(len(self.memory[key]), 4, byteorder='big').rjust(4, b'\x00')
-			# Add binary data
-			self.binary_memory += self.memory[key]
-		# Return final binary memory
+		"""Returns a binary representation of memory (see memory_to_bytes)."""
+
+		self.binary_memory = memory_to_bytes(self.memory)
 		return self.binary_memory
 
-	"""Sets memory using a binary representation of memory.
+	"""Sets memory using a binary representation of memory. The loaded module is kept (OEP 019).
 	   Args: binary_memory -> the binary representation of memory"""
 
 	def set_binary_memory(self, binary_memory):
 
-		"""Sets memory using a binary representation of memory.
+		"""Sets memory using a binary representation of memory. The loaded module is kept (OEP 019).
 	   Args: binary_memory -> the binary representation of memory"""
 
 		self.binary_memory = binary_memory
-		new_memory = {}
-		# Iterate through all memory
-		i = 0
-		while i < len(self.binary_memory):
-			# Get memory address (4 bytes)
-			adress = int.from_bytes(self.binary_memory[i : i + 4], byteorder='big')
-			i += 4
-			# Get length of data (4 bytes)
-			length = int.from_bytes(self.binary_memory[i : i + 4], byteorder='big')
-			i += 4
-			# Get data
-			data = self.binary_memory[i : i + length]
-			i += length
-			# Set new memory
-			new_memory[adress] = data
-		# Set new memory
+		new_memory = self.new_memory(bytes_to_memory(binary_memory))
+		if 'loaded_module' in self.memory:
+			new_memory['loaded_module'] = self.memory['loaded_module']
 		self.memory = new_memory
 
+	"""Returns a binary representation of all namespaces (see namespace_to_bytes) (OEP 003)."""
+
+	def get_binary_namespace(self):
+
+		"""Returns a binary representation of all namespaces (see namespace_to_bytes) (OEP 003)."""
+
+		return namespace_to_bytes({**self.namespace, self.active_namespace : self.memory})
+
+	"""Sets all namespaces using a binary representation of them (OEP 003). The loaded modules of namespaces which are kept are kept too (OEP 019),
+	   and the active namespace is empty if it isn't in the binary representation.
+	   Args: binary_namespace -> the binary representation of the namespaces"""
+
+	def set_binary_namespace(self, binary_namespace):
+
+		"""Sets all namespaces using a binary representation of them (OEP 003). The loaded modules of namespaces which are kept are kept too (OEP 019),
+	   and the active namespace is empty if it isn't in the binary representation.
+	   Args: binary_namespace -> the binary representation of the namespaces"""
+
+		namespace = {**self.namespace, self.active_namespace : self.memory}
+		new_namespace = {namespace_id : self.new_memory(memory) for namespace_id, memory in bytes_to_namespace(binary_namespace).items()}
+		for namespace_id, memory in new_namespace.items():
+			if 'loaded_module' in namespace.get(namespace_id, {}):
+				memory['loaded_module'] = namespace[namespace_id]['loaded_module']
+		self.namespace = new_namespace
+		if self.active_namespace not in self.namespace:
+			self.namespace[self.active_namespace] = self.new_memory()
+		self.memory = self.namespace[self.active_namespace]
+		self.update_opcodes()
+
+	"""Creates a memory for a namespace (OEP 003).
+	   Args: memory -> a mapping of memory to start with, None to start with empty memory
+	         memory_type -> the kind of memory (see OPLExecutor), None for the kind the executor was created with
+	         cache_size -> the most bytes of data to keep in RAM, for disk memory, None for the executor's cache_size
+	   Returns: the memory."""
+
+	def new_memory(self, memory=None, memory_type=None, cache_size=None):
+
+		"""Creates a memory for a namespace (OEP 003).
+	   Args: memory -> a mapping of memory to start with, None to start with empty memory
+	         memory_type -> the kind of memory (see OPLExecutor), None for the kind the executor was created with
+	         cache_size -> the most bytes of data to keep in RAM, for disk memory, None for the executor's cache_size
+	   Returns: the memory."""
+
+		if memory_type == None:
+			memory_type = self.memory_type
+		if memory_type == 'compact':
+			return CompactMemory(memory)
+		elif memory_type == 'disk':
+			return DiskMemory(memory, self.cache_size if cache_size == None else cache_size)
+		return {} if memory == None else memory
+
+	"""Gets the number of bytes used by the data of all namespaces and the number of bytes reserved for them (OEP 003).
+	   Returns: the bytes used and the bytes reserved."""
+
+	def memory_usage(self):
+
+		"""Gets the number of bytes used by the data of all namespaces and the number of bytes reserved for them (OEP 003).
+	   Returns: the bytes used and the bytes reserved."""
+
+		used = reserved = 0
+		memories = list({**self.namespace, self.active_namespace : self.memory}.values())
+		# The bases of forked namespaces are shared, so each one is counted once (see ForkedMemory)
+		bases = {id(memory.base) : memory.base for memory in memories if isinstance(memory, ForkedMemory)}
+		for memory in memories:
+			memory_used, memory_reserved = memory_usage(memory)
+			used += memory_used
+			reserved += memory_reserved
+		for base in bases.values():
+			reserved += memory_usage(base)[1]
+		return used, reserved
+
+	"""Updates the OPCODE table and the module hooks for the active namespace, adding the OPCODES defined by its loaded module (OEP 019).
+	   Called whenever the active memory or its loaded module changes."""
+
+	def update_opcodes(self):
+
+		"""Updates the OPCODE table and the module hooks for the active namespace, adding the OPCODES defined by its loaded module (OEP 019).
+	   Called whenever the active memory or its loaded module changes."""
+
+		if 'loaded_module' in self.memory.keys():
+			# Built in OPCODES take priority over the module's OPCODES
+			module = self.memory['loaded_module']
+			self.opcodes = {**{cmd_name : self.module_opcode(module, cmd_name) for cmd_name in module.defined_opcodes}, **self.builtin_opcodes}
+			# Only call the hooks the module overrides
+			self.begin_hook = self.module_hook(module, 'on_begin_opcode')
+			self.end_hook = self.module_hook(module, 'on_end_opcode')
+		else:
+			self.opcodes = self.builtin_opcodes
+			self.begin_hook = None
+			self.end_hook = None
+
+	"""Gets a hook of a module, if the module overrides it (OEP 019).
+	   Args: module -> the loaded module
+	         hook_name -> the name of the hook (on_begin_opcode, on_end_opcode, or handle_command_async in an AsyncOPLExecutor)
+	   Returns: the hook, or None if the module uses the hook from BaseModule, which does nothing."""
+
+	def module_hook(self, module, hook_name):
+
+		"""Gets a hook of a module, if the module overrides it (OEP 019).
+	   Args: module -> the loaded module
+	         hook_name -> the name of the hook (on_begin_opcode, on_end_opcode, or handle_command_async in an AsyncOPLExecutor)
+	   Returns: the hook, or None if the module uses the hook from BaseModule, which does nothing."""
+
+		hook = getattr(module, hook_name)
+		if getattr(hook, '__func__', None) is getattr(BaseModule, hook_name).__func__:
+			# The hook isn't overridden
+			return None
+		return hook
+
+	"""Creates a handler for an OPCODE defined by a module (OEP 019).
+	   Args: module -> the loaded module
+	         cmd_name -> the OPCODE
+	   Returns: the handler."""
+
+	def module_opcode(self, module, cmd_name):
+
+		"""Creates a handler for an OPCODE defined by a module (OEP 019).
+	   Args: module -> the loaded module
+	         cmd_name -> the OPCODE
+	   Returns: the handler."""
+
+		def handler(frame, line_args):
+			# Attempt to execute the the command
+			module.handle_command(self, cmd_name, line_args)
+			# Update the namespace, in case the module changed the memory (OEP 003)
+			self.namespace[self.active_namespace] = self.memory
+		return handler
+
+	# OPCODE handlers. Each handler takes the current execution frame and the arguments for the line.
+
+	def _op_0(self, frame, args):
+
+		# Start the program
+		pass
+
+	def _op_1(self, frame, args):
+
+		# End the program, returning arg0
+		self.output += args[0]
+		frame.done = True
+
+	def _op_2(self, frame, args):
+
+		# Set arg0 to memory address arg1
+		self.memory[args[1]] = args[0]
+
+	def _op_3(self, frame, args):
+
+		# Copy arg0 to arg1
+		self.memory[args[1]] = bytearray(self.memory[args[0]]).copy()
+
+	def _op_4(self, frame, args):
+
+		# Append data at arg0 to arg1 and save to arg2
+		if args[1] == args[2]:
+			# Append in place if the cell owns its data (see BufferBuilder)
+			append_data(self.memory, args[2], self.memory[args[0]])
+		else:
+			self.memory[args[2]] = bytearray(self.memory[args[1]]).copy() + self.memory[args[0]]
+
+	def _op_5(self, frame, args):
+
+		# Append data at arg0 to arg1 at position arg2
+		# Inserts in place if the cell owns its data (see BufferBuilder)
+		insert_data(self.memory, args[1], int.from_bytes(self.memory[args[2]], byteorder='big'), self.memory[args[0]])
+
+	def _op_6(self, frame, args):
+
+		# Truncate arg1 bytes from end of arg0
+		self.memory[args[0]] = self.slice_data(self.memory[args[0]], 0, int.from_bytes(self.memory[args[1]], byteorder='big'))
+
+	def _op_7(self, frame, args):
+
+		# Truncate arg1 bytes from start of arg0
+		self.memory[args[0]] = self.slice_data(self.memory[args[0]], int.from_bytes(self.memory[args[1]], byteorder='big'))
+
+	def _op_8(self, frame, args):
+
+		# Truncate arg1 bytes from arg0 at arg2
+		data = self.memory[args[0]]
+		arg1 = int.from_bytes(self.memory[args[1]], byteorder='big')
+		arg2 = int.from_bytes(self.memory[args[2]], byteorder='big')
+		if isinstance(data, memoryview):
+			# Copy the view (see slice_data)
+			self.memory[args[0]] = b''.join((data[ : arg2], data[arg2 + arg1 : ]))
+			return
+		self.memory[args[0]] = data[ : arg2] + data[arg2 + arg1 : ]
+
+	def _op_9(self, frame, args):
+
+		# Get length of data at arg0 and save to arg1
+		self.memory[args[1]] = int.to_bytes(len(self.memory[args[0]]), 4, byteorder='big')
+
+	def _op_10(self, frame, args):
+
+		# Add the values at arg0 and arg1 and save to arg2
+		self.memory[args[2]] = struct.pack('f', struct.unpack('f', self.memory[args[0]])[0] + struct.unpack('f', self.memory[args[1]])[0])
+
+	def _op_11(self, frame, args):
+
+		# Subtract the values at arg0 and arg1 and save to arg2
+		self.memory[args[2]] = struct.pack('f', struct.unpack('f', self.memory[args[0]])[0] - struct.unpack('f', self.memory[args[1]])[0])
+
+	def _op_12(self, frame, args):
+
+		# Multiply the values at arg0 and arg1 and save to arg2
+		self.memory[args[2]] = struct.pack('f', struct.unpack('f', self.memory[args[0]])[0] * struct.unpack('f', self.memory[args[1]])[0])
+
+	def _op_13(self, frame, args):
+
+		# Divide the values at arg0 and arg1 and save to arg2
+		self.memory[args[2]] = struct.pack('f', struct.unpack('f', self.memory[args[0]])[0] / struct.unpack('f', self.memory[args[1]])[0])
+
+	def _op_14(self, frame, args):
+
+		# Raise arg0 to the power of arg1 and save to arg2
+		self.memory[args[2]] = struct.pack('f', struct.unpack('f', self.memory[args[0]])[0] ** struct.unpack('f', self.memory[args[1]])[0])
+
+	def _op_15(self, frame, args):
+
+		# Preform an and gate on arg0 and arg1, save to arg2
+		self.memory[args[2]] = struct.pack('f', struct.unpack('f', self.memory[args[0]])[0] & struct.unpack('f', self.memory[args[1]])[0])
+
+	def _op_16(self, frame, args):
+
+		# Preform an or gate on arg0 and arg1, save to arg2
+		self.memory[args[2]] = struct.pack('f', struct.unpack('f', self.memory[args[0]])[0] | struct.unpack('f', self.memory[args[1]])[0])
+
+	def _op_17(self, frame, args):
+
+		# Preform an xor gate on arg0 and arg1, save to arg2
+		self.memory[args[2]] = struct.pack('f', struct.unpack('f', self.memory[args[0]])[0] ^ struct.unpack('f', self.memory[args[1]])[0])
+
+	def _op_18(self, frame, args):
+
+		# Preform a not gate on arg0, save to arg1
+		output = not int.from_bytes(self.memory[args[0]], byteorder='big')
+		if output == False:
+			output = b'\x00\x00\x00\x00'
+		else:
+			output = b'\x00\x00\x00\x01'
+		self.memory[args[1]] = output
+
+	def _op_19(self, frame, args):
+
+		# Remove data at arg0
+		del self.memory[args[0]]
+
+	def _op_20(self, frame, args):
+
+		# Go to line arg0
+		frame.line_num = int.from_bytes(self.memory[args[0]], byteorder='big') - 1
+
+	def _op_21(self, frame, args):
+
+		# Go to line arg0 if arg1 == arg2
+		if self.memory[args[1]] == self.memory[args[2]]:
+			frame.line_num = int.from_bytes(self.memory[args[0]], byteorder='big') - 1
+
+	def _op_22(self, frame, args):
+
+		# Go to line arg0 if arg1 > arg2 (float)
+		if struct.unpack('f', self.memory[args[1]]) > struct.unpack('f', self.memory[args[2]]):
+			frame.line_num = int.from_bytes(self.memory[args[0]], byteorder='big') - 1
+
+	def _op_23(self, frame, args):
+
+		# Go to line arg0 if arg1 < arg2 (float)
+		if struct.unpack('f', self.memory[args[1]]) < struct.unpack('f', self.memory[args[2]]):
+			frame.line_num = int.from_bytes(self.memory[args[0]], byteorder='big') - 1
+
+	def _op_24(self, frame, args):
+
+		# Go to line arg0 if arg1 >= arg2 (float)
+		if struct.unpack('f', self.memory[args[1]]) >= struct.unpack('f', self.memory[args[2]]):
+			frame.line_num = int.from_bytes(self.memory[args[0]], byteorder='big') - 1
+
+	def _op_25(self, frame, args):
+
+		# Go to line arg0 if arg1 <= arg2 (float)
+		if struct.unpack('f', self.memory[args[1]]) <= struct.unpack('f', self.memory[args[2]]):
+			frame.line_num = int.from_bytes(self.memory[args[0]], byteorder='big') - 1
+
+	def _op_26(self, frame, args):
+
+		# Takes arg0 to arg1 from arg2, saves to arg3
+		self.memory[args[3]] = self.slice_data(self.memory[args[2]], int.from_bytes(self.memory[args[0]], byteorder='big'), int.from_bytes(self.memory[args[1]], byteorder='big'))
+
+	def _op_27(self, frame, args):
+
+		# Gets input from standard input, saves to arg0
+		input_data = bytes(input(), ENCODING)
+		self.memory[args[0]] = input_data
+
+	def _op_28(self, frame, args):
+
+		# Gets arg0 of inputted cmd args and sets to arg1 (string)
+		self.memory[args[1]] = bytes(frame.runtime_args[int.from_bytes(self.memory[args[0]], byteorder='big')], ENCODING)
+
+	def _op_29(self, frame, args):
+
+		# Print the memory
+		# Views are printed as the bytes they show (see slice_data)
+		self.print_handler(str({address : data.tobytes() if isinstance(data, memoryview) else data for address, data in self.memory.items()}))
+
+	def _op_30(self, frame, args):
+
+		# Add data at arg0 to self.output
+		print_data = self.memory[args[0]]
+		if len(args) == 3:
+			if args[2] == b'\x01':
+				# Don't write to output
+				pass
+			elif args[2] == b'\x00':
+				# Write to output
+				self.output += print_data
+		else:
+			# Write to output
+			self.output += print_data
+		write_type = args[1]
+		# If we should print to shell
+		if self.print_handler:
+			# If we print directly
+			if write_type == 0:
+				self.print_handler(str(bytes(print_data)))
+			elif write_type == 1:
+				# If we print as a string
+				self.print_handler(str(print_data, encoding=ENCODING))
+			elif write_type == 2:
+				# If we print as an int
+				self.print_handler(str(int.from_bytes(print_data, byteorder='big')))
+			elif write_type == 3:
+				# If we print as a float
+				self.print_handler(str(struct.unpack('f', print_data)[0]))
+			elif write_type == 4:
+				# If we print as a signed int
+				self.print_handler(str(int.from_bytes(print_data, byteorder='big', signed=True)))
+
+	def _op_31(self, frame, args):
+
+		# Add the values at arg0 and arg1 and save to arg2 (int)
+		self.memory[args[2]] = int.to_bytes(int.from_bytes(self.memory[args[0]], byteorder='big') + int.from_bytes(self.memory[args[1]], byteorder='big'), 4, byteorder='big')
+
+	def _op_32(self, frame, args):
+
+		# Subtract the values at arg0 and arg1 and save to arg2 (int)
+		self.memory[args[2]] = int.to_bytes(int.from_bytes(self.memory[args[0]], byteorder='big') - int.from_bytes(self.memory[args[1]], byteorder='big'), 4, byteorder='big')
+
+	def _op_33(self, frame, args):
+
+		# Multiply the values at arg0 and arg1 and save to arg2 (int)
+		self.memory[args[2]] = int.to_bytes(int.from_bytes(self.memory[args[0]], byteorder='big') * int.from_bytes(self.memory[args[1]], byteorder='big'), 4, byteorder='big')
+
+	def _op_34(self, frame, args):
+
+		# Divide the values at arg0 and arg1 and save to arg2 (int)
+		self.memory[args[2]] = int.to_bytes(int(int.from_bytes(self.memory[args[0]], byteorder='big') / int.from_bytes(self.memory[args[1]], byteorder='big')), 4, byteorder='big')
+
+	def _op_35(self, frame, args):
+
+		# Raise arg0 to the power of arg1 and save to arg2 (int)
+		self.memory[args[2]] = int.to_bytes(int.from_bytes(self.memory[args[0]], byteorder='big') ** int.from_bytes(self.memory[args[1]], byteorder='big'), 4, byteorder='big')
+
+	def _op_36(self, frame, args):
+
+		# Preform an and gate on arg0 and arg1, save to arg2 (int)
+		self.memory[args[2]] = int.to_bytes(int.from_bytes(self.memory[args[0]], byteorder='big') & int.from_bytes(self.memory[args[1]], byteorder='big'), 4, byteorder='big')
+
+	def _op_37(self, frame, args):
+
+		# Preform an or gate on arg0 and arg1, save to arg2 (int)
+		self.memory[args[2]] = int.to_bytes(int.from_bytes(self.memory[args[0]], byteorder='big') | int.from_bytes(self.memory[args[1]], byteorder='big'), 4, byteorder='big')
+
+	def _op_38(self, frame, args):
+
+		# Preform an xor gate on arg0 and arg1, save to arg2 (int)
+		self.memory[args[2]] = int.to_bytes(int.from_bytes(self.memory[args[0]], byteorder='big') ^ int.from_bytes(self.memory[args[1]], byteorder='big'), 4, byteorder='big')
+
+	def _op_39(self, frame, args):
+
+		# arg0 (int) to string and save to arg1
+		self.memory[args[1]] = bytes(str(int.from_bytes(self.memory[args[0]], byteorder='big')), ENCODING)
+
+	def _op_40(self, frame, args):
+
+		# arg0 (float) to string and save to arg1
+		self.memory[args[1]] = bytes(str(struct.unpack('f', self.memory[args[0]])[0]), ENCODING)
+
+	def _op_41(self, frame, args):
+
+		# arg0 (string) to int and save to arg1
+		self.memory[args[1]] = int.to_bytes(int(str(self.memory[args[0]], ENCODING)), 4, byteorder='big')
+
+	def _op_42(self, frame, args):
+
+		# arg0 (string) to float and save to arg1
+		self.memory[args[1]] = struct.pack('f', float(str(self.memory[args[0]], ENCODING)))
+
+	def _op_43(self, frame, args):
+
+		# arg0 (int) to float and save to arg1
+		self.memory[args[1]] = struct.pack('f', float(int.from_bytes(self.memory[args[0]], byteorder='big')))
+
+	def _op_44(self, frame, args):
+
+		# arg0 (float) to int and save to arg1
+		self.memory[args[1]] = int.to_bytes(int(struct.unpack('f', self.memory[args[0]])[0]), 4, byteorder='big')
+
+	def _op_45(self, frame, args):
+
+		# Duplicate arg0 arg1 times
+		self.memory[args[0]] = self.memory[args[0]] * int.from_bytes(self.memory[args[1]], byteorder='big')
+
+	def _op_46(self, frame, args):
+
+		# Load file arg0 and read bytes to arg1
+		if not self.useopefiles:
+			if self.oplos == None:
+				file_buffer = open(str(self.memory[args[0]], ENCODING), 'rb')
+				self.memory[args[1]] = file_buffer.read()
+				file_buffer.close()
+			else:
+				self.memory[args[1]] = self.oplos.get_file(str(self.memory[args[0]], ENCODING))
+		else:
+			self.memory[args[1]] = self.opefiles[str(self.memory[args[0]], ENCODING)]
+
+	def _op_47(self, frame, args):
+
+		# Write data at arg1 to file arg0
+		if self.oplos == None:
+			file_buffer = open(str(self.memory[args[0]], ENCODING), 'wb')
+			file_buffer.write(self.memory[args[1]])
+			file_buffer.close()
+		else:
+			if self.oplos.data['shared_buffer'][0] == 0 or frame.sudo == True:
+				self.oplos.create_file(str(self.memory[args[0]], ENCODING), share_data(self.memory[args[1]]))
+
+	def _op_48(self, frame, args):
+
+		# Delete file at arg0
+		if self.oplos == None:
+			os.remove(str(self.memory[args[0]], ENCODING))
+		else:
+			if self.oplos.data['shared_buffer'][0] == 0 or frame.sudo == True:
+				self.oplos.delete_file(str(self.memory[args[0]], ENCODING))
+
+	def _op_49(self, frame, args):
+
+		# Get the code buffer and save to arg0
+		self.memory[args[0]] = frame.code
+
+	def _op_50(self, frame, args):
+
+		# Change the code buffer to arg0 and set the line number to arg1
+		frame.code = share_data(self.memory[args[0]])
+		frame.program, frame.labels = self.load_code(frame.code)
+		if self.engine != 'loop':
+			# Add the closures to the new program
+			self.closure_compiler.compile(frame.program)
+		frame.line_num = int.from_bytes(self.memory[args[1]], byteorder='big') - 1
+
+	def _op_51(self, frame, args):
+
+		# Get the output buffer and set it to arg0
+		self.memory[args[0]] = self.output
+
+	def _op_52(self, frame, args):
+
+		# Set the output buffer to arg0
+		if self.memory[args[0]] is self.output:
+			pass
+		elif isinstance(self.memory, dict) and owns_data(self.memory, args[0]):
+			# The cell and the output share its builder (see BufferBuilder)
+			self.output = share_data(self.memory[args[0]])
+		else:
+			# The output is appended to in place, so data the cell doesn't own (a constant of the program, which later runs reuse,
+			# or data another cell refers to) and read only data (bytes, or a view from slice_data) is copied
+			self.output = bytearray(self.memory[args[0]])
+
+	def _op_53(self, frame, args):
+
+		# Get binary representation of memory and set to arg0
+		self.memory[args[0]] = self.get_binary_memory()
+
+	def _op_54(self, frame, args):
+
+		# Set memory using binary representation of memory at arg0
+		self.set_binary_memory(self.memory[args[0]])
+		# Update the namespace (OEP 003)
+		self.namespace[self.active_namespace] = self.memory
+		self.update_opcodes()
+
+	def _op_55(self, frame, args):
+
+		# Run system command arg0, save output to arg1
+		if self.oplos == None:
+			self.memory[args[1]] = bytes([os.system(str(self.memory[args[0]], ENCODING))])
+		else:
+			if self.oplos.data['shared_buffer'][0] == 0 or frame.sudo == True:
+				self.memory[args[1]] = bytes([self.oplos.run_command(str(self.memory[args[0]], ENCODING))])
+
+	def _op_56(self, frame, args):
+
+		# Get arg0 chars from standard input, save to arg1
+		self.memory[args[1]] = bytes(getchars(int.from_bytes(self.memory[args[0]], byteorder='big')), ENCODING)
+
+	def _op_57(self, frame, args):
+
+		# Get listdir and save to arg0
+		self.memory[args[0]] = list_to_bytes([bytes(i, ENCODING) for i in os.listdir()])
+
+	def _op_58(self, frame, args):
+
+		# Pass
+		pass
+
+	def _op_59(self, frame, args):
+
+		# Get time.time and save to arg0
+		self.memory[args[0]] = struct.pack('f', time.time())
+
+	def _op_60(self, frame, args):
+
+		# Get time.asctime and save to arg0
+		self.memory[args[0]] = bytes(time.asctime(), ENCODING)
+
+	def _op_61(self, frame, args):
+
+		# Wait arg0 (float) seconds
+		time.sleep(struct.unpack('f', self.memory[args[0]])[0])
+
+	def _op_62(self, frame, args):
+
+		# Copy data at pointer of arg0 to arg1
+		self.memory[args[1]] = bytearray(self.memory[int.from_bytes(self.memory[args[0]], byteorder='big')]).copy()
+
+	def _op_63(self, frame, args):
+
+		# Set data at pointer at arg0 to arg1
+		self.memory[int.from_bytes(self.memory[args[0]], byteorder='big')] = share_data(self.memory[args[1]])
+
+	def _op_64(self, frame, args):
+
+		# Go to line arg0 if arg1 == arg2 else arg3
+		if self.memory[args[1]] == self.memory[args[2]]:
+			frame.line_num = int.from_bytes(self.memory[args[0]], byteorder='big') - 1
+		else:
+			frame.line_num = int.from_bytes(self.memory[args[3]], byteorder='big') - 1
+
+	def _op_65(self, frame, args):
+
+		# Go to line arg0 if arg1 > arg2 (float) else arg3
+		if struct.unpack('f', self.memory[args[1]]) > struct.unpack('f', self.memory[args[2]]):
+			frame.line_num = int.from_bytes(self.memory[args[0]], byteorder='big') - 1
+		else:
+			frame.line_num = int.from_bytes(self.memory[args[3]], byteorder='big') - 1
+
+	def _op_66(self, frame, args):
+
+		# Go to line arg0 if arg1 < arg2 (float) else arg3
+		if struct.unpack('f', self.memory[args[1]]) < struct.unpack('f', self.memory[args[2]]):
+			frame.line_num = int.from_bytes(self.memory[args[0]], byteorder='big') - 1
+		else:
+			frame.line_num = int.from_bytes(self.memory[args[3]], byteorder='big') - 1
+
+	def _op_67(self, frame, args):
+
+		# Go to line arg0 if arg1 >= arg2 (float) else arg3
+		if struct.unpack('f', self.memory[args[1]]) >= struct.unpack('f', self.memory[args[2]]):
+			frame.line_num = int.from_bytes(self.memory[args[0]], byteorder='big') - 1
+		else:
+			frame.line_num = int.from_bytes(self.memory[args[3]], byteorder='big') - 1
+
+	def _op_68(self, frame, args):
+
+		# Go to line arg0 if arg1 <= arg2 (float) else arg3
+		if struct.unpack('f', self.memory[args[1]]) <= struct.unpack('f', self.memory[args[2]]):
+			frame.line_num = int.from_bytes(self.memory[args[0]], byteorder='big') - 1
+		else:
+			frame.line_num = int.from_bytes(self.memory[args[3]], byteorder='big') - 1
+
+	def _op_69(self, frame, args):
+
+		# Modulo arg0 and arg1 and save to arg2 (float)
+		self.memory[args[2]] = struct.pack('f', struct.unpack('f', self.memory[args[0]])[0] % struct.unpack('f', self.memory[args[1]])[0])
+
+	def _op_70(self, frame, args):
+
+		# Modulo arg0 and arg1 and save to arg2 (int)
+		self.memory[args[2]] = int.to_bytes(int.from_bytes(self.memory[args[0]], byteorder='big') % int.from_bytes(self.memory[args[1]], byteorder='big'), 4, byteorder='big')
+
+	def _op_71(self, frame, args):
+
+		# Go to line arg0 if arg1 == arg2 else arg3 (float)
+		if struct.unpack('f', self.memory[args[1]]) == struct.unpack('f', self.memory[args[2]]):
+			frame.line_num = int.from_bytes(self.memory[args[0]], byteorder='big') - 1
+		else:
+			frame.line_num = int.from_bytes(self.memory[args[3]], byteorder='big') - 1
+
+	def _op_72(self, frame, args):
+
+		# Go to line arg0 if arg1 == arg2 (float)
+		if struct.unpack('f', self.memory[args[1]]) == struct.unpack('f', self.memory[args[2]]):
+			frame.line_num = int.from_bytes(self.memory[args[0]], byteorder='big') - 1
+
+	def _op_73(self, frame, args):
+
+		# Hash arg0 and save to arg1 (sha256)
+		self.memory[args[1]] = hashlib.sha256(self.memory[args[0]]).digest()
+
+	def _op_74(self, frame, args):
+
+		# Create a screen with size arg0 by arg1
+		self.screen = ScreenBuffer((struct.unpack('f', self.memory[args[0]])[0], struct.unpack('f', self.memory[args[1]])[0]), self)
+
+	def _op_75(self, frame, args):
+
+		# Start the screen
+		self.screen.start()
+
+	def _op_76(self, frame, args):
+
+		# End the screen
+		self.screen.stop()
+
+	def _op_77(self, frame, args):
+
+		# Set pixel arg0 arg1 to color (arg2 arg3 arg4)
+		self.screen.set_pixel((struct.unpack('f', self.memory[args[0]])[0], struct.unpack('f', self.memory[args[1]])[0]), (struct.unpack('f', self.memory[args[2]])[0] * 255, struct.unpack('f', self.memory[args[3]])[0] * 255, struct.unpack('f', self.memory[args[4]])[0] * 255))
+
+	def _op_78(self, frame, args):
+
+		# Set screen name to arg0
+		self.screen.set_name(str(self.memory[args[0]], ENCODING))
+
+	def _op_79(self, frame, args):
+
+		# Get the current screen buffer data and save to arg0
+		buf = bytearray()
+		# Iterate over all rows
+		for i in self.screen.buffer:
+			# Iterate over all columns
+			for j in i:
+				# Add the pixel
+				buf += bytes([int(j[0]), int(j[1]), int(j[2])])
+		# Save to memory
+		self.memory[args[0]] = buf
+
+	def _op_80(self, frame, args):
+
+		# Set the current screen buffer using data at arg0
+		# Get the buffer
+		buf = self.memory[args[0]]
+		# Iterate over rows
+		p = 0
+		for i in range(self.screen.buffer.shape[0]):
+			for j in range(self.screen.buffer.shape[1]):
+				# Set the pixel
+				self.screen.set_pixel((i, j), (buf[p], buf[p + 1], buf[p + 2]))
+				p += 3
+
+	def _op_81(self, frame, args):
+
+		# Get the shared OPL OS buffer and save to arg0
+		self.memory[args[0]] = self.oplos.data['shared_buffer']
+
+	def _op_82(self, frame, args):
+
+		# Set the shared OPL OS buffer to arg0
+		# Ensure bit 0 didn't change
+		if self.oplos.data['shared_buffer'][0] == 0 or frame.sudo == True:
+			self.oplos.data['shared_buffer'] = share_data(self.memory[args[0]])
+			assert len(self.oplos.data['shared_buffer']) == 512
+			self.oplos.data_to_binary(self.oplos.data)
+
+	def _op_83(self, frame, args):
+
+		# Get all memory keys and save to arg0
+		self.memory[args[0]] = b''.join([int.to_bytes(i, 4, byteorder='big') for i in list(self.memory.keys())])
+
+	def _op_84(self, frame, args):
+
+		# Delete all memory
+		# A memory which isn't a dict is cleared, so a namespace on disk stays on disk
+		if isinstance(self.memory, dict):
+			self.memory = self.new_memory()
+		else:
+			self.memory.clear()
+		# Update the namespace (OEP 003)
+		self.namespace[self.active_namespace] = self.memory
+		self.update_opcodes()
+
+	def _op_85(self, frame, args):
+
+		# Preform a bit shift left << on arg0 with arg1 bits, and save to arg2
+		self.memory[args[2]] = int.to_bytes(int.from_bytes(self.memory[args[0]], byteorder='big') << int.from_bytes(self.memory[args[1]], byteorder='big'), 4, byteorder='big')
+
+	def _op_86(self, frame, args):
+
+		# Preform a bit shift right >> on arg0 with arg1 bits, and save to arg2
+		self.memory[args[2]] = int.to_bytes(int.from_bytes(self.memory[args[0]], byteorder='big') >> int.from_bytes(self.memory[args[1]], byteorder='big'), 4, byteorder='big')
+
+	def _op_87(self, frame, args):
+
+		# Reverse the data at arg0, save to arg1
+		self.memory[args[1]] = bytearray(reversed(self.memory[args[0]]))
+
+	def _op_88(self, frame, args):
+
+		# Push code from arg0 to arg1 to a new thread, and save its ID to arg2 if given. If arg3 is given, the thread runs in namespace arg3, a copy on write fork of the active namespace. (asynchronous command) (OEP 001) (OEP 003)
+		thread = self.push_thread(frame, int.from_bytes(self.memory[args[0]], byteorder='big'), int.from_bytes(self.memory[args[1]], byteorder='big'), \
+			int.from_bytes(self.memory[args[3]], byteorder='big') if len(args) > 3 else None)
+		if len(args) > 2:
+			self.memory[args[2]] = int.to_bytes(thread.thread_id, 4, byteorder='big')
+
+	def _op_89(self, frame, args):
+
+		# Push code from arg0 to arg1 to a new thread. If arg2 is given, the thread runs in namespace arg2, a copy on write fork of the active namespace. (non-async command) (OEP 001) (OEP 003)
+		thread = self.push_thread(frame, int.from_bytes(self.memory[args[0]], byteorder='big'), int.from_bytes(self.memory[args[1]], byteorder='big'), \
+			int.from_bytes(self.memory[args[2]], byteorder='big') if len(args) > 2 else None)
+		self.join_thread(frame, thread)
+
+	def _op_90(self, frame, args):
+
+		# Switch to namespace arg0 (OEP 003)
+		namespace_id = int.from_bytes(self.memory[args[0]], byteorder='big')
+		self.memory = self.namespace[namespace_id]
+		self.active_namespace = namespace_id
+		self.update_opcodes()
+
+	def _op_91(self, frame, args):
+
+		# Create namespace arg0 (OEP 003)
+		namespace_id = int.from_bytes(self.memory[args[0]], byteorder='big')
+		replaced = self.namespace.get(namespace_id)
+		self.namespace[namespace_id] = self.new_memory()
+		# Recreating the active namespace keeps its memory
+		self.namespace[self.active_namespace] = self.memory
+		self.close_memory(replaced)
+
+	def _op_92(self, frame, args):
+
+		# Delete namespace arg0 (OEP 003)
+		if int.from_bytes(self.memory[args[0]], byteorder='big') == self.active_namespace:
+			raise Exception('Cannot delete current namespace.')
+		self.close_memory(self.namespace.pop(int.from_bytes(self.memory[args[0]], byteorder='big')))
+
+	def _op_93(self, frame, args):
+
+		# Get all namespace IDs and save to arg0 (OEP 003)
+		self.memory[args[0]] = b''.join([int.to_bytes(i, 4, byteorder='big') for i in list(self.namespace.keys())])
+
+	def _op_94(self, frame, args):
+
+		# Delete all but the current namespace (OEP 003)
+		for key in list(self.namespace.keys()):
+			if key == self.active_namespace:
+				# Disregard this namespace
+				pass
+			else:
+				# Delete this namespace
+				del self.namespace[key]
+
+	def _op_95(self, frame, args):
+
+		# Copy data from arg0 in the current namespace to arg1 in namespace arg2 (OEP 007)
+		self.namespace[int.from_bytes(self.memory[args[2]], byteorder='big')][args[1]] = share_data(self.memory[args[0]])
+
+	def _op_96(self, frame, args):
+
+		# Import file at arg0 and load it into namespace arg1 (OEP 006, OEP 003)
+		if self.oplos.data['shared_buffer'][0] != 0:
+			raise Exception('Loading modules in safe mode is not permitted.')
+		# Get file name
+		filename = self.memory[args[0]]
+		# Move to namespace arg1
+		current_namespace = self.active_namespace
+		namespace_id = int.from_bytes(self.memory[args[1]], byteorder='big')
+		self.memory = self.namespace[namespace_id]
+		self.active_namespace = namespace_id
+		# Load the file
+		if not self.useopefiles:
+			if self.oplos == None:
+				file_buffer = open(str(filename, ENCODING), 'rb')
+				filedata = file_buffer.read()
+				file_buffer.close()
+			else:
+				# The file is decoded once, and again only if it changes (see OPLOS.get_program)
+				filedata = self.oplos.get_program(str(filename, ENCODING))
+		else:
+			filedata = self.opefiles[str(filename, ENCODING)]
+		# Execute the loaded file
+		self.execute_nested(frame, filedata)
+		# Move back to the original namespace
+		self.active_namespace = current_namespace
+		self.memory = self.namespace[self.active_namespace]
+		self.update_opcodes()
+
+	def _op_97(self, frame, args):
+
+		# Execute the code at arg0 in Python (OEP 011)
+		exec(str(self.memory[args[0]], ENCODING))
+		# Update the namespace, in case the code changed the memory (OEP 003)
+		self.namespace[self.active_namespace] = self.memory
+		self.update_opcodes()
+
+	def _op_98(self, frame, args):
+
+		# Goto line arg0 if arg1 is in arg2 else arg3
+		if self.memory[args[1]] in self.memory[args[2]]:
+			frame.line_num = int.from_bytes(self.memory[args[0]], byteorder='big') - 1
+		else:
+			frame.line_num = int.from_bytes(self.memory[args[3]], byteorder='big') - 1
+
+	def _op_99(self, frame, args):
+
+		# Allow closing the screen buffer (QUICK FIX)
+		self.screen.allow_close = True
+
+	def _op_100(self, frame, args):
+
+		# Disallow closing the screen buffer (QUICK FIX)
+		self.screen.allow_close = False
+
+	def _op_101(self, frame, args):
+
+		# Get the OPL OS system data buffer and save to arg0 (OEP 012)
+		self.memory[args[0]] = self.oplos.file.data
+
+	def _op_102(self, frame, args):
+
+		# Set the OPL OS system data buffer to arg0 (Dangerous function, raises a warning) (OEP 012)
+		if self.print_handler:
+			# Give a warning
+			self.print_handler('WARNING: OPL WILL ATTEMPT TO MODIFY THE OPL OS FILE BUFFER. THIS COULD CAUSE CORRUPTION. CONTINUE? ')
+			c = getchars(1).lower()
+			self.print_handler('\n')
+			if c == 'y':
+				# Continue
+				pass
+			else:
+				# Don't continue
+				raise Exception('Program ended due to user blocking use of OPCODE 102')
+		if self.oplos.data['shared_buffer'][0] == 0 or frame.sudo == True:
+			self.oplos.file.data = share_data(self.memory[args[0]])
+
+	def _op_103(self, frame, args):
+
+		# Get the name of the OPL OS user and save to arg0 (OEP 012)
+		self.memory[args[0]] = bytes(self.oplos.data['name'], ENCODING)
+
+	def _op_104(self, frame, args):
+
+		# Set the name of the OPL OS user to arg0 (OEP 012)
+		if self.oplos.data['shared_buffer'][0] == 0 or frame.sudo == True:
+			self.oplos.data['name'] = str(self.memory[args[0]], ENCODING)
+			self.oplos.data_to_binary(self.oplos.data)
+
+	def _op_105(self, frame, args):
+
+		# Get the password hash of the OPL OS and save to arg0 (OEP 012)
+		self.memory[args[0]] = self.oplos.data['password_hash']
+
+	def _op_106(self, frame, args):
+
+		# Set the password hash of the OPL OS to arg0 (OEP 012)
+		if self.oplos.data['shared_buffer'][0] == 0 or frame.sudo == True:
+			self.oplos.data['password_hash'] = share_data(self.memory[args[0]])
+			self.oplos.data_to_binary(self.oplos.data)
+
+	def _op_107(self, frame, args):
+
+		# Get the current mouse x and y and set to arg0 and arg1 (OEP 017)
+		pos = self.screen.pygame.mouse.get_pos()
+		self.memory[args[0]] = int.to_bytes(pos[0], 4, byteorder='big')
+		self.memory[args[1]] = int.to_bytes(pos[1], 4, byteorder='big')
+
+	def _op_108(self, frame, args):
+
+		# Set the memory address arg0 to be the address to use for handling mouse ups and downs (OEP 017)
+		self.screen.mouse_state_mem_add = args[0]
+
+	def _op_109(self, frame, args):
+
+		# Compile and run code at arg0 (OEP 016)
+		code = self.memory[args[0]]
+		if not isinstance(code, OPLProgram):
+			from . import OPLCompiler
+			c = OPLCompiler()
+			code = c.compile(str(code))
+		self.execute_nested(frame, code)
+
+	def _op_110(self, frame, args):
+
+		# Compile the code at arg0 and save to arg1 (OEP 016)
+		from . import OPLCompiler
+		c = OPLCompiler()
+		code = c.compile(str(self.memory[args[0]]))
+		self.memory[args[1]] = code
+
+	def _op_111(self, frame, args):
+
+		# Run the code at arg0 (OEP 016)
+		self.execute_nested(frame, self.memory[args[0]])
+
+	def _op_112(self, frame, args):
+
+		# Set the error mode to DISPLAY STOP (OEP 015)
+		self.error_mode = 'ds'
+
+	def _op_113(self, frame, args):
+
+		# Set the error mode to DISPLAY (OEP 015)
+		self.error_mode = 'd'
+
+	def _op_114(self, frame, args):
+
+		# Set the error mode to STOP (OEP 015)
+		self.error_mode = 's'
+
+	def _op_115(self, frame, args):
+
+		# Set the error mode to NONE (OEP 015)
+		self.error_mode = ''
+
+	def _op_116(self, frame, args):
+
+		# Compare values arg0 and arg1 and set to arg2 (arg0 == arg1, arg2 = 0 : arg0 < arg1, arg2 = 1 : arg0 > arg1, arg2 = 2)
+		arg0 = self.memory[args[0]]
+		arg1 = self.memory[args[1]]
+		if arg0 == arg1:
+			self.memory[args[2]] = bytes([0])
+		elif arg0 < arg1:
+			self.memory[args[2]] = bytes([1])
+		elif arg0 > arg1:
+			self.memory[args[2]] = bytes([2])
+
+	def _op_117(self, frame, args):
+
+		# Get the IP address, and save to arg0 (OEP 002)
+		self.memory[args[0]] = bytes(socket.gethostbyname(socket.gethostname()), ENCODING)
+
+	def _op_118(self, frame, args):
+
+		# Load a binary module at arg0 to the current active namespace (Overwrites the current loaded module) (OEP 019)
+		filename = self.memory[args[0]]
+		# Get the file data
+		if not self.useopefiles:
+			if self.oplos == None:
+				file_buffer = open(str(filename, ENCODING), 'rb')
+				filedata = file_buffer.read()
+				file_buffer.close()
+			else:
+				filedata = self.oplos.get_file(str(filename, ENCODING))
+		else:
+			filedata = self.opefiles[str(filename, ENCODING)]
+		# Load the module              \/ Load the class   \/ Create an instance
+		self.memory['loaded_module'] = dill.loads(filedata)()
+		# Initialize the functions for the module, so it can use write, etc.
+		self.memory['loaded_module'].init_functions()
+		self.update_opcodes()
+
+	def _op_119(self, frame, args):
+
+		# Remove the current loaded module for the active namespace (OEP 019)
+		del self.memory['loaded_module']
+		self.update_opcodes()
+
+	def _op_120(self, frame, args):
+
+		# Set the use OPE files mode to true (OEP 013)
+		self.useopefiles = True
+
+	def _op_121(self, frame, args):
+
+		# Set the use OPE files mode to false (OEP 013)
+		self.useopefiles = False
+
+	def _op_122(self, frame, args):
+
+		# Get the number of runtime args and save it to arg0
+		self.memory[args[0]] = bytes([len(frame.runtime_args)])
+
+	def _op_123(self, frame, args):
+
+		# Add arg0 and arg1 and save it to arg2 without 4 byte length restriction
+		number = int.from_bytes(self.memory[args[0]], byteorder='big') + int.from_bytes(self.memory[args[1]], byteorder='big')
+		number_len = int(math.log(n, 256)) + 1
+		self.memory[args[2]] = int.to_bytes(number, number_len, byteorder='big')
+
+	def _op_124(self, frame, args):
+
+		# Subtract arg0 from arg1 and save it to arg2 without 4 byte length restriction
+		number = int.from_bytes(self.memory[args[0]], byteorder='big') - int.from_bytes(self.memory[args[1]], byteorder='big')
+		number_len = int(math.log(n, 256)) + 1
+		self.memory[args[2]] = int.to_bytes(number, number_len, byteorder='big')
+
+	def _op_125(self, frame, args):
+
+		# Create a label at the current line named arg0 (OEP 022)
+		pass
+
+	def _op_126(self, frame, args):
+
+		# Go to label arg0 (OEP 022)
+		frame.line_num = args[0] - 1
+
+	def _op_127(self, frame, args):
+
+		# Go to label arg0 if arg1 == arg2 (OEP 022)
+		if self.memory[args[1]] == self.memory[args[2]]:
+			frame.line_num = args[0] - 1
+
+	def _op_128(self, frame, args):
+
+		# Go to label arg0 if arg1 != arg2 (OEP 022)
+		if self.memory[args[1]] != self.memory[args[2]]:
+			frame.line_num = args[0] - 1
+
+	def _op_129(self, frame, args):
+
+		# Go to label arg0 if arg1 > arg2 (float) (OEP 022)
+		if struct.unpack('f', self.memory[args[1]]) > struct.unpack('f', self.memory[args[2]]):
+			frame.line_num = args[0] - 1
+
+	def _op_130(self, frame, args):
+
+		# Go to label arg0 if arg1 < arg2 (float) (OEP 022)
+		if struct.unpack('f', self.memory[args[1]]) < struct.unpack('f', self.memory[args[2]]):
+			frame.line_num = args[0] - 1
+
+	def _op_131(self, frame, args):
+
+		# Go to label arg0 if arg1 >= arg2 (float) (OEP 022)
+		if struct.unpack('f', self.memory[args[1]]) >= struct.unpack('f', self.memory[args[2]]):
+			frame.line_num = args[0] - 1
+
+	def _op_132(self, frame, args):
+
+		# Go to label arg0 if arg1 <= arg2 (float) (OEP 022)
+		if struct.unpack('f', self.memory[args[1]]) <= struct.unpack('f', self.memory[args[2]]):
+			frame.line_num = args[0] - 1
+
+	def _op_133(self, frame, args):
+
+		# Go to label arg0 if arg1 == arg2 else arg3 (OEP 022)
+		if self.memory[args[1]] == self.memory[args[2]]:
+			frame.line_num = args[0] - 1
+		else:
+			frame.line_num = args[3] - 1
+
+	def _op_134(self, frame, args):
+
+		# Go to label arg0 if arg1 > arg2 (float) else arg3 (OEP 022)
+		if struct.unpack('f', self.memory[args[1]]) > struct.unpack('f', self.memory[args[2]]):
+			frame.line_num = args[0] - 1
+		else:
+			frame.line_num = args[3] - 1
+
+	def _op_135(self, frame, args):
+
+		# Go to label arg0 if arg1 < arg2 (float) else arg3 (OEP 022)
+		if struct.unpack('f', self.memory[args[1]]) < struct.unpack('f', self.memory[args[2]]):
+			frame.line_num = args[0] - 1
+		else:
+			frame.line_num = args[3] - 1
+
+	def _op_136(self, frame, args):
+
+		# Go to label arg0 if arg1 >= arg2 (float) else arg3 (OEP 022)
+		if struct.unpack('f', self.memory[args[1]]) >= struct.unpack('f', self.memory[args[2]]):
+			frame.line_num = args[0] - 1
+		else:
+			frame.line_num = args[3] - 1
+
+	def _op_137(self, frame, args):
+
+		# Go to label arg0 if arg1 <= arg2 (float) else arg3 (OEP 022)
+		if struct.unpack('f', self.memory[args[1]]) <= struct.unpack('f', self.memory[args[2]]):
+			frame.line_num = args[0] - 1
+		else:
+			frame.line_num = args[3] - 1
+
+	def _op_138(self, frame, args):
+
+		# Go to label arg0 if arg1 > arg2 (int) else arg3 (OEP 022)
+		if int.from_bytes(self.memory[args[1]], byteorder='big') > int.from_bytes(self.memory[args[2]], byteorder='big'):
+			frame.line_num = args[0] - 1
+		else:
+			frame.line_num = args[3] - 1
+
+	def _op_139(self, frame, args):
+
+		# Go to label arg0 if arg1 < arg2 (int) else arg3 (OEP 022)
+		if int.from_bytes(self.memory[args[1]], byteorder='big') < int.from_bytes(self.memory[args[2]], byteorder='big'):
+			frame.line_num = args[0] - 1
+		else:
+			frame.line_num = args[3] - 1
+
+	def _op_140(self, frame, args):
+
+		# Go to label arg0 if arg1 >= arg2 (int) else arg3 (OEP 022)
+		if int.from_bytes(self.memory[args[1]], byteorder='big') >= int.from_bytes(self.memory[args[2]], byteorder='big'):
+			frame.line_num = args[0] - 1
+		else:
+			frame.line_num = args[3] - 1
+
+	def _op_141(self, frame, args):
+
+		# Go to label arg0 if arg1 <= arg2 (int) else arg3 (OEP 022)
+		if int.from_bytes(self.memory[args[1]], byteorder='big') <= int.from_bytes(self.memory[args[2]], byteorder='big'):
+			frame.line_num = args[0] - 1
+		else:
+			frame.line_num = args[3] - 1
+
+	def _op_142(self, frame, args):
+
+		# Go to label arg0 if arg1 != arg2 else arg3 (OEP 022)
+		if self.memory[args[1]] != self.memory[args[2]]:
+			frame.line_num = args[0] - 1
+		else:
+			frame.line_num = args[3] - 1
+
+	def _op_143(self, frame, args):
+
+		# Push code from labels arg0 to arg1 to a new thread, and save its ID to arg2 if given. If arg3 is given, the thread runs in namespace arg3, a copy on write fork of the active namespace. (asynchronous command) (OEP 001) (OEP 003) (OEP 022)
+		thread = self.push_thread(frame, args[0], args[1], int.from_bytes(self.memory[args[3]], byteorder='big') if len(args) > 3 else None)
+		if len(args) > 2:
+			self.memory[args[2]] = int.to_bytes(thread.thread_id, 4, byteorder='big')
+
+	def _op_144(self, frame, args):
+
+		# Push code from labels arg0 to arg1 to a new thread. If arg2 is given, the thread runs in namespace arg2, a copy on write fork of the active namespace. (non-async command) (OEP 001) (OEP 003) (OEP 022)
+		thread = self.push_thread(frame, args[0], args[1], int.from_bytes(self.memory[args[2]], byteorder='big') if len(args) > 2 else None)
+		self.join_thread(frame, thread)
+
+	def _op_145(self, frame, args):
+
+		# Add the values at arg0 and arg1 and save to arg2 (signed int)
+		self.memory[args[2]] = int.to_bytes(int.from_bytes(self.memory[args[0]], byteorder='big', signed=True) + int.from_bytes(self.memory[args[1]], byteorder='big', signed=True), 4, byteorder='big', signed=True)
+
+	def _op_146(self, frame, args):
+
+		# Subtract the values at arg0 and arg1 and save to arg2 (signed int)
+		self.memory[args[2]] = int.to_bytes(int.from_bytes(self.memory[args[0]], byteorder='big', signed=True) - int.from_bytes(self.memory[args[1]], byteorder='big', signed=True), 4, byteorder='big', signed=True)
+
+	def _op_147(self, frame, args):
+
+		# Multiply the values at arg0 and arg1 and save to arg2 (signed int)
+		self.memory[args[2]] = int.to_bytes(int.from_bytes(self.memory[args[0]], byteorder='big', signed=True) * int.from_bytes(self.memory[args[1]], byteorder='big', signed=True), 4, byteorder='big', signed=True)
+
+	def _op_148(self, frame, args):
+
+		# Divide the values at arg0 and arg1 and save to arg2 (signed int)
+		self.memory[args[2]] = int.to_bytes(int.from_bytes(self.memory[args[0]], byteorder='big', signed=True) / int.from_bytes(self.memory[args[1]], byteorder='big', signed=True), 4, byteorder='big', signed=True)
+
+	def _op_149(self, frame, args):
+
+		# Raise arg0 to the power of arg1 and save to arg2 (signed int)
+		self.memory[args[2]] = int.to_bytes(int.from_bytes(self.memory[args[0]], byteorder='big', signed=True) ** int.from_bytes(self.memory[args[1]], byteorder='big', signed=True), 4, byteorder='big', signed=True)
+
+	def _op_150(self, frame, args):
+
+		# Preform an and gate on arg0 and arg1, save to arg2 (signed int)
+		self.memory[args[2]] = int.to_bytes(int.from_bytes(self.memory[args[0]], byteorder='big', signed=True) & int.from_bytes(self.memory[args[1]], byteorder='big', signed=True), 4, byteorder='big', signed=True)
+
+	def _op_151(self, frame, args):
+
+		# Preform an or gate on arg0 and arg1, save to arg2 (signed int)
+		self.memory[args[2]] = int.to_bytes(int.from_bytes(self.memory[args[0]], byteorder='big', signed=True) | int.from_bytes(self.memory[args[1]], byteorder='big', signed=True), 4, byteorder='big', signed=True)
+
+	def _op_152(self, frame, args):
+
+		# Preform an xor gate on arg0 and arg1, save to arg2 (signed int)
+		self.memory[args[2]] = int.to_bytes(int.from_bytes(self.memory[args[0]], byteorder='big', signed=True) ^ int.from_bytes(self.memory[args[1]], byteorder='big', signed=True), 4, byteorder='big', signed=True)
+
+	def _op_153(self, frame, args):
+
+		# arg0 (signed int) to string and save to arg1
+		self.memory[args[1]] = bytes(str(int.from_bytes(self.memory[args[0]], byteorder='big', signed=True)), ENCODING)
+
+	def _op_154(self, frame, args):
+
+		# arg0 (signed int) to float and save to arg1
+		self.memory[args[1]] = struct.pack('f', int.from_bytes(self.memory[args[0]], byteorder='big', signed=True))
+
+	def _op_155(self, frame, args):
+
+		# arg0 (signed int) to int and save to arg1
+		self.memory[args[1]] = int.to_bytes(int.from_bytes(self.memory[args[0]], byteorder='big', signed=True), 4, byteorder='big')
+
+	def _op_156(self, frame, args):
+
+		# arg0 (string) to signed int and save to arg1
+		self.memory[args[1]] = int.to_bytes(int(str(self.memory[args[0]], ENCODING)), 4, byteorder='big', signed=True)
+
+	def _op_157(self, frame, args):
+
+		# arg0 (float) to signed int and save to arg1
+		self.memory[args[1]] = int.to_bytes(int(struct.unpack('f', self.memory[args[0]])[0]), 4, byteorder='big', signed=True)
+
+	def _op_158(self, frame, args):
+
+		# arg0 (int) to signed int and save to arg1
+		self.memory[args[1]] = int.to_bytes(int.from_bytes(self.memory[args[0]], byteorder='big'), 4, byteorder='big', signed=True)
+
+	def _op_159(self, frame, args):
+
+		# Stop the program suddenly, including all subprocesses
+		self.running = False
+
+	def _op_160(self, frame, args):
+
+		# Get shared buffer byte 1 (IN_PROCESS) and save to arg0
+		self.memory[args[0]] = bytes([self.oplos.data['shared_buffer'][1]])
+
+	def _op_161(self, frame, args):
+
+		# Add the values at arg0 and arg1 and save to arg2 (int), then go to label arg3 if arg4 < arg5 (int) else arg6 (superinstruction for 31 and 139)
+		self.memory[args[2]] = int.to_bytes(int.from_bytes(self.memory[args[0]], byteorder='big') + int.from_bytes(self.memory[args[1]], byteorder='big'), 4, byteorder='big')
+		if int.from_bytes(self.memory[args[4]], byteorder='big') < int.from_bytes(self.memory[args[5]], byteorder='big'):
+			frame.line_num = args[3] - 1
+		else:
+			frame.line_num = args[6] - 1
+
+	def _op_162(self, frame, args):
+
+		# Copy arg0 to arg1, then add the values at arg2 and arg3 and save to arg4 (int) (superinstruction for 3 and 31)
+		self.memory[args[1]] = bytearray(self.memory[args[0]]).copy()
+		self.memory[args[4]] = int.to_bytes(int.from_bytes(self.memory[args[2]], byteorder='big') + int.from_bytes(self.memory[args[3]], byteorder='big'), 4, byteorder='big')
+
+	def _op_163(self, frame, args):
+
+		# Add the values at arg0 and arg1 and save to arg2 (int), then copy arg3 to arg4 (superinstruction for 31 and 3)
+		self.memory[args[2]] = int.to_bytes(int.from_bytes(self.memory[args[0]], byteorder='big') + int.from_bytes(self.memory[args[1]], byteorder='big'), 4, byteorder='big')
+		self.memory[args[4]] = bytearray(self.memory[args[3]]).copy()
+
+	def _op_164(self, frame, args):
+
+		# Wait for the thread with the ID at arg0 to end (OEP 001)
+		self.join_thread(frame, self.threads.get(int.from_bytes(self.memory[args[0]], byteorder='big')))
+
+	def _op_165(self, frame, args):
+
+		# Get the status of the thread with the ID at arg0 and save to arg1 (0 -> waiting for a free slot : 1 -> running : 2 -> ended : 3 -> cancelled) (OEP 001)
+		self.memory[args[1]] = int.to_bytes(self.threads.status(self.threads.get(int.from_bytes(self.memory[args[0]], byteorder='big'))), 4, byteorder='big')
+
+	def _op_166(self, frame, args):
+
+		# Cancel the thread with the ID at arg0 (OEP 001)
+		self.threads.cancel(self.threads.get(int.from_bytes(self.memory[args[0]], byteorder='big')))
+
+	def _op_167(self, frame, args):
+
+		# Run the code from labels arg0 to arg1 once for each item in the list at arg2 in worker processes, and save the list of results to arg3. Each run gets a copy of the memory with its item at arg4, and its result is the data at arg5 (OEP 001) (OEP 022)
+		if self.oplos != None:
+			raise Exception('Worker processes are not permitted in OPL OS.')
+		self.memory[args[3]] = list_to_bytes(self.parallel_map(frame.program, bytes_to_list(self.memory[args[2]]), args[4], args[5], frame.runtime_args, self.memory, args[0], args[1], frame.labels, frame.sudo))
+
+	def _op_168(self, frame, args):
+
+		# Get binary representation of all namespaces and set to arg0 (OEP 003)
+		self.memory[args[0]] = self.get_binary_namespace()
+
+	def _op_169(self, frame, args):
+
+		# Set all namespaces using binary representation of namespaces at arg0 (OEP 003)
+		self.set_binary_namespace(self.memory[args[0]])
+
+	def _op_170(self, frame, args):
+
+		# Append data at arg0 to the buffer built at arg1 in place, starting a buffer from the data at arg1 if it isn't one (see BufferBuilder)
+		append_data(self.memory, args[1], self.memory[args[0]])
+
+	def _op_171(self, frame, args):
+
+		# Save the buffer built at arg0 as bytes to arg1
+		self.memory[args[1]] = bytes(self.memory[args[0]])
+
+	def _op_172(self, frame, args):
+
+		# Get the number of bytes used by the data of all namespaces and the number of bytes reserved for them, and save to arg0 and arg1 (OEP 003)
+		used, reserved = self.memory_usage()
+		self.memory[args[0]] = int.to_bytes(used, 8, byteorder='big')
+		self.memory[args[1]] = int.to_bytes(reserved, 8, byteorder='big')
+
+	def _op_173(self, frame, args):
+
+		# Create namespace arg0 with its memory on disk, keeping at most arg1 bytes of its data in RAM (see DiskMemory) (OEP 003)
+		# The active namespace keeps its data, moved to disk
+		if self.oplos != None:
+			raise Exception('Disk memory is not permitted in OPL OS.')
+		namespace_id = int.from_bytes(self.memory[args[0]], byteorder='big')
+		replaced = self.memory if namespace_id == self.active_namespace else self.namespace.get(namespace_id)
+		memory = self.new_memory(self.memory if namespace_id == self.active_namespace else None, 'disk', int.from_bytes(self.memory[args[1]], byteorder='big'))
+		self.namespace[namespace_id] = memory
+		if namespace_id == self.active_namespace:
+			self.memory = memory
+		self.close_memory(replaced)
+
+	def _op_174(self, frame, args):
+
+		# Fork namespace arg0 into namespace arg1, copy on write, so arg1 starts with the data of arg0 without copying it (see fork_namespace) (OEP 003)
+		self.fork_namespace(int.from_bytes(self.memory[args[0]], byteorder='big'), int.from_bytes(self.memory[args[1]], byteorder='big'))
+
+	# Argument types for built in OPCODES, used by load_code (i -> int or memory address, b -> bytes, l -> label). Arguments not listed are ints.
+	ARG_TYPES = {1 : 'b', 2 : 'bi', 30 : 'iib', 125 : 'b', 126 : 'l', 127 : 'lii', 128 : 'lii', 129 : 'lii', 130 : 'lii', 131 : 'lii', 132 : 'lii', \
+		133 : 'liil', 134 : 'liil', 135 : 'liil', 136 : 'liil', 137 : 'liil', 138 : 'liil', 139 : 'liil', 140 : 'liil', 141 : 'liil', 142 : 'liil', 143 : 'll', 144 : 'll', 161 : 'iiiliil', 167 : 'll'}
+	# Superinstructions, with the OPCODES they are made of and the number of arguments each one takes
+	SUPERINSTRUCTIONS = {161 : ((31, 3), (139, 4)), 162 : ((3, 2), (31, 3)), 163 : ((31, 3), (3, 2))}
+	# Slices of read only data which are at least this long are views of the data instead of copies (see slice_data)
+	VIEW_SIZE = 1024
+
+
+# Table of all built in OPCODES
+OPLExecutor.OPCODES = sorted(int(name[4 : ]) for name in vars(OPLExecutor) if name.startswith('_op_'))
+
+
+# The part of the program, the memory and the options of a worker process for OPLExecutor.parallel_map
+map_worker = {}
+
+"""Sets up a worker process for OPLExecutor.parallel_map, so the memory is only sent to it once (OEP 001).
+   Args: the decoded program, labels, start line, memory, input cell, result cell, runtime arguments, sudo and engine"""
+
+def start_map_worker(program, labels, start, memory, input_cell, result_cell, runtime_args, sudo, engine):
+
+	"""Sets up a worker process for OPLExecutor.parallel_map, so the memory is only sent to it once (OEP 001).
+	   Args: the decoded program, labels, start line, memory, input cell, result cell, runtime arguments, sudo and engine"""
+
+	map_worker.update(program=program, labels=labels, start=start, memory=memory, input_cell=input_cell, result_cell=result_cell, \
+		runtime_args=runtime_args, sudo=sudo, engine=engine)
+
+"""Runs one item of OPLExecutor.parallel_map in a worker process (OEP 001).
+   Args: item -> the item
+   Returns: the result, or None if there was an error."""
+
+def run_map_item(item):
+
+	"""Runs one item of OPLExecutor.parallel_map in a worker process (OEP 001).
+	   Args: item -> the item
+	   Returns: the result, or None if there was an error."""
+
+	# Fork the memory, so the runs share it without copying it
+	memory = ForkedMemory(map_worker['memory'])
+	memory[map_worker['input_cell']] = item
+	result_cell = map_worker['result_cell']
+	executor = OPLExecutor(print_handler=None, error_mode='s', engine=map_worker['engine'])
+	executor.execute(map_worker['program'], map_worker['runtime_args'], False, {0 : memory}, 0, map_worker['labels'], map_worker['sudo'], map_worker['start'])
+	if executor.error or result_cell not in executor.memory:
+		return None
+	return bytes(executor.memory[result_cell])
+
+
+# The program of a worker process for OPLExecutor.execute_many
+batch_worker = {}
+
+"""Sets up a worker process for OPLExecutor.execute_many, decoding the program once.
+   Args: code -> bytearray containing OPL code
+         error_mode -> the error mode during runtime
+         engine -> the engine to run the program with"""
+
+def start_batch_worker(code, error_mode, engine):
+
+	"""Sets up a worker process for OPLExecutor.execute_many, decoding the program once.
+	   Args: code -> bytearray containing OPL code
+	         error_mode -> the error mode during runtime
+	         engine -> the engine to run the program with"""
+
+	batch_worker['program'] = OPLProgram(code, executor=OPLExecutor(print_handler=None, error_mode=error_mode, engine=engine))
+
+"""Runs one run of OPLExecutor.execute_many in a worker process.
+   Args: runtime_args -> arguments given during runtime
+   Returns: the output."""
+
+def run_batch_item(runtime_args):
+
+	"""Runs one run of OPLExecutor.execute_many in a worker process.
+	   Args: runtime_args -> arguments given during runtime
+	   Returns: the output."""
+
+	return batch_worker['program'].run(runtime_args)
+
+
+"""The state of a single call to OPLExecutor.execute, or of a thread it started (OEP 001).
+   Args: code -> the code buffer
+         program -> the decoded program
+         labels -> the labels for the code (OEP 022)
+         runtime_args -> arguments given during runtime
+         sudo -> run as superuser
+         active_namespace -> the namespace the frame starts in (OEP 003)"""
+
+class ExecutionFrame:
+
+	"""The state of a single call to OPLExecutor.execute, or of a thread it started (OEP 001).
+	   Args: code -> the code buffer
+	         program -> the decoded program
+	         labels -> the labels for the code (OEP 022)
+	         runtime_args -> arguments given during runtime
+	         sudo -> run as superuser
+	         active_namespace -> the namespace the frame starts in (OEP 003)"""
+
+	def __init__(self, code, program, labels, runtime_args, sudo, active_namespace=0):
+
+		"""The state of a single call to OPLExecutor.execute, or of a thread it started (OEP 001).
+		   Args: code -> the code buffer
+		         program -> the decoded program
+		         labels -> the labels for the code (OEP 022)
+		         runtime_args -> arguments given during runtime
+		         sudo -> run as superuser
+		         active_namespace -> the namespace the frame starts in (OEP 003)"""
+
+		self.code = code
+		self.program = program
+		self.labels = labels
+		self.runtime_args = runtime_args
+		self.sudo = sudo
+		# The current line number
+		self.line_num = 0
+		# If the program ended
+		self.done = False
+		# The active namespace, saved while other threads run (OEP 003)
+		self.active_namespace = active_namespace
+		# The transpiled blocks of the program, for the python engine (see OPLTranspiler)
+		self.blocks = None
+		# The thread ID, if the frame is a thread started by the program (OEP 001)
+		self.thread_id = None
+		# If the thread was cancelled
+		self.cancelled = False
+		# The thread the frame waits for, if the program was paused while it joined the thread
+		self.waiting = None
+		# The rest of the frame's turn, if the program was paused during it
+		self.turn_left = 0
+
+	"""Checks if the frame has ended.
+	   Returns: if the frame has ended."""
+
+	def ended(self):
+
+		"""Checks if the frame has ended.
+	   Returns: if the frame has ended."""
+
+		return self.done or self.line_num >= len(self.program)
+
+
+"""The threads of a call to OPLExecutor.execute (OEP 001). Threads started by the program run in a pool with a fixed number of slots,
+   the others wait for a free slot.
+   Args: max_threads -> the number of slots in the pool"""
+
+class ThreadPool:
+
+	"""The threads of a call to OPLExecutor.execute (OEP 001). Threads started by the program run in a pool with a fixed number of slots,
+	   the others wait for a free slot.
+	   Args: max_threads -> the number of slots in the pool"""
+
+	def __init__(self, max_threads):
+
+		"""The threads of a call to OPLExecutor.execute (OEP 001). Threads started by the program run in a pool with a fixed number of slots,
+		   the others wait for a free slot.
+		   Args: max_threads -> the number of slots in the pool"""
+
+		self.max_threads = max_threads
+		# The running threads, in the order they run in
+		self.queue = collections.deque()
+		# The threads waiting for a free slot
+		self.pending = collections.deque()
+		# The threads started by the program which have a slot
+		self.slots = set()
+		# All threads started by the program, by ID
+		self.ids = {}
+		# The most lines (or blocks, with the python engine) left to run, and the time to stop at (None for no limit)
+		self.steps_left = None
+		self.deadline = None
+		# If the program was paused because it reached a limit
+		self.paused = False
+
+	"""Adds a thread started by the program, giving it an ID. It starts running once it has a slot.
+	   Args: frame -> the frame of the thread"""
+
+	def add(self, frame):
+
+		"""Adds a thread started by the program, giving it an ID. It starts running once it has a slot.
+	   Args: frame -> the frame of the thread"""
+
+		frame.thread_id = len(self.ids) + 1
+		self.ids[frame.thread_id] = frame
+		self.pending.append(frame)
+		self.start_pending()
+
+	"""Starts the threads waiting for a slot, while there are free slots."""
+
+	def start_pending(self):
+
+		"""Starts the threads waiting for a slot, while there are free slots."""
+
+		while self.pending and len(self.slots) < self.max_threads:
+			frame = self.pending.popleft()
+			self.slots.add(frame)
+			self.queue.append(frame)
+
+	"""Frees the slot of a thread which ended.
+	   Args: frame -> the frame of the thread"""
+
+	def end(self, frame):
+
+		"""Frees the slot of a thread which ended.
+	   Args: frame -> the frame of the thread"""
+
+		if frame in self.slots:
+			self.slots.remove(frame)
+			self.start_pending()
+
+	"""Cancels a thread. A running thread stops after its current line.
+	   Args: frame -> the frame of the thread"""
+
+	def cancel(self, frame):
+
+		"""Cancels a thread. A running thread stops after its current line.
+	   Args: frame -> the frame of the thread"""
+
+		if frame.ended():
+			# The thread already ended
+			return
+		frame.cancelled = True
+		frame.done = True
+		if frame in self.pending:
+			self.pending.remove(frame)
+		if frame in self.queue:
+			self.queue.remove(frame)
+		self.end(frame)
+
+	"""Gets a thread started by the program.
+	   Args: thread_id -> the thread ID
+	   Returns: the frame of the thread."""
+
+	def get(self, thread_id):
+
+		"""Gets a thread started by the program.
+	   Args: thread_id -> the thread ID
+	   Returns: the frame of the thread."""
+
+		if thread_id not in self.ids:
+			raise Exception('Unknown thread ' + str(thread_id) + '.')
+		return self.ids[thread_id]
+
+	"""Gets the status of a thread.
+	   Args: frame -> the frame of the thread
+	   Returns: 0 if it is waiting for a slot, 1 if it is running, 2 if it ended and 3 if it was cancelled."""
+
+	def status(self, frame):
+
+		"""Gets the status of a thread.
+	   Args: frame -> the frame of the thread
+	   Returns: 0 if it is waiting for a slot, 1 if it is running, 2 if it ended and 3 if it was cancelled."""
+
+		if frame.cancelled:
+			return 3
+		elif frame.ended():
+			return 2
+		elif frame in self.pending:
+			return 0
+		return 1
+
+
+"""A label which did not exist when the code was loaded (OEP 022). Jumping to it raises a KeyError, like looking up the label would.
+   Args: name -> the name of the label"""
+
+class MissingLabel:
+
+	"""A label which did not exist when the code was loaded (OEP 022). Jumping to it raises a KeyError, like looking up the label would.
+	   Args: name -> the name of the label"""
+
+	def __init__(self, name):
+
+		"""A label which did not exist when the code was loaded (OEP 022). Jumping to it raises a KeyError, like looking up the label would.
+		   Args: name -> the name of the label"""
+
+		self.name = name
+
+	"""Raises a KeyError when the label is used as a line number."""
+
+	def __sub__(self, other):
+
+		"""Raises a KeyError when the label is used as a line number."""
+
+		raise KeyError(self.name)
+
+	"""Raises a KeyError when the label is used as an index."""
+
+	def __index__(self):
+
+		"""Raises a KeyError when the label is used as an index."""
+
+		raise KeyError(self.name)
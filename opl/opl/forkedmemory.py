@@ -0,0 +1,158 @@
+"""Copy on write memory for the OPL language. Written by Kevin Chen."""
+
+
+# Imports
+from collections.abc import MutableMapping
+from .functions import BufferBuilder, append_data, share_data
+from .compactmemory import memory_usage
+
+
+"""A fork of a memory, which reads the cells of the memory it was forked from and keeps the cells it changes itself (copy on write)."""
+
+class ForkedMemory(MutableMapping):
+
+	"""A fork of a memory, which reads the cells of the memory it was forked from and keeps the cells it changes itself (copy on write).
+	   Forking doesn't copy any cells, so a thread or a module can start with the data of a namespace without copying it (OEP 001, OEP 003).
+	   The memory it was forked from (the base) must not change while it is forked, so fork_memory forks the memory it is given too.
+	   Reads of cells which weren't changed are slower than with a dict. The loaded module isn't forked (OEP 019).
+	   Args: base -> the memory to fork
+	         cells -> the cells which were changed, None for none
+	         deleted -> the cells of the base which were deleted, None for none"""
+
+	def __init__(self, base, cells=None, deleted=None):
+
+		"""A fork of a memory, which reads the cells of the memory it was forked from and keeps the cells it changes itself (copy on write).
+	   Forking doesn't copy any cells, so a thread or a module can start with the data of a namespace without copying it (OEP 001, OEP 003).
+	   The memory it was forked from (the base) must not change while it is forked, so fork_memory forks the memory it is given too.
+	   Reads of cells which weren't changed are slower than with a dict. The loaded module isn't forked (OEP 019).
+	   Args: base -> the memory to fork
+	         cells -> the cells which were changed, None for none
+	         deleted -> the cells of the base which were deleted, None for none"""
+
+		self.base = base
+		self.cells = {} if cells == None else cells
+		self.deleted = set() if deleted == None else deleted
+		if deleted == None and 'loaded_module' in base:
+			self.deleted.add('loaded_module')
+
+	def __getitem__(self, address):
+
+		if address in self.cells:
+			return self.cells[address]
+		if self.deleted and address in self.deleted:
+			raise KeyError(address)
+		return self.base[address]
+
+	def __setitem__(self, address, data):
+
+		self.cells[address] = data
+		if self.deleted:
+			self.deleted.discard(address)
+
+	def __delitem__(self, address):
+
+		if address in self.cells:
+			del self.cells[address]
+			if address in self.base:
+				self.deleted.add(address)
+		elif address in self.base and address not in self.deleted:
+			self.deleted.add(address)
+		else:
+			raise KeyError(address)
+
+	def __contains__(self, address):
+
+		if address in self.cells:
+			return True
+		return address not in self.deleted and address in self.base
+
+	def __iter__(self):
+
+		# The cells of the base keep their order, changed or not, and new cells come after them
+		for address in self.base:
+			if address in self.cells or address not in self.deleted:
+				yield address
+		for address in list(self.cells):
+			if address not in self.base:
+				yield address
+
+	def __len__(self):
+
+		return len(self.base) - len(self.deleted) + sum(1 for address in self.cells if address not in self.base)
+
+	def __repr__(self):
+
+		return 'ForkedMemory(' + repr(dict(self.items())) + ')'
+
+	"""Forks the memory again. Its changed cells are copied, the base is shared.
+	   Returns: the new fork."""
+
+	def fork(self):
+
+		"""Forks the memory again. Its changed cells are copied, the base is shared.
+	   Returns: the new fork."""
+
+		# Both forks refer to the changed cells, so they are shared (see BufferBuilder)
+		cells = {address : share_data(data) for address, data in self.cells.items() if address != 'loaded_module'}
+		deleted = set(self.deleted)
+		if 'loaded_module' in self.base:
+			deleted.add('loaded_module')
+		return ForkedMemory(self.base, cells, deleted)
+
+	"""Deletes all cells, without changing the base."""
+
+	def clear(self):
+
+		"""Deletes all cells, without changing the base."""
+
+		self.base = {}
+		self.cells.clear()
+		self.deleted.clear()
+
+	"""Appends data to a cell (see append_data). A changed cell is appended to like a cell of a dict, a cell of the base is copied first.
+	   Args: address -> the memory address
+	         data -> the data to append"""
+
+	def append_data(self, address, data):
+
+		"""Appends data to a cell (see append_data). A changed cell is appended to like a cell of a dict, a cell of the base is copied first.
+	   Args: address -> the memory address
+	         data -> the data to append"""
+
+		if address in self.cells:
+			append_data(self.cells, address, data)
+		else:
+			builder = BufferBuilder(self[address])
+			builder += data
+			self[address] = builder
+
+	"""Gets the number of bytes used by the data of the cells and the number of bytes reserved for the memory.
+	   Only the changed cells are counted as reserved, since the base is shared.
+	   Returns: the bytes used and the bytes reserved."""
+
+	def usage(self):
+
+		"""Gets the number of bytes used by the data of the cells and the number of bytes reserved for the memory.
+	   Only the changed cells are counted as reserved, since the base is shared.
+	   Returns: the bytes used and the bytes reserved."""
+
+		used = sum(len(data) for data in self.values() if isinstance(data, (bytes, bytearray, memoryview)))
+		return used, memory_usage(self.cells)[1]
+
+
+"""Forks a memory, copy on write (see ForkedMemory)."""
+
+def fork_memory(memory):
+
+	"""Forks a memory, copy on write (see ForkedMemory). Unless the memory is already a fork, it becomes the base of two forks,
+	   one to use in place of the memory and the new fork, so the base doesn't change. A fork is forked again by copying its changed cells.
+	   Args: memory -> the memory to fork
+	   Returns: the memory to use in place of the memory and the new fork."""
+
+	if isinstance(memory, ForkedMemory):
+		return memory, memory.fork()
+	forked = ForkedMemory(memory, {}, set())
+	# The memory keeps its loaded module (OEP 019)
+	if 'loaded_module' in memory:
+		forked.cells['loaded_module'] = memory['loaded_module']
+	return forked, ForkedMemory(memory)
@@ -158,7 +158,7 @@ def bytes_to_list(b):
 	i = 0
 	while i < len(b):
 		# Get data length
-		length = int.from_byteS(b[i : i + 4], byteorder='big')
+		length = int.from_bytes(b[i : i + 4], byteorder='big')
 		i += 4
 		# Get data
 		data = b[i : i + length]
@@ -168,6 +168,213 @@ def bytes_to_list(b):
 	return l
 
 
+# The header of a memory cell in binary memory: its address (4 bytes) and the length of its data (4 bytes)
+MEMORY_HEADER = struct.Struct('>II')
+
+"""Turns memory into binary memory (OPCODE 53)."""
+
+def memory_to_bytes(memory):
+
+	"""Turns memory into binary memory (OPCODE 53). Each cell is its address (4 bytes), the length of its data (4 bytes) and its data.
+	   Keys which aren't addresses, like the loaded module (OEP 019), are skipped.
+	   Args: memory -> the memory
+	   Returns: the binary memory."""
+
+	parts = []
+	# Collect the headers and the data, then join them once
+	for key, data in memory.items():
+		if isinstance(key, int):
+			parts.append(MEMORY_HEADER.pack(key, len(data)))
+			parts.append(data)
+	return bytearray().join(parts)
+
+"""Turns binary memory into memory (OPCODE 54)."""
+
+def bytes_to_memory(b, keys=None):
+
+	"""Turns binary memory into memory (OPCODE 54). The headers are read in place, so only the data of each cell is copied.
+	   Args: b -> the binary memory
+	         keys -> the addresses to load, None to load all of them
+	   Returns: the memory."""
+
+	memory = {}
+	unpack = MEMORY_HEADER.unpack_from
+	with memoryview(b) as view:
+		if keys != None:
+			for key, start, end in iter_memory(view):
+				if key in keys:
+					memory[key] = b[start : end]
+			return memory
+		# Load all cells without the overhead of iter_memory
+		i = 0
+		size = len(view)
+		while i < size:
+			if i + MEMORY_HEADER.size > size:
+				raise Exception('Invalid binary memory.')
+			key, length = unpack(view, i)
+			i += MEMORY_HEADER.size
+			memory[key] = b[i : i + length]
+			i += length
+	return memory
+
+"""Indexes binary memory, so single cells can be read without loading the rest."""
+
+def index_memory(b):
+
+	"""Indexes binary memory, so single cells can be read without loading the rest.
+	   The cells are memoryviews of b, so nothing is copied, but a bytearray can't be resized while they are used.
+	   Args: b -> the binary memory
+	   Returns: a dict of addresses to memoryviews of their data."""
+
+	view = memoryview(b)
+	return {key : view[start : end] for key, start, end in iter_memory(view)}
+
+"""Iterates through the cells of binary memory."""
+
+def iter_memory(view):
+
+	"""Iterates through the cells of binary memory.
+	   Args: view -> a memoryview of the binary memory
+	   Returns: an iterator of the address, start and end of each cell's data."""
+
+	i = 0
+	size = len(view)
+	while i < size:
+		if i + MEMORY_HEADER.size > size:
+			raise Exception('Invalid binary memory.')
+		key, length = MEMORY_HEADER.unpack_from(view, i)
+		i += MEMORY_HEADER.size
+		yield key, i, i + length
+		i += length
+
+"""Turns namespaces into binary namespaces (OEP 003). Each namespace is encoded like a memory cell, with its ID and its binary memory."""
+
+def namespace_to_bytes(namespace):
+
+	"""Turns namespaces into binary namespaces (OEP 003). Each namespace is encoded like a memory cell, with its ID and its binary memory.
+	   Args: namespace -> the dict of namespace IDs to memory
+	   Returns: the binary namespaces."""
+
+	return memory_to_bytes({namespace_id : memory_to_bytes(memory) for namespace_id, memory in namespace.items()})
+
+"""Turns binary namespaces into namespaces (OEP 003)."""
+
+def bytes_to_namespace(b):
+
+	"""Turns binary namespaces into namespaces (OEP 003).
+	   Args: b -> the binary namespaces
+	   Returns: the dict of namespace IDs to memory."""
+
+	with memoryview(b) as view:
+		return {namespace_id : bytes_to_memory(b[start : end]) for namespace_id, start, end in iter_memory(view)}
+
+
+"""A buffer which a memory cell builds in place (OPCODES 4, 5 and 170)."""
+
+class BufferBuilder(bytearray):
+
+	"""A buffer which a memory cell builds in place (OPCODES 4, 5 and 170), so building a buffer in a loop isn't quadratic.
+	   append_data and insert_data only change data in place if it is a builder which its cell owns. Storing a builder anywhere else
+	   (another cell or namespace, the output buffer or a file) marks it as shared (see share_data), so it is copied before it is changed again.
+	   Other data, like a constant of the program, is never changed in place. Modules which copy a cell to another cell should use share_data.
+	   Otherwise it is a bytearray, and prints like one.
+	   Args: data -> the data to start with"""
+
+	__slots__ = ('shared', )
+
+	def __init__(self, data=b''):
+
+		"""A buffer which a memory cell builds in place (OPCODES 4, 5 and 170), so building a buffer in a loop isn't quadratic.
+	   append_data and insert_data only change data in place if it is a builder which its cell owns. Storing a builder anywhere else
+	   (another cell or namespace, the output buffer or a file) marks it as shared (see share_data), so it is copied before it is changed again.
+	   Other data, like a constant of the program, is never changed in place. Modules which copy a cell to another cell should use share_data.
+	   Otherwise it is a bytearray, and prints like one.
+	   Args: data -> the data to start with"""
+
+		bytearray.__init__(self, data)
+		self.shared = False
+
+	"""Returns the builder like a bytearray, so error messages print cells the same way."""
+
+	def __repr__(self):
+
+		"""Returns the builder like a bytearray, so error messages print cells the same way."""
+
+		return 'bytearray(' + repr(bytes(self)) + ')'
+
+	__str__ = __repr__
+
+"""Marks data which is stored in a second place as shared, so it isn't changed in place (see BufferBuilder)."""
+
+def share_data(data):
+
+	"""Marks data which is stored in a second place as shared, so it isn't changed in place (see BufferBuilder).
+	   Args: data -> the data
+	   Returns: the data."""
+
+	if type(data) is BufferBuilder:
+		data.shared = True
+	return data
+
+"""Checks if a memory cell owns its data, so it can be changed in place (see BufferBuilder)."""
+
+def owns_data(memory, address):
+
+	"""Checks if a memory cell owns its data, so it can be changed in place (see BufferBuilder).
+	   Args: memory -> the memory
+	         address -> the memory address
+	   Returns: if the cell owns its data."""
+
+	data = memory[address]
+	return type(data) is BufferBuilder and not data.shared
+
+"""Appends data to a memory cell (OPCODES 4 and 170)."""
+
+def append_data(memory, address, data):
+
+	"""Appends data to a memory cell (OPCODES 4 and 170). If the cell owns its data (see BufferBuilder), the data is appended in place.
+	   Otherwise the cell is set to a new builder, which later appends change in place. Memory which isn't a dict keeps its own data,
+	   so it appends the data itself (see CompactMemory.append_data).
+	   Args: memory -> the memory
+	         address -> the memory address
+	         data -> the data to append"""
+
+	if not isinstance(memory, dict):
+		memory.append_data(address, data)
+	elif owns_data(memory, address):
+		# A builder can't be resized while it is being read, so appending a cell to itself appends a copy
+		memory[address] += bytes(data) if data is memory[address] else data
+	else:
+		builder = BufferBuilder(memory[address])
+		builder += data
+		memory[address] = builder
+
+"""Inserts data into a memory cell at a position (OPCODE 5)."""
+
+def insert_data(memory, address, position, data):
+
+	"""Inserts data into a memory cell at a position (OPCODE 5). Like append_data, a cell which owns its data is changed in place,
+	   and a bytearray is copied to a new builder.
+	   Args: memory -> the memory
+	         address -> the memory address
+	         position -> the position to insert the data at
+	         data -> the data to insert"""
+
+	# Memory which isn't a dict gives a copy of the data, so changing it in place wouldn't change the cell (see CompactMemory)
+	if isinstance(memory, dict) and owns_data(memory, address):
+		memory[address][position : position] = data
+	elif isinstance(memory[address], memoryview):
+		# Copy the view (see OPLExecutor.slice_data)
+		memory[address] = b''.join((memory[address][ : position], data, memory[address][position : ]))
+	elif isinstance(memory, dict) and isinstance(memory[address], bytearray):
+		builder = BufferBuilder(memory[address][ : position])
+		builder += data
+		builder += memory[address][position : ]
+		memory[address] = builder
+	else:
+		memory[address] = memory[address][ : position] + data + memory[address][position : ]
+
+
 """Writes directly to standard output as a print handler."""
 
 def write(data):
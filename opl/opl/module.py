@@ -38,6 +38,23 @@ class BaseModule:
 
 		...
 
+	"""Handles a command given a runtime, in an AsyncOPLExecutor. A module can override this coroutine to await I/O instead of blocking,
+	   in which case it is used for all of the module's OPCODES in an AsyncOPLExecutor. Otherwise handle_command is used.
+	   Args: runtime -> the execution runtime
+	         cmd_name -> the command name or OPCODE
+	         line_args -> the arguments that are passed in"""
+
+	@classmethod
+	async def handle_command_async(self, runtime, cmd_name, line_args):
+
+		"""Handles a command given a runtime, in an AsyncOPLExecutor. A module can override this coroutine to await I/O instead of blocking,
+	   in which case it is used for all of the module's OPCODES in an AsyncOPLExecutor. Otherwise handle_command is used.
+	   Args: runtime -> the execution runtime
+	         cmd_name -> the command name or OPCODE
+	         line_args -> the arguments that are passed in"""
+
+		...
+
 	"""Called after each OPCODE call
 	   Args: runtime -> the execution runtime
 	         cmd_name -> the command name or OPCODE
@@ -6,6 +6,7 @@
 # Imports
 from .functions import *
 from .executor import OPLExecutor
+from .program import OPLProgram
 
 
 """The compiler for OPE."""
@@ -56,22 +57,28 @@ class OPEExecutor:
 		self.oplos = oplos
 
 	"""Executes a compiled OPE binary.
-	   Args: binary -> the OPE binary to execute
+	   Args: binary -> the OPE binary to execute, or an OPLProgram to run as the main code
 	         runtime_args -> runtime args
-	         sudo -> run as superuser"""
+	         sudo -> run as superuser
+	         files -> the files to use with an OPLProgram"""
 
-	def execute(self, binary, runtime_args=[], sudo=False):
+	def execute(self, binary, runtime_args=[], sudo=False, files={}):
 
 		"""Executes a compiled OPE binary.
-		   Args: binary -> the OPE binary to execute
+		   Args: binary -> the OPE binary to execute, or an OPLProgram to run as the main code
 		         runtime_args -> runtime args
-		         sudo -> run as superuser"""
-
-		# Get the main code
-		main_code_len = int.from_bytes(binary[ : 4], byteorder='big')
-		main_code = binary[4 : 4 + main_code_len]
-		# Get extra files
-		files = FROM_OEP_20(binary[4 + main_code_len : ])
+		         sudo -> run as superuser
+		         files -> the files to use with an OPLProgram"""
+
+		if isinstance(binary, OPLProgram):
+			# The main code is already decoded
+			main_code = binary
+		else:
+			# Get the main code
+			main_code_len = int.from_bytes(binary[ : 4], byteorder='big')
+			main_code = binary[4 : 4 + main_code_len]
+			# Get extra files
+			files = FROM_OEP_20(binary[4 + main_code_len : ])
 		# Execute the main code
 		e = OPLExecutor(opefiles=files, oplos=self.oplos)
 		e.execute(main_code, runtime_args=runtime_args, sudo=sudo)
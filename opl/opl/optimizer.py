@@ -0,0 +1,343 @@
+"""Optimizer for compiled OPL code. Written by Kevin Chen."""
+
+
+# Imports
+from . import LABEL_HEADER
+from .executor import OPLExecutor
+from .compiler import OPLCompiler
+
+
+"""A peephole optimizer for compiled OPL code. Runs between compiling and executing.
+   Folds constants set by OPCODE 2 into the math OPCODES, merges copy chains, removes dead stores, unreachable code and no-ops,
+   and replaces common pairs of lines with superinstructions.
+   Programs which jump to line numbers, start threads, load modules or run Python are left as they are.
+   Optimized programs behave the same as long as they run without errors, but line numbers in error messages may change."""
+
+class OPLOptimizer:
+
+	"""A peephole optimizer for compiled OPL code. Runs between compiling and executing.
+	   Folds constants set by OPCODE 2 into the math OPCODES, merges copy chains, removes dead stores, unreachable code and no-ops,
+	   and replaces common pairs of lines with superinstructions.
+	   Programs which jump to line numbers, start threads, load modules or run Python are left as they are.
+	   Optimized programs behave the same as long as they run without errors, but line numbers in error messages may change."""
+
+	# OPCODES which use line numbers, so lines can't be moved
+	LINE_JUMPS = {20, 21, 22, 23, 24, 25, 49, 50, 64, 65, 66, 67, 68, 71, 72, 98}
+	# OPCODES which run code that can see the memory at any time (threads, modules and Python)
+	UNSAFE = {88, 89, 97, 118, 119, 143, 144}
+	# OPCODES which jump to a label (OEP 022)
+	LABEL_JUMPS = {126, 127, 128, 129, 130, 131, 132, 133, 134, 135, 136, 137, 138, 139, 140, 141, 142}
+	# OPCODES which compute a value from their arguments, with the number of arguments they read
+	FOLD = {9 : 1, 18 : 1, 10 : 2, 11 : 2, 12 : 2, 13 : 2, 14 : 2, 69 : 2, 31 : 2, 32 : 2, 33 : 2, 34 : 2, 35 : 2, 36 : 2, 37 : 2, 38 : 2, \
+		70 : 2, 85 : 2, 86 : 2, 145 : 2, 146 : 2, 147 : 2, 148 : 2, 149 : 2, 150 : 2, 151 : 2, 152 : 2}
+	# OPCODES which raise to a power or shift by their second argument, which are only folded for small values
+	POWERS = {35, 85, 149}
+	# OPCODES which do nothing
+	NOPS = {0, 58}
+
+	def __init__(self):
+
+		"""A peephole optimizer for compiled OPL code. Runs between compiling and executing.
+	   Folds constants set by OPCODE 2 into the math OPCODES, merges copy chains, removes dead stores, unreachable code and no-ops,
+	   and replaces common pairs of lines with superinstructions.
+	   Programs which jump to line numbers, start threads, load modules or run Python are left as they are.
+	   Optimized programs behave the same as long as they run without errors, but line numbers in error messages may change."""
+
+		# The runtime used to fold constants
+		self.runtime = OPLExecutor(print_handler=lambda text : None)
+		# The number of instructions removed and superinstructions used by the last optimization
+		self.removed = 0
+		self.fused = 0
+
+	"""Optimizes compiled OPL code.
+	   Args: code -> the compiled code
+	   Returns: the optimized code"""
+
+	def optimize(self, code):
+
+		"""Optimizes compiled OPL code.
+	   Args: code -> the compiled code
+	   Returns: the optimized code"""
+
+		self.removed = 0
+		self.fused = 0
+		program, labels = self.runtime.load_code(code)
+		resolved = code[0 : 4] == LABEL_HEADER
+		label_lines = {line_num for line_num, line_code in enumerate(program) if line_code[1] == 125}
+		for line_code in program:
+			if line_code[1] in self.LINE_JUMPS or line_code[1] in self.UNSAFE or line_code[1] not in self.runtime.builtin_opcodes:
+				# We can't optimize this program
+				return code
+			if resolved and any(line_num not in label_lines for line_num in self.label_args(line_code[1], line_code[3])):
+				# A label was resolved to a line which isn't a label (OEP 022)
+				return code
+		# Each line is a list of the OPCODE, the raw arguments, the decoded arguments and the original line number
+		lines = [[line_code[1], list(line_code[2]), line_code[3], line_num] for line_num, line_code in enumerate(program)]
+		self.fold(lines)
+		lines = self.remove_dead_stores(lines)
+		lines = self.remove_unreachable(lines)
+		lines = [line for line in lines if line[0] not in self.NOPS]
+		self.removed = len(program) - len(lines)
+		lines = self.fuse(lines)
+		return self.assemble(lines, labels, resolved)
+
+	"""Gets the label arguments of a line (OEP 022).
+	   Args: cmd_name -> the OPCODE
+	         args -> the decoded arguments
+	   Returns: list of the labels"""
+
+	def label_args(self, cmd_name, args):
+
+		"""Gets the label arguments of a line (OEP 022).
+	   Args: cmd_name -> the OPCODE
+	         args -> the decoded arguments
+	   Returns: list of the labels"""
+
+		arg_types = self.runtime.ARG_TYPES.get(cmd_name, '')
+		return [arg for arg_num, arg in enumerate(args) if arg_num < len(arg_types) and arg_types[arg_num] == 'l']
+
+	"""Checks if a line ends a block, so the constants and copies known before it can't be used after it.
+	   Args: line -> the line"""
+
+	def ends_block(self, line):
+
+		"""Checks if a line ends a block, so the constants and copies known before it can't be used after it.
+	   Args: line -> the line"""
+
+		return line[0] in self.LABEL_JUMPS or line[0] in (1, 125, 159)
+
+	"""Folds constants and merges copy chains in each block, rewriting lines with a constant result to OPCODE 2.
+	   Args: lines -> the lines"""
+
+	def fold(self, lines):
+
+		"""Folds constants and merges copy chains in each block, rewriting lines with a constant result to OPCODE 2.
+	   Args: lines -> the lines"""
+
+		# Constant values of memory addresses, and addresses which are copies of other addresses
+		known = {}
+		copies = {}
+		for line in lines:
+			cmd_name, raw_args, args = line[0], line[1], line[2]
+			if cmd_name == 125:
+				# A label can be jumped to (OEP 022)
+				known, copies = {}, {}
+			if cmd_name == 2 and len(args) == 2:
+				# Set a constant
+				self.forget(args[1], known, copies)
+				known[args[1]] = args[0]
+			elif cmd_name == 3 and len(args) == 2:
+				source, destination = args
+				if source in known:
+					# Copying a constant sets the constant
+					value = known[source]
+					self.forget(destination, known, copies)
+					self.set_constant(line, value, raw_args[1])
+					known[destination] = value
+				else:
+					if source in copies:
+						# Copy from the original instead
+						source, raw_args[0] = copies[source]
+						args[0] = source
+					self.forget(destination, known, copies)
+					if source != destination:
+						copies[destination] = (source, raw_args[0])
+			elif cmd_name in self.FOLD and len(args) == self.FOLD[cmd_name] + 1:
+				# Compute the value if all arguments are constants
+				destination = args[-1]
+				value = self.fold_value(cmd_name, args, known)
+				self.forget(destination, known, copies)
+				if value != None:
+					self.set_constant(line, value, raw_args[-1])
+					known[destination] = value
+			elif cmd_name not in self.NOPS:
+				# Anything else might change any address
+				known, copies = {}, {}
+			if self.ends_block(line):
+				known, copies = {}, {}
+
+	"""Forgets what is known about an address when it changes.
+	   Args: address -> the address
+	         known -> the constant values
+	         copies -> the copies"""
+
+	def forget(self, address, known, copies):
+
+		"""Forgets what is known about an address when it changes.
+	   Args: address -> the address
+	         known -> the constant values
+	         copies -> the copies"""
+
+		known.pop(address, None)
+		copies.pop(address, None)
+		for destination in [destination for destination, (source, raw_source) in copies.items() if source == address]:
+			del copies[destination]
+
+	"""Computes the value of a line whose arguments are constants, using the runtime's handler.
+	   Args: cmd_name -> the OPCODE
+	         args -> the decoded arguments
+	         known -> the constant values
+	   Returns: the value, or None if it can't be folded"""
+
+	def fold_value(self, cmd_name, args, known):
+
+		"""Computes the value of a line whose arguments are constants, using the runtime's handler.
+	   Args: cmd_name -> the OPCODE
+	         args -> the decoded arguments
+	         known -> the constant values
+	   Returns: the value, or None if it can't be folded"""
+
+		if any(address not in known for address in args[ : -1]):
+			# Not all arguments are constants
+			return None
+		if cmd_name in self.POWERS and int.from_bytes(known[args[1]], byteorder='big') > 64:
+			# The value could be too big to compute
+			return None
+		self.runtime.memory = {address : known[address] for address in args[ : -1]}
+		try:
+			self.runtime.builtin_opcodes[cmd_name](None, args)
+		except Exception:
+			# The line raises an error, so leave it
+			return None
+		return bytearray(self.runtime.memory[args[-1]])
+
+	"""Rewrites a line to set a constant with OPCODE 2.
+	   Args: line -> the line
+	         value -> the constant
+	         raw_destination -> the raw destination address"""
+
+	def set_constant(self, line, value, raw_destination):
+
+		"""Rewrites a line to set a constant with OPCODE 2.
+	   Args: line -> the line
+	         value -> the constant
+	         raw_destination -> the raw destination address"""
+
+		line[0] = 2
+		line[1] = [value, raw_destination]
+		line[2] = [value, int.from_bytes(raw_destination, byteorder='big')]
+
+	"""Removes constants set by OPCODE 2 which are set again before anything else runs.
+	   Only addresses which were already set in the block are removed, so the order of the memory stays the same.
+	   Args: lines -> the lines
+	   Returns: the remaining lines"""
+
+	def remove_dead_stores(self, lines):
+
+		"""Removes constants set by OPCODE 2 which are set again before anything else runs.
+	   Only addresses which were already set in the block are removed, so the order of the memory stays the same.
+	   Args: lines -> the lines
+	   Returns: the remaining lines"""
+
+		remaining = []
+		# Addresses set by OPCODE 2 in this block
+		written = set()
+		for line_num, line in enumerate(lines):
+			if line[0] == 125:
+				# A label can be jumped to (OEP 022)
+				written = set()
+			if line[0] == 2 and len(line[2]) == 2:
+				if line[2][1] in written:
+					# Look for the next line setting the same address, only passing lines setting other constants
+					dead = False
+					for next_line in lines[line_num + 1 : ]:
+						if next_line[0] in self.NOPS:
+							continue
+						if next_line[0] != 2 or len(next_line[2]) != 2:
+							break
+						if next_line[2][1] == line[2][1]:
+							dead = True
+							break
+					if dead:
+						# The constant is never read
+						continue
+				written.add(line[2][1])
+			elif line[0] != 3 and line[0] not in self.FOLD and line[0] not in self.LABEL_JUMPS and line[0] not in self.NOPS:
+				# Anything else might delete an address
+				written = set()
+			remaining.append(line)
+		return remaining
+
+	"""Removes lines after the program ends or always jumps, up to the next label (OEP 022).
+	   Args: lines -> the lines
+	   Returns: the remaining lines"""
+
+	def remove_unreachable(self, lines):
+
+		"""Removes lines after the program ends or always jumps, up to the next label (OEP 022).
+	   Args: lines -> the lines
+	   Returns: the remaining lines"""
+
+		remaining = []
+		reachable = True
+		for line in lines:
+			if line[0] == 125:
+				reachable = True
+			if reachable:
+				remaining.append(line)
+			if (line[0] == 1 and len(line[2]) >= 1) or (line[0] == 126 and len(line[2]) >= 1 and type(line[2][0]) == int) or line[0] == 159:
+				# Lines after this can only be reached with a label
+				reachable = False
+		return remaining
+
+	"""Replaces pairs of lines with a superinstruction, so they only take one dispatch.
+	   Superinstructions are tried in order, so the ones which end loops are used first.
+	   Args: lines -> the lines
+	   Returns: the new lines"""
+
+	def fuse(self, lines):
+
+		"""Replaces pairs of lines with a superinstruction, so they only take one dispatch.
+	   Superinstructions are tried in order, so the ones which end loops are used first.
+	   Args: lines -> the lines
+	   Returns: the new lines"""
+
+		for superinstruction, ((first, first_args), (second, second_args)) in self.runtime.SUPERINSTRUCTIONS.items():
+			fused = []
+			line_num = 0
+			while line_num < len(lines):
+				line = lines[line_num]
+				if line_num + 1 < len(lines) and line[0] == first and lines[line_num + 1][0] == second and len(line[2]) == first_args and len(lines[line_num + 1][2]) == second_args:
+					# Use the superinstruction with the arguments of both lines
+					next_line = lines[line_num + 1]
+					fused.append([superinstruction, line[1] + next_line[1], line[2] + next_line[2], line[3]])
+					self.fused += 1
+					line_num += 2
+					continue
+				fused.append(line)
+				line_num += 1
+			lines = fused
+		return lines
+
+	"""Assembles the lines back to compiled code, numbering them again.
+	   Args: lines -> the lines
+	         labels -> the labels (OEP 022)
+	         resolved -> if the labels were resolved to line numbers by the compiler
+	   Returns: the compiled code"""
+
+	def assemble(self, lines, labels, resolved):
+
+		"""Assembles the lines back to compiled code, numbering them again.
+	   Args: lines -> the lines
+	         labels -> the labels (OEP 022)
+	         resolved -> if the labels were resolved to line numbers by the compiler
+	   Returns: the compiled code"""
+
+		compiled_code = bytearray()
+		# New line numbers of the labels
+		new_lines = {line[3] : line_num for line_num, line in enumerate(lines) if line[0] == 125}
+		for line_num, line in enumerate(lines):
+			cmd_name, raw_args = line[0], line[1]
+			if resolved:
+				# Use the new line numbers of the labels
+				arg_types = self.runtime.ARG_TYPES.get(cmd_name, '')
+				raw_args = [int.to_bytes(new_lines[int.from_bytes(arg, byteorder='big')], 4, byteorder='big') if arg_num < len(arg_types) and arg_types[arg_num] == 'l' else arg for arg_num, arg in enumerate(raw_args)]
+			# Add line number, command type, and number of args to code
+			compiled_code += int.to_bytes(line_num, 4, byteorder='big') + int.to_bytes(cmd_name, 4, byteorder='big') + int.to_bytes(len(raw_args), 4, byteorder='big')
+			# Add each argument
+			for arg in raw_args:
+				compiled_code += int.to_bytes(len(arg), 4, byteorder='big') + arg
+		if resolved:
+			# Add the label table
+			compiled_code = OPLCompiler().label_header({label : new_lines[line_num] for label, line_num in labels.items()}) + compiled_code
+		return compiled_code
@@ -0,0 +1,97 @@
+"""Reusable compiled programs for the OPL language. Written by Kevin Chen."""
+
+
+# Imports
+from .functions import *
+
+
+"""A compiled OPL program, decoded once so it can be run many times without decoding it again."""
+
+class OPLProgram:
+
+	"""A compiled OPL program, decoded once so it can be run many times without decoding it again.
+	   OPLExecutor.execute, OPEExecutor.execute and the OPCODES which run code (96, 109, 111) accept it in place of compiled code.
+	   Args: code -> bytearray containing compiled OPL code
+	         optimize -> optimize the code before decoding it (see OPLOptimizer)
+	         verify -> check that the program only uses OPCODES and labels which exist
+	         executor -> the executor to run the program with, None to create one"""
+
+	# OPCODES which move lines out of the program to a thread (OEP 001)
+	THREAD_OPCODES = {88, 89, 143, 144}
+	# OPCODES which can load a module, which can add OPCODES (OEP 019)
+	MODULE_OPCODES = {96, 97, 118}
+
+	def __init__(self, code, optimize=False, verify=False, executor=None):
+
+		"""A compiled OPL program, decoded once so it can be run many times without decoding it again.
+		   OPLExecutor.execute, OPEExecutor.execute and the OPCODES which run code (96, 109, 111) accept it in place of compiled code.
+		   Args: code -> bytearray containing compiled OPL code
+		         optimize -> optimize the code before decoding it (see OPLOptimizer)
+		         verify -> check that the program only uses OPCODES and labels which exist
+		         executor -> the executor to run the program with, None to create one"""
+
+		from .executor import OPLExecutor
+		if executor == None:
+			executor = OPLExecutor()
+		self.executor = executor
+		if optimize:
+			from .optimizer import OPLOptimizer
+			code = OPLOptimizer().optimize(code)
+		self.code = code
+		# Decode the program and its labels (OEP 022)
+		self.program, self.labels = executor.load_code(code)
+		# Threads change the program, so it is copied for each run
+		self.copy = any(line_code[1] in self.THREAD_OPCODES for line_code in self.program)
+		if verify:
+			self.verify()
+
+	"""Checks that the program only uses OPCODES and labels which exist (OEP 022), raising an exception if it doesn't.
+	   OPCODES which aren't built in are allowed if the program can load a module (OEP 019)."""
+
+	def verify(self):
+
+		"""Checks that the program only uses OPCODES and labels which exist (OEP 022), raising an exception if it doesn't.
+		   OPCODES which aren't built in are allowed if the program can load a module (OEP 019)."""
+
+		from .executor import MissingLabel
+		modules = any(line_code[1] in self.MODULE_OPCODES for line_code in self.program)
+		for line_code in self.program:
+			if line_code[1] not in self.executor.builtin_opcodes:
+				if not modules:
+					raise Exception('Unknown OPCODE ' + str(line_code[1]) + ' on line ' + str(line_code[0]) + '.')
+			elif any(isinstance(arg, MissingLabel) for arg in line_code[3]):
+				raise Exception('Unknown label on line ' + str(line_code[0]) + '.')
+
+	"""Gets the decoded program and its labels for a run.
+	   Returns: the decoded program and the labels (OEP 022)."""
+
+	def decoded(self):
+
+		"""Gets the decoded program and its labels for a run.
+		   Returns: the decoded program and the labels (OEP 022)."""
+
+		if self.copy:
+			return list(self.program), self.labels
+		return self.program, self.labels
+
+	"""Runs the program.
+	   Args: runtime_args -> arguments given during runtime
+	         namespace -> namespace to run in (OEP 003), None to start with empty memory
+	         active_namespace -> the active namespace
+	         sudo -> run as superuser
+	         max_steps -> the most lines (or blocks, with the python engine) to run before pausing the program, None for no limit
+	         time_limit -> the most seconds to run for before pausing the program, None for no limit
+	   Returns: output bytearray. If the program was paused, it can be continued with the executor's continue_execute."""
+
+	def run(self, runtime_args=[], namespace=None, active_namespace=0, sudo=False, max_steps=None, time_limit=None):
+
+		"""Runs the program.
+		   Args: runtime_args -> arguments given during runtime
+		         namespace -> namespace to run in (OEP 003), None to start with empty memory
+		         active_namespace -> the active namespace
+		         sudo -> run as superuser
+		         max_steps -> the most lines (or blocks, with the python engine) to run before pausing the program, None for no limit
+		         time_limit -> the most seconds to run for before pausing the program, None for no limit
+		   Returns: output bytearray. If the program was paused, it can be continued with the executor's continue_execute."""
+
+		return self.executor.execute(self, runtime_args, True, namespace, active_namespace, sudo=sudo, max_steps=max_steps, time_limit=time_limit)
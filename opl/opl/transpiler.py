@@ -0,0 +1,664 @@
+"""Transpiler from OPL bytecode to Python. Written by Kevin Chen."""
+
+
+# Imports
+import struct
+
+
+# Float format used by the float OPCODES
+FLOAT = struct.Struct('f')
+
+
+"""Transpiles decoded OPL programs to Python, with one function per basic block.
+   Memory cells used inside a block are kept in local variables and written back to memory when the block ends,
+   or before any OPCODE which isn't transpiled, which runs its handler on the real memory instead."""
+
+class OPLTranspiler:
+
+	"""Transpiles decoded OPL programs to Python, with one function per basic block.
+	   Memory cells used inside a block are kept in local variables and written back to memory when the block ends,
+	   or before any OPCODE which isn't transpiled, which runs its handler on the real memory instead."""
+
+	# OPCODES which jump to a line in memory
+	DYNAMIC_JUMPS = {20, 21, 22, 23, 24, 25, 64, 65, 66, 67, 68, 71, 72, 98}
+	# OPCODES which jump to a label (OEP 022)
+	LABEL_JUMPS = {126, 127, 128, 129, 130, 131, 132, 133, 134, 135, 136, 137, 138, 139, 140, 141, 142}
+	# OPCODES which end a block because they end the program, change the memory or the module, run other threads (OEP 001),
+	# or wait for input or time, which AsyncOPLExecutor awaits between blocks
+	BARRIERS = {1, 27, 54, 56, 61, 84, 90, 96, 97, 109, 111, 118, 119, 159, 164, 169, 173, 174}
+	# OPCODES which change the program itself, so it can't be transpiled
+	UNSUPPORTED = {50, 88, 89, 143, 144}
+	# Math OPCODES (arg0 op arg1 -> arg2)
+	FLOAT_MATH = {10 : '+', 11 : '-', 12 : '*', 13 : '/', 14 : '**', 69 : '%'}
+	INT_MATH = {31 : '+', 32 : '-', 33 : '*', 35 : '**', 36 : '&', 37 : '|', 38 : '^', 70 : '%', 85 : '<<', 86 : '>>'}
+	SIGNED_MATH = {145 : '+', 146 : '-', 147 : '*', 149 : '**', 150 : '&', 151 : '|', 152 : '^'}
+	# Comparisons for the jump OPCODES (the kind of value, the comparison and if there is an else line)
+	JUMP_COMPARE = {21 : ('b', '==', False), 22 : ('f', '>', False), 23 : ('f', '<', False), 24 : ('f', '>=', False), 25 : ('f', '<=', False), \
+		64 : ('b', '==', True), 65 : ('f', '>', True), 66 : ('f', '<', True), 67 : ('f', '>=', True), 68 : ('f', '<=', True), 71 : ('f', '==', True), 72 : ('f', '==', False), \
+		127 : ('b', '==', False), 128 : ('b', '!=', False), 129 : ('f', '>', False), 130 : ('f', '<', False), 131 : ('f', '>=', False), 132 : ('f', '<=', False), \
+		133 : ('b', '==', True), 134 : ('f', '>', True), 135 : ('f', '<', True), 136 : ('f', '>=', True), 137 : ('f', '<=', True), \
+		138 : ('i', '>', True), 139 : ('i', '<', True), 140 : ('i', '>=', True), 141 : ('i', '<=', True), 142 : ('b', '!=', True)}
+
+	def __init__(self):
+
+		"""Transpiles decoded OPL programs to Python, with one function per basic block.
+	   Memory cells used inside a block are kept in local variables and written back to memory when the block ends,
+	   or before any OPCODE which isn't transpiled, which runs its handler on the real memory instead."""
+
+		# The last transpiled program, its source and its blocks
+		self.program = None
+		self.source = None
+		self.blocks = None
+		# The superinstructions of the runtime, with the OPCODES they are made of
+		self.superinstructions = {}
+		# The built in OPCODES of the runtime
+		self.builtin_opcodes = {}
+
+	"""Transpiles a decoded program (see OPLExecutor.load_code) and compiles it.
+	   Args: program -> the decoded program
+	         runtime -> the runtime
+	   Returns: a dictionary of the line each block starts at to the block's function, or None if the program can't be transpiled.
+	            Each function takes the runtime and the execution frame, and sets frame.line_num to the next line."""
+
+	def transpile(self, program, runtime):
+
+		"""Transpiles a decoded program (see OPLExecutor.load_code) and compiles it.
+	   Args: program -> the decoded program
+	         runtime -> the runtime
+	   Returns: a dictionary of the line each block starts at to the block's function, or None if the program can't be transpiled.
+	            Each function takes the runtime and the execution frame, and sets frame.line_num to the next line."""
+
+		if program is self.program:
+			# Already transpiled
+			return self.blocks
+		self.program = program
+		self.source = None
+		self.blocks = None
+		self.superinstructions = runtime.SUPERINSTRUCTIONS
+		self.builtin_opcodes = runtime.builtin_opcodes
+		if any(line_code[1] in self.UNSUPPORTED for line_code in program):
+			# The program changes itself
+			return None
+		# Generate the source
+		constants = {'pack' : FLOAT.pack, 'unpack' : FLOAT.unpack, 'from_bytes' : int.from_bytes, 'to_bytes' : int.to_bytes}
+		source = []
+		starts = []
+		leaders = self.find_leaders(program)
+		for start in sorted(leaders):
+			# Find the end of the block
+			end = start
+			while end + 1 < len(program) and end + 1 not in leaders and not self.ends_block(program[end][1]):
+				end += 1
+			source += self.block_source(program, start, end, runtime.builtin_opcodes, constants)
+			starts.append(start)
+		self.source = '\n'.join(source) + '\n'
+		# Compile the source
+		exec(compile(self.source, '<opl>', 'exec'), constants)
+		self.blocks = {start : constants['block_' + str(start)] for start in starts}
+		return self.blocks
+
+	"""Checks if an OPCODE ends a block.
+	   Args: cmd_name -> the OPCODE"""
+
+	def ends_block(self, cmd_name):
+
+		"""Checks if an OPCODE ends a block.
+	   Args: cmd_name -> the OPCODE"""
+
+		if cmd_name in self.superinstructions:
+			# Check the OPCODES the superinstruction is made of
+			return any(self.ends_block(part) for part, num_args in self.superinstructions[cmd_name])
+		# Module OPCODES (OEP 019) can change anything, so they also end a block
+		return cmd_name in self.DYNAMIC_JUMPS or cmd_name in self.LABEL_JUMPS or cmd_name in self.BARRIERS or cmd_name not in self.builtin_opcodes
+
+	"""Splits a superinstruction into the OPCODES it is made of, raising a TranspileError if it has the wrong number of arguments.
+	   Args: cmd_name -> the OPCODE
+	         args -> the decoded arguments
+	   Returns: list of each OPCODE and its arguments"""
+
+	def parts(self, cmd_name, args):
+
+		"""Splits a superinstruction into the OPCODES it is made of, raising a TranspileError if it has the wrong number of arguments.
+	   Args: cmd_name -> the OPCODE
+	         args -> the decoded arguments
+	   Returns: list of each OPCODE and its arguments"""
+
+		if cmd_name not in self.superinstructions:
+			return [(cmd_name, args)]
+		if len(args) != sum(num_args for part, num_args in self.superinstructions[cmd_name]):
+			# Let the handler raise the error
+			raise TranspileError()
+		parts = []
+		arg_num = 0
+		for part, num_args in self.superinstructions[cmd_name]:
+			parts.append((part, args[arg_num : arg_num + num_args]))
+			arg_num += num_args
+		return parts
+
+	"""Finds the lines which start a block: the first line, labels, lines after a block ends, and any line numbers set by OPCODE 2 (for the goto OPCODES).
+	   Args: program -> the decoded program"""
+
+	def find_leaders(self, program):
+
+		"""Finds the lines which start a block: the first line, labels, lines after a block ends, and any line numbers set by OPCODE 2 (for the goto OPCODES).
+	   Args: program -> the decoded program"""
+
+		leaders = set()
+		if len(program) > 0:
+			leaders.add(0)
+		dynamic = any(line_code[1] in self.DYNAMIC_JUMPS for line_code in program)
+		for line_num, line_code in enumerate(program):
+			cmd_name, args = line_code[1], line_code[3]
+			if cmd_name == 125:
+				# Label (OEP 022)
+				leaders.add(line_num)
+			elif cmd_name in self.LABEL_JUMPS or cmd_name in self.superinstructions:
+				# The labels jumped to
+				try:
+					parts = self.parts(cmd_name, args)
+				except TranspileError:
+					parts = []
+				for part, part_args in parts:
+					if part in self.LABEL_JUMPS:
+						for arg in part_args[0 : 1] + (part_args[3 : 4] if part in self.JUMP_COMPARE and self.JUMP_COMPARE[part][2] else []):
+							if type(arg) == int and arg < len(program):
+								leaders.add(arg)
+			elif dynamic and cmd_name == 2 and len(args) == 2 and len(args[0]) == 4:
+				# A possible line number for the goto OPCODES
+				line = int.from_bytes(args[0], byteorder='big')
+				if line < len(program):
+					leaders.add(line)
+			if self.ends_block(cmd_name) and line_num + 1 < len(program):
+				leaders.add(line_num + 1)
+		return leaders
+
+	"""Generates the source of the function for a block.
+	   Args: program -> the decoded program
+	         start -> the first line of the block
+	         end -> the last line of the block
+	         builtin_opcodes -> the built in OPCODES of the runtime
+	         constants -> the globals for the compiled code, which the block's constants are added to
+	   Returns: list of source lines"""
+
+	def block_source(self, program, start, end, builtin_opcodes, constants):
+
+		"""Generates the source of the function for a block.
+	   Args: program -> the decoded program
+	         start -> the first line of the block
+	         end -> the last line of the block
+	         builtin_opcodes -> the built in OPCODES of the runtime
+	         constants -> the globals for the compiled code, which the block's constants are added to
+	   Returns: list of source lines"""
+
+		block = Block()
+		for line_num in range(start, end + 1):
+			line_code = program[line_num]
+			cmd_name, args = line_code[1], line_code[3]
+			block.emit('line = ' + str(line_num))
+			try:
+				self.line_source(block, line_num, cmd_name, args, line_num == end)
+			except TranspileError:
+				# Run the handler on the memory
+				block.flush(line_num)
+				block.invalidate()
+				constants['args_' + str(line_num)] = args
+				block.emit('frame.line_num = ' + str(line_num))
+				if cmd_name in builtin_opcodes:
+					block.emit('runtime.builtin_opcodes[' + str(cmd_name) + '](frame, args_' + str(line_num) + ')')
+				else:
+					# Use the OPCODE table of the runtime, which has the module's OPCODES (OEP 019)
+					block.emit('handler = runtime.opcodes.get(' + str(cmd_name) + ')')
+					block.emit('if handler == None:')
+					block.emit('\traise Exception(\'Not a command.\')')
+					block.emit('handler(frame, args_' + str(line_num) + ')')
+				if line_num == end:
+					block.emit('target = frame.line_num + 1')
+		if block.target == None and 'target = frame.line_num + 1' not in block.body[-1 : ]:
+			# Fall through to the next line
+			block.emit('target = ' + str(end + 1))
+		# Add the constants
+		for name, value in block.constants.items():
+			constants[name] = value
+		return block.source(start)
+
+	"""Generates the source for a single line, raising a TranspileError if the OPCODE isn't transpiled.
+	   Args: block -> the block
+	         line_num -> the line number
+	         cmd_name -> the OPCODE
+	         args -> the decoded arguments
+	         last -> if this is the last line of the block"""
+
+	def line_source(self, block, line_num, cmd_name, args, last):
+
+		"""Generates the source for a single line, raising a TranspileError if the OPCODE isn't transpiled.
+	   Args: block -> the block
+	         line_num -> the line number
+	         cmd_name -> the OPCODE
+	         args -> the decoded arguments
+	         last -> if this is the last line of the block"""
+
+		try:
+			if cmd_name in (0, 58, 125):
+				# Nothing to do
+				pass
+			elif cmd_name == 1:
+				# End the program, returning arg0
+				block.emit('runtime.output += ' + block.constant(line_num, args[0]))
+				block.emit('frame.done = True')
+				block.target = str(line_num + 1)
+				block.emit('target = ' + block.target)
+			elif cmd_name == 2:
+				block.write(args[1], block.constant(line_num, args[0]), line_num)
+			elif cmd_name == 3:
+				block.write(args[1], 'bytearray(' + block.read(args[0]) + ').copy()', line_num)
+			elif cmd_name == 4:
+				if args[1] == args[2]:
+					# The handler appends to the cell in place (see BufferBuilder), so the cell can't be kept in a local variable
+					raise TranspileError()
+				value = 'bytearray(' + block.read(args[1]) + ').copy() + ' + block.read(args[0])
+				block.write(args[2], value, line_num)
+			elif cmd_name == 9:
+				block.write_int(args[1], 'len(' + block.read(args[0]) + ')', line_num, False)
+			elif cmd_name in self.FLOAT_MATH:
+				value = block.read_float(args[0]) + ' ' + self.FLOAT_MATH[cmd_name] + ' ' + block.read_float(args[1])
+				block.write(args[2], 'pack(' + value + ')', line_num)
+			elif cmd_name in self.INT_MATH:
+				value = block.read_int(args[0], False) + ' ' + self.INT_MATH[cmd_name] + ' ' + block.read_int(args[1], False)
+				block.write_int(args[2], value, line_num, False)
+			elif cmd_name == 34:
+				value = 'int(' + block.read_int(args[0], False) + ' / ' + block.read_int(args[1], False) + ')'
+				block.write_int(args[2], value, line_num, False)
+			elif cmd_name in self.SIGNED_MATH:
+				value = block.read_int(args[0], True) + ' ' + self.SIGNED_MATH[cmd_name] + ' ' + block.read_int(args[1], True)
+				block.write_int(args[2], value, line_num, True)
+			elif cmd_name == 18:
+				block.write(args[1], '(b\'\\x00\\x00\\x00\\x01\' if ' + block.read_int(args[0], False) + ' == 0 else b\'\\x00\\x00\\x00\\x00\')', line_num)
+			elif cmd_name in self.superinstructions:
+				# Transpile each OPCODE of the superinstruction
+				parts = self.parts(cmd_name, args)
+				for part_num, (part, part_args) in enumerate(parts):
+					if part_num > 0:
+						# Changes made by the first OPCODES are kept if a later one raises an error
+						block.part = part_num / len(parts)
+						block.emit('line = ' + str(line_num + block.part))
+					self.line_source(block, line_num, part, part_args, last)
+				block.part = 0
+			elif cmd_name == 20:
+				block.target = block.read_int(args[0], False)
+				block.emit('target = ' + block.target)
+			elif cmd_name == 126:
+				block.target = self.label(args[0])
+				block.emit('target = ' + block.target)
+			elif cmd_name in self.JUMP_COMPARE:
+				kind, compare, has_else = self.JUMP_COMPARE[cmd_name]
+				if kind == 'f':
+					condition = block.read_float(args[1]) + ' ' + compare + ' ' + block.read_float(args[2])
+				elif kind == 'i':
+					condition = block.read_int(args[1], False) + ' ' + compare + ' ' + block.read_int(args[2], False)
+				else:
+					condition = block.read(args[1]) + ' ' + compare + ' ' + block.read(args[2])
+				block.target = 'jump'
+				block.emit('if ' + condition + ':')
+				block.indent += 1
+				self.jump_target(block, cmd_name, args[0])
+				block.indent -= 1
+				block.emit('else:')
+				block.indent += 1
+				if has_else:
+					self.jump_target(block, cmd_name, args[3])
+				else:
+					block.emit('target = ' + str(line_num + 1))
+				block.indent -= 1
+			else:
+				raise TranspileError()
+		except IndexError:
+			# Missing arguments, let the handler raise the error
+			raise TranspileError()
+
+	"""Emits the target of a jump.
+	   Args: block -> the block
+	         cmd_name -> the OPCODE
+	         arg -> the line address, or the label (OEP 022)"""
+
+	def jump_target(self, block, cmd_name, arg):
+
+		"""Emits the target of a jump.
+	   Args: block -> the block
+	         cmd_name -> the OPCODE
+	         arg -> the line address, or the label (OEP 022)"""
+
+		if cmd_name in self.LABEL_JUMPS:
+			target = self.label(arg)
+		else:
+			# Read the line number directly, so only the taken branch reads it
+			target = block.int_source(arg)
+		if target.startswith('raise'):
+			block.emit(target)
+		else:
+			block.emit('target = ' + target)
+
+	"""Gets the source for the line after a label (OEP 022).
+	   Args: label -> the resolved label"""
+
+	def label(self, label):
+
+		"""Gets the source for the line after a label (OEP 022).
+	   Args: label -> the resolved label"""
+
+		if type(label) != int:
+			# Missing label
+			return 'raise KeyError(' + repr(label.name) + ')'
+		return str(label)
+
+
+"""A basic block being transpiled. Keeps track of which memory cells are in local variables.
+   Cells are typed registers: a cell may be held as bytes, as a native unsigned or signed int, or as a float alongside its bytes.
+   Native ints are only boxed to bytes when a byte level OPCODE reads the cell, or when the cell is written back to memory."""
+
+class Block:
+
+	"""A basic block being transpiled. Keeps track of which memory cells are in local variables.
+	   Cells are typed registers: a cell may be held as bytes, as a native unsigned or signed int, or as a float alongside its bytes.
+	   Native ints are only boxed to bytes when a byte level OPCODE reads the cell, or when the cell is written back to memory."""
+
+	# The prefixes of the local variables for each kind of value (bytes, unsigned int, signed int, float)
+	KINDS = {'b' : 'm', 'u' : 'u', 's' : 's', 'f' : 'f'}
+
+	def __init__(self):
+
+		"""A basic block being transpiled. Keeps track of which memory cells are in local variables.
+	   Cells are typed registers: a cell may be held as bytes, as a native unsigned or signed int, or as a float alongside its bytes.
+	   Native ints are only boxed to bytes when a byte level OPCODE reads the cell, or when the cell is written back to memory."""
+
+		self.body = []
+		self.indent = 0
+		# Memory cells in local variables, with the kinds of value they are held as
+		self.cache = {}
+		# Memory cells changed in local variables, with the lines they were changed on and the kind of value written
+		self.dirty = {}
+		# Cells written back to memory before an OPCODE which isn't transpiled, with their changes and the line they were written back on
+		self.flushed = []
+		self.constants = {}
+		self.target = None
+		# The part of the line being run, for superinstructions
+		self.part = 0
+
+	"""Emits a line of source.
+	   Args: source -> the source"""
+
+	def emit(self, source):
+
+		"""Emits a line of source.
+	   Args: source -> the source"""
+
+		self.body.append('\t' * self.indent + source)
+
+	"""Adds a constant.
+	   Args: line_num -> the line number
+	         value -> the value
+	   Returns: the name of the constant"""
+
+	def constant(self, line_num, value):
+
+		"""Adds a constant.
+	   Args: line_num -> the line number
+	         value -> the value
+	   Returns: the name of the constant"""
+
+		name = 'const_' + str(line_num)
+		self.constants[name] = value
+		return name
+
+	"""Gets the name of the local variable for a cell.
+	   Args: address -> the memory address
+	         kind -> the kind of value"""
+
+	def variable(self, address, kind):
+
+		"""Gets the name of the local variable for a cell.
+	   Args: address -> the memory address
+	         kind -> the kind of value"""
+
+		return self.KINDS[kind] + str(address)
+
+	"""Gets the source which boxes a native int to its 4 bytes.
+	   Args: address -> the memory address
+	         kind -> the kind of value"""
+
+	def box(self, address, kind):
+
+		"""Gets the source which boxes a native int to its 4 bytes.
+	   Args: address -> the memory address
+	         kind -> the kind of value"""
+
+		if kind == 'u':
+			return 'to_bytes(' + self.variable(address, kind) + ', 4, byteorder=\'big\')'
+		elif kind == 's':
+			return 'to_bytes(' + self.variable(address, kind) + ', 4, byteorder=\'big\', signed=True)'
+		return self.variable(address, kind)
+
+	"""Reads a memory cell as bytes, boxing it if it is held as a native int.
+	   Args: address -> the memory address
+	   Returns: the name of the variable"""
+
+	def read(self, address):
+
+		"""Reads a memory cell as bytes, boxing it if it is held as a native int.
+	   Args: address -> the memory address
+	   Returns: the name of the variable"""
+
+		name = self.variable(address, 'b')
+		if address not in self.cache:
+			self.emit(name + ' = memory[' + str(address) + ']')
+			self.cache[address] = {'b'}
+		elif 'b' not in self.cache[address]:
+			self.emit(name + ' = ' + self.box(address, 'u' if 'u' in self.cache[address] else 's'))
+			self.cache[address].add('b')
+		return name
+
+	"""Reads a memory cell as a native int.
+	   Args: address -> the memory address
+	         signed -> if the int is signed
+	   Returns: the name of the variable"""
+
+	def read_int(self, address, signed):
+
+		"""Reads a memory cell as a native int.
+	   Args: address -> the memory address
+	         signed -> if the int is signed
+	   Returns: the name of the variable"""
+
+		kind = 's' if signed else 'u'
+		name = self.variable(address, kind)
+		if address in self.cache and kind in self.cache[address]:
+			# Already held as this kind
+			return name
+		if address in self.cache and 'b' not in self.cache[address]:
+			# Held as a 4 byte int of the other kind
+			if signed:
+				self.emit(name + ' = ' + self.variable(address, 'u') + ' - 4294967296 if ' + self.variable(address, 'u') + ' > 2147483647 else ' + self.variable(address, 'u'))
+			else:
+				self.emit(name + ' = ' + self.variable(address, 's') + ' & 4294967295')
+		else:
+			source = self.read(address)
+			self.emit(name + ' = from_bytes(' + source + ', byteorder=\'big\'' + (', signed=True)' if signed else ')'))
+		self.cache[address].add(kind)
+		return name
+
+	"""Reads a memory cell as a float.
+	   Args: address -> the memory address
+	   Returns: the name of the variable"""
+
+	def read_float(self, address):
+
+		"""Reads a memory cell as a float.
+	   Args: address -> the memory address
+	   Returns: the name of the variable"""
+
+		name = self.variable(address, 'f')
+		if address in self.cache and 'f' in self.cache[address]:
+			# Already unpacked
+			return name
+		source = self.read(address)
+		self.emit(name + ' = unpack(' + source + ')[0]')
+		self.cache[address].add('f')
+		return name
+
+	"""Gets the source for a cell as an unsigned int, without reading it into a local variable.
+	   Args: address -> the memory address"""
+
+	def int_source(self, address):
+
+		"""Gets the source for a cell as an unsigned int, without reading it into a local variable.
+	   Args: address -> the memory address"""
+
+		if address not in self.cache:
+			return 'from_bytes(memory[' + str(address) + '], byteorder=\'big\')'
+		elif 'u' in self.cache[address]:
+			return self.variable(address, 'u')
+		elif 'b' in self.cache[address]:
+			return 'from_bytes(' + self.variable(address, 'b') + ', byteorder=\'big\')'
+		return '(' + self.variable(address, 's') + ' & 4294967295)'
+
+	"""Writes bytes to a memory cell's local variable.
+	   Args: address -> the memory address
+	         value -> the source of the value
+	         line_num -> the line number"""
+
+	def write(self, address, value, line_num):
+
+		"""Writes bytes to a memory cell's local variable.
+	   Args: address -> the memory address
+	         value -> the source of the value
+	         line_num -> the line number"""
+
+		self.emit(self.variable(address, 'b') + ' = ' + value)
+		self.changed(address, 'b', line_num)
+
+	"""Writes a native int to a memory cell's local variable, raising the same error as boxing it would if it doesn't fit in 4 bytes.
+	   Args: address -> the memory address
+	         value -> the source of the value
+	         line_num -> the line number
+	         signed -> if the int is signed"""
+
+	def write_int(self, address, value, line_num, signed):
+
+		"""Writes a native int to a memory cell's local variable, raising the same error as boxing it would if it doesn't fit in 4 bytes.
+	   Args: address -> the memory address
+	         value -> the source of the value
+	         line_num -> the line number
+	         signed -> if the int is signed"""
+
+		self.emit('value = ' + value)
+		if signed:
+			self.emit('if value > 2147483647 or value < -2147483648:')
+			self.emit('\tto_bytes(value, 4, byteorder=\'big\', signed=True)')
+		else:
+			self.emit('if value > 4294967295 or value < 0:')
+			self.emit('\tto_bytes(value, 4, byteorder=\'big\')')
+		kind = 's' if signed else 'u'
+		self.emit(self.variable(address, kind) + ' = value')
+		self.changed(address, kind, line_num)
+
+	"""Marks a cell as changed.
+	   Args: address -> the memory address
+	         kind -> the kind of value written
+	         line_num -> the line number"""
+
+	def changed(self, address, kind, line_num):
+
+		"""Marks a cell as changed.
+	   Args: address -> the memory address
+	         kind -> the kind of value written
+	         line_num -> the line number"""
+
+		self.cache[address] = {kind}
+		if address not in self.dirty:
+			self.dirty[address] = []
+		self.dirty[address].append((line_num + self.part, kind))
+
+	"""Gets the source which writes back a changed cell.
+	   Args: address -> the memory address"""
+
+	def write_back(self, address):
+
+		"""Gets the source which writes back a changed cell.
+	   Args: address -> the memory address"""
+
+		kinds = self.cache[address]
+		return 'memory[' + str(address) + '] = ' + self.box(address, 'b' if 'b' in kinds else 'u' if 'u' in kinds else 's')
+
+	"""Writes all changed cells back to memory, before the OPCODE on a line which isn't transpiled.
+	   Args: line_num -> the line number"""
+
+	def flush(self, line_num):
+
+		"""Writes all changed cells back to memory, before the OPCODE on a line which isn't transpiled.
+	   Args: line_num -> the line number"""
+
+		for address, changes in self.dirty.items():
+			self.emit(self.write_back(address))
+			self.flushed.append((address, changes, line_num))
+		self.dirty = {}
+
+	"""Forgets all cells in local variables, after an OPCODE which isn't transpiled."""
+
+	def invalidate(self):
+
+		"""Forgets all cells in local variables, after an OPCODE which isn't transpiled."""
+
+		self.cache = {}
+
+	"""Gets the source which writes back a cell's value when an error is raised, using the last change before the line of the error.
+	   Args: address -> the memory address
+	         changes -> the changes to the cell
+	   Returns: list of source lines"""
+
+	def recover(self, address, changes):
+
+		"""Gets the source which writes back a cell's value when an error is raised, using the last change before the line of the error.
+	   Args: address -> the memory address
+	         changes -> the changes to the cell
+	   Returns: list of source lines"""
+
+		source = []
+		for line_num, kind in reversed(changes):
+			source.append(('if' if source == [] else 'elif') + ' line > ' + str(line_num) + ':')
+			source.append('\tmemory[' + str(address) + '] = ' + self.box(address, kind))
+		return source
+
+	"""Gets the source of the block's function.
+	   Args: start -> the first line of the block
+	   Returns: list of source lines"""
+
+	def source(self, start):
+
+		"""Gets the source of the block's function.
+	   Args: start -> the first line of the block
+	   Returns: list of source lines"""
+
+		source = ['def block_' + str(start) + '(runtime, frame):', '\tmemory = runtime.memory', '\tline = ' + str(start), '\ttry:']
+		source += ['\t\t' + line for line in self.body]
+		source.append('\texcept Exception:')
+		# Write back the cells which were changed before the error
+		for address, changes, flushed in self.flushed:
+			source.append('\t\tif line < ' + str(flushed) + ':')
+			source += ['\t\t\t' + line for line in self.recover(address, changes)]
+		for address, changes in self.dirty.items():
+			source += ['\t\t' + line for line in self.recover(address, changes)]
+		source.append('\t\tframe.line_num = int(line)')
+		source.append('\t\traise')
+		# Write back the changed cells
+		for address in self.dirty:
+			source.append('\t' + self.write_back(address))
+		source.append('\tframe.line_num = target')
+		return source
+
+
+"""Raised when an OPCODE isn't transpiled."""
+
+class TranspileError(Exception):
+
+	"""Raised when an OPCODE isn't transpiled."""
+
+	pass
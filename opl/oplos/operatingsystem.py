@@ -25,6 +25,8 @@ class OPLOS:
 	   Args: osfile -> the name of the file for the OS to use"""
 
 		self.file = FileBuffer(osfile, True, True)
+		# Decoded OPL programs of files, kept until the file changes
+		self.programs = {}
 		# Check for an empty file
 		if len(self.file.data) == 0:
 			pass
@@ -131,7 +133,7 @@ class OPLOS:
 		elif command == 'opl':
 			# Run the opl code at arg0
 			e = opl.opl.OPLExecutor(oplos=self)
-			e.execute(self.get_file(args[0]), runtime_args=args[1 : -1], sudo=sudo)
+			e.execute(self.get_program(args[0]), runtime_args=args[1 : -1], sudo=sudo)
 			if len(args[1 : ]) >= 1:
 				if args[-1] == '-o':
 					write(str(e.output) + '\n')
@@ -157,6 +159,8 @@ class OPLOS:
 			# Reload the OPL language
 			import importlib
 			importlib.reload(opl.opl)
+			# Decode programs again with the new version
+			self.programs = {}
 		elif command == 'vopl':
 			# Get the OPL version
 			write(opl.opl.__version__ + '\n')
@@ -261,6 +265,8 @@ help -> display this message
 
 		self.data['files'][name] = data
 		self.data_to_binary(self.data)
+		# The file may replace a file which was decoded
+		self.programs.pop(name, None)
 
 	"""Delete a file.
 	   Args: name -> name of the file"""
@@ -272,6 +278,7 @@ help -> display this message
 
 		del self.data['files'][name]
 		self.data_to_binary(self.data)
+		self.programs.pop(name, None)
 
 	"""Get the data of a file.
 	   Args: name -> name of the file"""
@@ -283,6 +290,19 @@ help -> display this message
 
 		return self.data['files'][name]
 
+	"""Get a file as a decoded OPL program, which is decoded again only if the file changed.
+	   Args: name -> name of the file"""
+
+	def get_program(self, name):
+
+		"""Get a file as a decoded OPL program, which is decoded again only if the file changed.
+	   Args: name -> name of the file"""
+
+		data = self.get_file(name)
+		if name not in self.programs or self.programs[name].code is not data:
+			self.programs[name] = opl.opl.OPLProgram(data)
+		return self.programs[name]
+
 	"""Rename a file.
 	   Args: name -> name of the file
 	         new_name -> new name of the file"""
@@ -0,0 +1,372 @@
+"""Runs the OPL test scripts and checks their output. Written by Kevin Chen."""
+
+
+# Imports
+import sys, os
+import random
+
+# Use the opl package next to this folder
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, '..', 'opl'))
+import opl
+from opl.functions import BufferBuilder, append_data, insert_data, share_data, owns_data
+from opl.forkedmemory import ForkedMemory, fork_memory
+from opl.diskmemory import DiskMemory
+
+
+# The engines each script is run with
+ENGINES = ('loop', 'closures', 'python')
+
+# The test scripts. Each one is compiled next to it (.opc) and has a line with the output it prints (// Outputs: ...)
+SCRIPTS = ['namespaces.opl', 'aliasing.opl', 'forks.opl']
+
+# Programs checked by the output buffer they return. Each one is a name, its OPL code and the output it should return
+# Each program is run RUNS times with the same OPLProgram, and with execute_many with each number of JOBS, so a run can't change the
+# constants of the next one
+PROGRAMS = [
+	# A constant set as the output buffer is copied, so appending to the output doesn't change the constant
+	('constant output', "0\n2 s'abc' i0\n52 i0\n1 s'X'\n", b'abcX'),
+	# A view of a large cell (see OPLExecutor.slice_data) set as the output buffer is copied, so it can be appended to
+	('view output', "0\n2 s'0123456789' i1\n" + "170 i1 i1\n" * 7 + "171 i1 i0\n2 i1 i2\n7 i0 i2\n52 i0\n1 s'X'\n", (b'0123456789' * 128)[1 : ] + b'X'),
+]
+# The number of times each program is run
+RUNS = 3
+# The numbers of worker processes execute_many is checked with, 1 runs in this process
+JOBS = (1, 2)
+
+# The number of random programs the randomised checks run, and the most lines each one runs
+RANDOM_RUNS = 300
+MAX_STEPS = 2000
+# The values random programs set their memory to
+RANDOM_VALUES = ['i0', 'i1', 'i2', 'i3', 'i7', 'i255', 'i2147483648', 'i4294967295', 'f0.5', 'f-2.5', "s'ab'"]
+
+
+"""Gets the output a test script should print, from its "// Outputs:" line.
+   Args: filename -> the test script
+   Returns: the output."""
+
+def expected_output(filename):
+
+	"""Gets the output a test script should print, from its "// Outputs:" line.
+	   Args: filename -> the test script
+	   Returns: the output."""
+
+	file = open(os.path.join(SCRIPT_DIR, filename), 'r')
+	lines = file.read().splitlines()
+	file.close()
+	for line in lines:
+		if line.startswith('// Outputs:'):
+			return line[len('// Outputs:') : ].strip()
+	raise Exception('No expected output in ' + filename + '.')
+
+"""Runs the compiled code of a test script.
+   Args: filename -> the test script
+         engine -> the engine to run the code with
+   Returns: what the script printed."""
+
+def run_script(filename, engine):
+
+	"""Runs the compiled code of a test script.
+	   Args: filename -> the test script
+	         engine -> the engine to run the code with
+	   Returns: what the script printed."""
+
+	file = open(os.path.join(SCRIPT_DIR, filename + '.opc'), 'rb')
+	code = file.read()
+	file.close()
+	printed = []
+	opl.OPLExecutor(print_handler=printed.append, engine=engine).execute(code)
+	return ''.join(printed).strip()
+
+"""Runs a program from the PROGRAMS list RUNS times with the same OPLProgram.
+   Args: source -> the OPL code of the program
+         engine -> the engine to run the program with
+   Returns: the output buffer of each run."""
+
+def run_program(source, engine):
+
+	"""Runs a program from the PROGRAMS list RUNS times with the same OPLProgram.
+	   Args: source -> the OPL code of the program
+	         engine -> the engine to run the program with
+	   Returns: the output buffer of each run."""
+
+	program = opl.OPLProgram(opl.OPLCompiler().compile(source), executor=opl.OPLExecutor(print_handler=None, engine=engine))
+	return [bytes(program.run()) for run in range(RUNS)]
+
+"""Runs a program from the PROGRAMS list RUNS times with execute_many.
+   Args: source -> the OPL code of the program
+         engine -> the engine to run the program with
+         jobs -> the number of worker processes
+   Returns: the output buffer of each run."""
+
+def run_many(source, engine, jobs):
+
+	"""Runs a program from the PROGRAMS list RUNS times with execute_many.
+	   Args: source -> the OPL code of the program
+	         engine -> the engine to run the program with
+	         jobs -> the number of worker processes
+	   Returns: the output buffer of each run."""
+
+	executor = opl.OPLExecutor(print_handler=None, engine=engine)
+	return [bytes(output) for output in executor.execute_many(opl.OPLCompiler().compile(source), [[]] * RUNS, jobs)]
+
+"""Prints the result of a test.
+   Args: name -> the name of the test
+         expected -> the expected result
+         result -> the result
+   Returns: if the test passed."""
+
+def report(name, expected, result):
+
+	"""Prints the result of a test.
+	   Args: name -> the name of the test
+	         expected -> the expected result
+	         result -> the result
+	   Returns: if the test passed."""
+
+	if result == expected:
+		print('PASS ' + name)
+		return True
+	print('FAIL ' + name + ': expected ' + repr(expected) + ', got ' + repr(result))
+	return False
+
+"""Checks that append_data and insert_data change a builder in place only if its cell owns it, and that data which is
+   shared (see share_data) or isn't a builder is replaced by a new builder.
+   Returns: the expected result and the result."""
+
+def check_buffer_ownership():
+
+	"""Checks that append_data and insert_data change a builder in place only if its cell owns it, and that data which is
+	   shared (see share_data) or isn't a builder is replaced by a new builder.
+	   Returns: the expected result and the result."""
+
+	memory = {0 : BufferBuilder(b'ab'), 1 : BufferBuilder(b'ab'), 2 : BufferBuilder(b'ab'), 3 : BufferBuilder(b'ab'), 4 : bytearray(b'ab')}
+	# Something else refers to the second and fourth cells
+	shared_append, shared_insert = share_data(memory[1]), share_data(memory[3])
+	owned_append, owned_insert, constant = id(memory[0]), id(memory[2]), memory[4]
+	append_data(memory, 0, b'+')
+	append_data(memory, 1, b'+')
+	insert_data(memory, 2, 1, b'+')
+	insert_data(memory, 3, 1, b'+')
+	append_data(memory, 4, b'+')
+	result = [id(memory[0]) == owned_append, id(memory[2]) == owned_insert, bytes(shared_append), bytes(shared_insert), bytes(constant)]
+	# The new builders are owned by their cells, so they grow in place
+	result += [owns_data(memory, address) for address in range(5)]
+	result += [bytes(memory[address]) for address in range(5)]
+	return [True, True, b'ab', b'ab', b'ab'] + [True] * 5 + [b'ab+', b'ab+', b'a+b', b'a+b', b'ab+'], result
+
+"""Makes a random program, with constants, copies, math OPCODES the optimizer can fold and jumps to labels.
+   Args: generator -> the random number generator
+   Returns: the OPL code."""
+
+def random_program(generator):
+
+	"""Makes a random program, with constants, copies, math OPCODES the optimizer can fold and jumps to labels.
+	   Args: generator -> the random number generator
+	   Returns: the OPL code."""
+
+	address = lambda: 'i' + str(generator.randint(0, 5))
+	label = lambda: "s'L" + str(generator.randint(0, 2)) + "'"
+	lines = []
+	for line in range(generator.randint(4, 25)):
+		kind = generator.random()
+		if kind < 0.1:
+			# Go to a label if arg1 < arg2
+			lines.append(' '.join(['139', label(), address(), address(), label()]))
+		elif kind < 0.4:
+			lines.append('2 ' + generator.choice(RANDOM_VALUES) + ' ' + address())
+		elif kind < 0.5:
+			lines.append('3 ' + address() + ' ' + address())
+		else:
+			# Powers and shifts by large values would take too long to run
+			cmd_name = generator.choice(sorted(set(opl.OPLOptimizer.FOLD) - opl.OPLOptimizer.POWERS))
+			lines.append(' '.join([str(cmd_name)] + [address() for arg in range(opl.OPLOptimizer.FOLD[cmd_name] + 1)]))
+	# Each label is created once, anywhere in the program
+	for name in range(3):
+		lines.insert(generator.randint(0, len(lines)), "125 s'L" + str(name) + "'")
+	lines = ['0'] + ['2 ' + generator.choice(RANDOM_VALUES) + ' i' + str(cell) for cell in range(6)] + lines
+	return '\n'.join(lines) + '\n'
+
+"""Runs compiled code for check_optimizer, stopping at errors.
+   Args: code -> the compiled code
+   Returns: the output buffer and the memory, or None if the code ran for more than MAX_STEPS lines."""
+
+def run_memory(code):
+
+	"""Runs compiled code for check_optimizer, stopping at errors.
+	   Args: code -> the compiled code
+	   Returns: the output buffer and the memory, or None if the code ran for more than MAX_STEPS lines."""
+
+	executor = opl.OPLExecutor(print_handler=None, error_mode='s')
+	output = executor.execute(code, max_steps=MAX_STEPS)
+	if executor.paused != None:
+		return None
+	return bytes(output), [(address, bytes(data)) for address, data in executor.namespace[0].items()]
+
+"""Checks that random programs return the same output and leave the same memory before and after optimizing them (see OPLOptimizer).
+   Returns: the expected result and the result."""
+
+def check_optimizer():
+
+	"""Checks that random programs return the same output and leave the same memory before and after optimizing them (see OPLOptimizer).
+	   Returns: the expected result and the result."""
+
+	optimizer = opl.OPLOptimizer()
+	differences = []
+	for seed in range(RANDOM_RUNS):
+		source = random_program(random.Random(seed))
+		# Label tables are optimized too
+		code = opl.OPLCompiler().compile(source, resolve_labels=seed % 2 == 1)
+		before = run_memory(code)
+		after = run_memory(optimizer.optimize(code))
+		if before != None and after != None and before != after:
+			differences.append(seed)
+	return [], differences
+
+"""Checks that the namespaces forked by forks.opl stay apart when it is paused after every few lines and resumed from a snapshot
+   in a new executor, with each engine.
+   Returns: the expected result and the result."""
+
+def check_fork_snapshots():
+
+	"""Checks that the namespaces forked by forks.opl stay apart when it is paused after every few lines and resumed from a snapshot
+	   in a new executor, with each engine.
+	   Returns: the expected result and the result."""
+
+	file = open(os.path.join(SCRIPT_DIR, 'forks.opl.opc'), 'rb')
+	code = file.read()
+	file.close()
+	expected, result = [], []
+	for engine in ENGINES:
+		for steps in (1, 2, 3):
+			printed = []
+			executor = opl.OPLExecutor(print_handler=printed.append, engine=engine)
+			executor.execute(code, max_steps=steps)
+			while executor.paused != None:
+				snapshot = executor.snapshot()
+				executor = opl.OPLExecutor(print_handler=printed.append, engine=engine)
+				executor.resume(snapshot, max_steps=steps)
+			expected.append(expected_output('forks.opl'))
+			result.append(''.join(printed).strip())
+	return expected, result
+
+"""Checks that moving the active namespace to disk (OPCODE 173) keeps its data, and that the memories on disk of namespaces which are
+   replaced (OPCODES 91, 173 and 174) or deleted (OPCODE 92) are closed, unless a fork still uses them (see OPLExecutor.close_memory).
+   Returns: the expected result and the result."""
+
+def check_disk_namespaces():
+
+	"""Checks that moving the active namespace to disk (OPCODE 173) keeps its data, and that the memories on disk of namespaces which are
+	   replaced (OPCODES 91, 173 and 174) or deleted (OPCODE 92) are closed, unless a fork still uses them (see OPLExecutor.close_memory).
+	   Returns: the expected result and the result."""
+
+	source = "0\n2 i0 i100\n2 i1 i101\n2 i4096 i102\n2 s'kept ' i0\n173 i100 i102\n173 i101 i102\n173 i101 i102\n91 i101\n" + \
+		"173 i101 i102\n174 i100 i101\n92 i101\n52 i0\n1 s'X'\n"
+	executor = opl.OPLExecutor(print_handler=None)
+	# Run one line at a time, to find every memory on disk the program creates
+	output = executor.execute(opl.OPLCompiler().compile(source), max_steps=1)
+	disks = {}
+	while True:
+		for memory in list(executor.namespace.values()) + [executor.memory]:
+			memory = memory.base if isinstance(memory, ForkedMemory) else memory
+			if isinstance(memory, DiskMemory):
+				disks[id(memory)] = memory
+		if executor.paused == None:
+			break
+		output = executor.continue_execute(max_steps=1)
+	# Only the active namespace's memory, which both forks use, is still open
+	base = executor.memory.base
+	closed = [not os.path.exists(memory.directory.name) for memory in disks.values() if memory is not base]
+	return [b'kept X', True, [True] * 3], [bytes(output), isinstance(base, DiskMemory) and os.path.exists(base.directory.name), closed]
+
+"""Checks random changes to forks of a memory, and forks of the forks (see fork_memory), against copies of the memory in dicts.
+   Returns: the expected result and the result."""
+
+def check_forked_memory():
+
+	"""Checks random changes to forks of a memory, and forks of the forks (see fork_memory), against copies of the memory in dicts.
+	   Returns: the expected result and the result."""
+
+	differences = []
+	for seed in range(RANDOM_RUNS // 3):
+		generator = random.Random(seed)
+		base = {address : generator.choice([bytes, bytearray])(generator.randbytes(3)) for address in range(20)}
+		copy = {address : bytes(data) for address, data in base.items()}
+		first, second = fork_memory(base)
+		# Each fork, with the dict it should match
+		forks = [[first, dict(copy)], [second, dict(copy)]]
+		for step in range(100):
+			fork = generator.choice(forks)
+			memory, model = fork
+			address = generator.randrange(30)
+			kind = generator.random()
+			if kind < 0.3:
+				data = generator.choice([bytes, bytearray])(generator.randbytes(2))
+				memory[address] = data
+				model[address] = bytes(data)
+			elif kind < 0.45 and address in model:
+				data = generator.randbytes(2)
+				append_data(memory, address, data)
+				model[address] += data
+			elif kind < 0.55 and address in model:
+				data = generator.randbytes(2)
+				position = generator.randrange(len(model[address]) + 1)
+				insert_data(memory, address, position, data)
+				model[address] = model[address][ : position] + data + model[address][position : ]
+			elif kind < 0.65 and address in model:
+				del memory[address]
+				del model[address]
+			elif kind < 0.7:
+				# Fork the fork
+				fork[0], new_fork = fork_memory(memory)
+				forks.append([new_fork, dict(model)])
+			elif kind < 0.75 and address in model:
+				# Share data between two cells (see share_data)
+				memory[address + 100] = share_data(memory[address])
+				model[address + 100] = model[address]
+			if any(len(memory) != len(model) or {address : bytes(data) for address, data in memory.items()} != model for memory, model in forks):
+				differences.append((seed, step))
+		# The memory which was forked never changes
+		if {address : bytes(data) for address, data in base.items()} != copy:
+			differences.append((seed, 'base'))
+	return [], differences
+
+# Python checks, each a name and a function which returns the expected result and the result
+CHECKS = [
+	('buffer ownership', check_buffer_ownership),
+	('optimizer', check_optimizer),
+	('fork snapshots', check_fork_snapshots),
+	('disk namespaces', check_disk_namespaces),
+	('forked memory', check_forked_memory),
+]
+
+
+"""Runs all test scripts and programs with each engine and all Python checks, printing the result of each one.
+   Returns: the number of failed tests."""
+
+def main():
+
+	"""Runs all test scripts and programs with each engine and all Python checks, printing the result of each one.
+	   Returns: the number of failed tests."""
+
+	failed = 0
+	for filename in SCRIPTS:
+		expected = expected_output(filename)
+		for engine in ENGINES:
+			if not report(filename + ' (' + engine + ')', expected, run_script(filename, engine)):
+				failed += 1
+	for name, source, expected in PROGRAMS:
+		for engine in ENGINES:
+			if not report(name + ' (' + engine + ')', [expected] * RUNS, run_program(source, engine)):
+				failed += 1
+			for jobs in JOBS:
+				if not report(name + ' (' + engine + ', execute_many with ' + str(jobs) + ' jobs)', [expected] * RUNS, run_many(source, engine, jobs)):
+					failed += 1
+	for name, check in CHECKS:
+		if not report(name, *check()):
+			failed += 1
+	return failed
+
+
+if __name__ == '__main__':
+	sys.exit(1 if main() else 0)